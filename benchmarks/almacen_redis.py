@@ -0,0 +1,190 @@
+"""
+Verificación del cliente RESP y del almacén Redis contra un servidor falso.
+
+Levanta el servidor de benchmarks.resp_falso en un puerto libre y comprueba
+que AlmacenRedis guarda y lee valores binarios (con \\r\\n y bytes nulos),
+que las cadenas y arreglos nulos se leen como None, que los errores del
+servidor se reportan sin perder la conexión, que un error dentro de un
+arreglo cierra la conexión en vez de desincronizarla, que se reconecta tras
+un corte, y que respeta el TTL, la contraseña, la base y el prefijo de
+espacio al limpiar con SCAN.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.almacen_redis
+"""
+
+import contextlib
+import io
+import sys
+import time
+import zlib
+
+from benchmarks.resp_falso import ServidorRespFalso
+from src.repositories.almacen_cache import AlmacenRedis, ClienteResp, ErrorResp
+
+VALORES_BINARIOS = [
+    b"",
+    b"\r\n",
+    b"linea\r\notra\r\n",
+    b"$5\r\n*1\r\n-ERR\r\n",
+    bytes(range(256)),
+    zlib.compress(b'{"prima": 100.0, "tasa": "\\r\\n"}' * 50),
+]
+
+
+def _almacen(servidor: ServidorRespFalso, espacio: str = "prueba", url: str = None):
+    cliente = ClienteResp.desde_url(url or servidor.url())
+    return AlmacenRedis(cliente, espacio=espacio)
+
+
+def _silencioso(funcion, *argumentos):
+    """Ejecuta sin mostrar los errores que el almacén imprime al contarlos"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcion(*argumentos)
+
+
+def verificar_valores_binarios(servidor: ServidorRespFalso) -> None:
+    almacen = _almacen(servidor)
+    for indice, valor in enumerate(VALORES_BINARIOS):
+        almacen.guardar(f"binario:{indice}", valor)
+    for indice, valor in enumerate(VALORES_BINARIOS):
+        leido = almacen.obtener(f"binario:{indice}")
+        assert leido == valor, f"valor {indice}: {leido!r} != {valor!r}"
+    assert almacen.estadisticas()["errores"] == 0
+
+
+def verificar_respuestas_nulas(servidor: ServidorRespFalso) -> None:
+    almacen = _almacen(servidor)
+    assert almacen.obtener("no-existe") is None
+    servidor.forzar_respuesta(b"*-1\r\n")
+    assert almacen.cliente.ejecutar("PING") is None
+    servidor.forzar_respuesta(b"*2\r\n$-1\r\n$2\r\nok\r\n")
+    assert almacen.cliente.ejecutar("PING") == [None, b"ok"]
+    assert almacen.estadisticas()["errores"] == 0
+
+
+def verificar_respuestas_error(servidor: ServidorRespFalso) -> None:
+    almacen = _almacen(servidor)
+    almacen.guardar("clave", b"valor")
+    conexiones = servidor.conexiones_aceptadas
+    try:
+        almacen.cliente.ejecutar("NO-EXISTE")
+        raise AssertionError("un comando desconocido no lanzó ErrorResp")
+    except ErrorResp as e:
+        assert "unknown command" in str(e), str(e)
+
+    servidor.forzar_respuesta(b"-OOM command not allowed\r\n")
+    assert _silencioso(almacen.obtener, "clave") is None
+    assert almacen.estadisticas()["errores"] == 1
+
+    # Un error simple es la respuesta completa: la conexión sigue sirviendo
+    assert almacen.obtener("clave") == b"valor"
+    assert servidor.conexiones_aceptadas == conexiones
+
+
+def verificar_error_en_arreglo(servidor: ServidorRespFalso) -> None:
+    almacen = _almacen(servidor)
+    almacen.guardar("clave", b"valor")
+    conexiones = servidor.conexiones_aceptadas
+    servidor.forzar_respuesta(b"*3\r\n$1\r\na\r\n-ERR falla\r\n$7\r\nsobrante\r\n")
+    try:
+        almacen.cliente.ejecutar("PING")
+        raise AssertionError("un arreglo con un error no lanzó ErrorResp")
+    except ErrorResp:
+        pass
+
+    # El resto del arreglo no debe leerse como la respuesta del siguiente comando
+    leido = almacen.obtener("clave")
+    assert leido == b"valor", f"conexión desincronizada: {leido!r}"
+    assert servidor.conexiones_aceptadas == conexiones + 1
+
+
+def verificar_reconexion(servidor: ServidorRespFalso) -> None:
+    almacen = _almacen(servidor)
+    almacen.guardar("clave", b"valor")
+    conexiones = servidor.conexiones_aceptadas
+    servidor.cortar_conexiones()
+
+    # El primer comando tras el corte falla como un fallo de caché y el
+    # siguiente reconecta
+    assert _silencioso(almacen.obtener, "clave") is None
+    assert almacen.estadisticas()["errores"] == 1
+    assert almacen.obtener("clave") == b"valor"
+    almacen.guardar("otra", b"\r\n")
+    assert almacen.obtener("otra") == b"\r\n"
+    assert servidor.conexiones_aceptadas == conexiones + 1
+
+
+def verificar_ttl(servidor: ServidorRespFalso) -> None:
+    almacen = _almacen(servidor)
+    almacen.guardar("efimera", b"valor", ttl_segundos=0.05)
+    almacen.guardar("duradera", b"valor", ttl_segundos=60)
+    assert almacen.obtener("efimera") == b"valor"
+    time.sleep(0.1)
+    assert almacen.obtener("efimera") is None
+    assert almacen.obtener("duradera") == b"valor"
+
+
+def verificar_limpiar(servidor: ServidorRespFalso) -> None:
+    cotizaciones = _almacen(servidor, espacio="vcr:cotizaciones")
+    otras = _almacen(servidor, espacio="vcr:otras")
+    # Más claves que el COUNT del SCAN para recorrer varias páginas
+    for indice in range(1200):
+        cotizaciones.guardar(f"c{indice}", b"x")
+    for indice in range(10):
+        otras.guardar(f"c{indice}", b"y")
+
+    cotizaciones.limpiar()
+    restantes = [c for c in servidor.claves() if c.startswith(b"vcr:")]
+    assert len(restantes) == 10, f"{len(restantes)} claves tras limpiar"
+    assert all(c.startswith(b"vcr:otras:") for c in restantes)
+    assert cotizaciones.obtener("c0") is None
+    assert otras.obtener("c0") == b"y"
+    assert cotizaciones.estadisticas()["errores"] == 0
+
+
+def verificar_autenticacion() -> None:
+    with ServidorRespFalso(contrasena="clave secreta") as servidor:
+        almacen = _almacen(servidor, url=servidor.url(base_datos=3))
+        almacen.guardar("clave", b"valor")
+        assert almacen.obtener("clave") == b"valor"
+        assert almacen.estadisticas()["errores"] == 0
+
+        url = f"redis://:incorrecta@127.0.0.1:{servidor.puerto}/3"
+        incorrecta = _almacen(servidor, url=url)
+        assert _silencioso(incorrecta.obtener, "clave") is None
+        assert incorrecta.estadisticas()["errores"] == 1
+        assert incorrecta.cliente._socket is None
+
+
+VERIFICACIONES = [
+    verificar_valores_binarios,
+    verificar_respuestas_nulas,
+    verificar_respuestas_error,
+    verificar_error_en_arreglo,
+    verificar_reconexion,
+    verificar_ttl,
+    verificar_limpiar,
+]
+
+
+def main():
+    fallas = 0
+    for verificacion in VERIFICACIONES + [verificar_autenticacion]:
+        nombre = verificacion.__name__.replace("verificar_", "")
+        try:
+            if verificacion is verificar_autenticacion:
+                verificacion()
+            else:
+                with ServidorRespFalso() as servidor:
+                    verificacion(servidor)
+        except (AssertionError, OSError, ErrorResp) as e:
+            fallas += 1
+            print(f"{nombre:<22} FALLA: {e!r}")
+        else:
+            print(f"{nombre:<22} ok")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Benchmark de los buscadores de raíz del optimizador de RUMBO.
+
+Para una grilla de perfiles compila la cotización una sola vez y ejecuta el
+optimizador con cada método, contando las evaluaciones del VNA (en el método
+lineal por tramos cada evaluación propaga valor y pendiente; en el de rejilla
+se cuentan los puntos, evaluados en lote por ronda) y comparando
+el porcentaje óptimo (redondeado a 2 decimales, como en la respuesta) contra
+la bisección.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.buscadores_raiz
+"""
+
+import itertools
+import time
+from collections import defaultdict
+
+from src.core.constants import PORCENTAJE_INICIAL, PORCENTAJE_LIMITE
+from src.helpers.buscador_raiz import BUSCADORES_RAIZ, Rejilla, obtener_buscador_raiz
+from src.models.products.rumbo.buscador_lineal_por_tramos import LinealPorTramos
+from src.models.products.rumbo.evaluador_rumbo import (
+    EvaluadorVNA,
+    OptimizadorBiseccion,
+    ParametrosOptimizacion,
+)
+from src.models.schemas.cotizacion_schema import CotizacionInput
+from src.services.cotizacion.pipeline.cotizacion_context import CotizacionContext
+from src.services.cotizacion.pipeline.steps import (
+    ParameterLoadingStep,
+    ValidationStep,
+)
+
+METODOS = list(BUSCADORES_RAIZ) + [LinealPorTramos.nombre]
+
+EDADES = [18, 30, 45, 60]
+SEXOS = ["M", "F"]
+PERIODOS = [3, 5, 10, 15, 20]
+PRIMAS = [100, 300, 1000]
+FRECUENCIAS = ["MENSUAL", "ANUAL"]
+
+
+def _compilar_evaluadores():
+    validacion = ValidationStep()
+    carga_parametros = ParameterLoadingStep()
+
+    for edad, sexo, periodo, prima, frecuencia in itertools.product(
+        EDADES, SEXOS, PERIODOS, PRIMAS, FRECUENCIAS
+    ):
+        cotizacion_input = CotizacionInput(
+            producto="RUMBO",
+            parametros={
+                "edad_actuarial": edad,
+                "sexo": sexo,
+                "periodo_vigencia": periodo,
+                "periodo_pago_primas": periodo,
+                "prima": prima,
+                "frecuencia_pago_primas": frecuencia,
+            },
+        )
+        context = carga_parametros.process(
+            validacion.process(CotizacionContext(input=cotizacion_input))
+        )
+        params = ParametrosOptimizacion(
+            cotizacion_input=cotizacion_input,
+            parametros_almacenados=context.parametros_almacenados,
+            parametros_calculados=context.parametros_calculados,
+            periodo_vigencia=context.periodo_vigencia,
+            periodo_pago_primas=context.periodo_pago_primas,
+            prima=context.prima,
+        )
+        yield (edad, sexo, periodo, prima, frecuencia), EvaluadorVNA(params)
+
+
+def main():
+    evaluaciones = defaultdict(list)
+    evaluaciones_interior = defaultdict(list)
+    tiempos = defaultdict(float)
+    discrepancias = defaultdict(list)
+
+    for perfil, evaluador in _compilar_evaluadores():
+        referencia = None
+        interior = False
+        for metodo in METODOS:
+            evaluador_lote = None
+            if metodo == LinealPorTramos.nombre:
+                buscador = LinealPorTramos(evaluador.motor)
+            elif metodo == Rejilla.nombre:
+                evaluador_lote = evaluador.evaluar_many
+                buscador = Rejilla(evaluador_lote)
+            else:
+                buscador = obtener_buscador_raiz(metodo)
+            inicio = time.perf_counter()
+            resultado = OptimizadorBiseccion(
+                evaluador.evaluar, buscador, evaluador_lote=evaluador_lote
+            ).optimizar()
+            tiempos[metodo] += time.perf_counter() - inicio
+
+            evaluaciones[metodo].append(resultado.iteraciones)
+            porcentaje = round(resultado.porcentaje_optimo, 2)
+            if referencia is None:
+                referencia = porcentaje
+                # Solo las raíces interiores ejercitan el buscador; el resto
+                # termina en los extremos del intervalo
+                interior = PORCENTAJE_INICIAL < porcentaje < PORCENTAJE_LIMITE
+            elif porcentaje != referencia:
+                discrepancias[metodo].append((perfil, referencia, porcentaje))
+            if interior:
+                evaluaciones_interior[metodo].append(resultado.iteraciones)
+
+    total = len(evaluaciones["biseccion"])
+    total_interior = len(evaluaciones_interior["biseccion"])
+    print(f"Perfiles: {total} ({total_interior} con raíz interior)")
+    print(
+        f"{'método':<18} {'eval. media':>11} {'eval. interior':>14} "
+        f"{'eval. máx':>9} {'ms/cotización':>13} {'difieren':>8}"
+    )
+    for metodo, conteos in evaluaciones.items():
+        interiores = evaluaciones_interior[metodo]
+        media_interior = sum(interiores) / len(interiores) if interiores else 0.0
+        print(
+            f"{metodo:<18} {sum(conteos) / total:>11.1f} {media_interior:>14.1f} "
+            f"{max(conteos):>9d} {tiempos[metodo] / total * 1000:>13.3f} "
+            f"{len(discrepancias[metodo]):>8d}"
+        )
+
+    for metodo, casos in discrepancias.items():
+        for perfil, referencia, porcentaje in casos:
+            print(f"  {metodo}: {perfil} biseccion={referencia} {metodo}={porcentaje}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Verificación de la invalidación por cambio de assets en caliente.
+
+Copia el proyecto (src, benchmarks y assets) a una carpeta temporal. Un
+proceso cotiza y proyecta expuestos con los assets originales, modifica los
+de RUMBO (mortalidad x3, caducidad 40, ajuste de mortalidad y gasto de
+mantenimiento) y repite los mismos cálculos sin reiniciarse, directamente y
+a través del ejecutor de cotizaciones (con sus procesos ya iniciados), y una
+vez más para leer las cotizaciones guardadas en la caché. Luego un proceso
+nuevo los calcula leyendo los assets modificados desde el inicio:
+los resultados deben ser idénticos y distintos de los originales.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.cambio_assets
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Espera tras modificar los assets: más que el intervalo de revisión de
+# versión del registro y de la caché
+ESPERA_CAMBIO_SEGUNDOS = 1.5
+
+# Perfiles con porcentaje de devolución óptimo interior (no en los límites
+# del intervalo), que cambia con los assets
+ENTRADA_DIRECTA = {
+    "producto": "RUMBO",
+    "parametros": {
+        "edad_actuarial": 30,
+        "sexo": "M",
+        "fumador": False,
+        "periodo_vigencia": 5,
+        "periodo_pago_primas": 5,
+        "prima": 1000,
+        "frecuencia_pago_primas": "MENSUAL",
+    },
+}
+# Distinta de la directa para que el ejecutor no la encuentre en la caché
+ENTRADA_EJECUTOR = {
+    "producto": "RUMBO",
+    "parametros": {**ENTRADA_DIRECTA["parametros"], "edad_actuarial": 45},
+}
+PROYECCION = {
+    "edad_actuarial": 40,
+    "sexo": "F",
+    "fumador": True,
+    "frecuencia_pago_primas": "ANUAL",
+    "periodo_vigencia": 15,
+    "periodo_pago_primas": 15,
+    "ajuste_mortalidad": 1.0,
+}
+
+
+def _calcular(ejecutor) -> dict:
+    """Cotización directa, cotización por el ejecutor y proyección de expuestos"""
+    from src.models.schemas.cotizacion_schema import CotizacionInput
+    from src.services.expuestos_mes_service import expuestos_mes_service
+
+    directa = ejecutor.servicio.cotizar(CotizacionInput.model_validate(ENTRADA_DIRECTA))
+    por_ejecutor = asyncio.run(
+        ejecutor.cotizar(CotizacionInput.model_validate(ENTRADA_EJECUTOR))
+    )
+    expuestos = expuestos_mes_service.calcular_expuestos_mes(**PROYECCION)
+    return {
+        "cotizacion": directa.model_dump(mode="json"),
+        "cotizacion_ejecutor": por_ejecutor.model_dump(mode="json"),
+        "expuestos": "".join(expuestos_mes_service.serializar_proyeccion(expuestos)),
+    }
+
+
+def _modificar_assets(carpeta: Path) -> None:
+    def escribir(nombre, datos):
+        with open(carpeta / nombre, "w", encoding="utf-8") as f:
+            json.dump(datos, f, indent=2)
+
+    def leer(nombre):
+        with open(carpeta / nombre, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    mortalidad = leer("tabla_mortalidad.json")
+    escribir(
+        "tabla_mortalidad.json",
+        {
+            edad: {clave: valor * 3 for clave, valor in tasas.items()}
+            for edad, tasas in mortalidad.items()
+        },
+    )
+    escribir("caducidad.json", {anio: 40 for anio in leer("caducidad.json")})
+    escribir(
+        "caducidad_mensual.json",
+        {
+            anio: {mes: 40 for mes in meses}
+            for anio, meses in leer("caducidad_mensual.json").items()
+        },
+    )
+    parametros = leer("parametros.json")
+    parametros["ajuste_mortalidad"] = 200
+    parametros["gasto_mantenimiento"] = 5
+    escribir("parametros.json", parametros)
+
+
+def _etapa_en_caliente() -> dict:
+    from src.services.cotizacion.cotizador_service import CotizadorService
+    from src.services.cotizacion.ejecutor_cotizaciones import EjecutorCotizaciones
+
+    ejecutor = EjecutorCotizaciones(CotizadorService(), procesos=1)
+    asyncio.run(ejecutor.iniciar())
+    try:
+        antes = _calcular(ejecutor)
+        _modificar_assets(Path("assets") / "rumbo")
+        time.sleep(ESPERA_CAMBIO_SEGUNDOS)
+        despues = _calcular(ejecutor)
+        # Las cotizaciones se repiten para leer las guardadas en la caché
+        guardado = _calcular(ejecutor)
+    finally:
+        asyncio.run(ejecutor.cerrar())
+    return {"antes": antes, "despues": despues, "guardado": guardado}
+
+
+def _etapa_nuevo() -> dict:
+    from src.services.cotizacion.cotizador_service import CotizadorService
+    from src.services.cotizacion.ejecutor_cotizaciones import EjecutorCotizaciones
+
+    ejecutor = EjecutorCotizaciones(CotizadorService(), procesos=1)
+    asyncio.run(ejecutor.iniciar())
+    try:
+        return _calcular(ejecutor)
+    finally:
+        asyncio.run(ejecutor.cerrar())
+
+
+def _ejecutar_etapa(copia: Path, etapa: str) -> dict:
+    entorno = {
+        **os.environ,
+        "CACHE_ALMACEN": "memoria",
+        "GRILLA_COTIZACIONES_HABILITADA": "false",
+    }
+    proceso = subprocess.run(
+        [sys.executable, "-m", "benchmarks.cambio_assets", "--etapa", etapa],
+        cwd=copia,
+        env=entorno,
+        capture_output=True,
+        text=True,
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(f"Falló la etapa {etapa}:\n{proceso.stderr}")
+    # La última línea es el resultado; las anteriores, mensajes del proceso
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as temporal:
+        copia = Path(temporal)
+        ignorar = shutil.ignore_patterns("__pycache__", "*.pyc")
+        for carpeta in ("src", "benchmarks", "assets"):
+            shutil.copytree(RAIZ / carpeta, copia / carpeta, ignore=ignorar)
+
+        en_caliente = _ejecutar_etapa(copia, "en_caliente")
+        nuevo = _ejecutar_etapa(copia, "nuevo")
+
+    fallas = 0
+    for calculo, esperado in nuevo.items():
+        antes = en_caliente["antes"][calculo]
+        despues = en_caliente["despues"][calculo]
+        guardado = en_caliente["guardado"][calculo]
+        cambio = antes != esperado
+        coincide = despues == esperado and guardado == esperado
+        print(
+            f"{calculo:<20} cambia con los assets: {'sí' if cambio else 'no':<3} "
+            f"en caliente (y guardado) = proceso nuevo: {'sí' if coincide else 'NO'}"
+        )
+        if not cambio or not coincide:
+            fallas += 1
+            if calculo != "expuestos":
+                print(f"  antes:         {antes['rumbo']}")
+                print(f"  en caliente:   {despues['rumbo']}")
+                print(f"  guardado:      {guardado['rumbo']}")
+                print(f"  proceso nuevo: {esperado['rumbo']}")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--etapa":
+        etapa = {"en_caliente": _etapa_en_caliente, "nuevo": _etapa_nuevo}
+        print(json.dumps(etapa[sys.argv[2]]()))
+    else:
+        sys.exit(main())
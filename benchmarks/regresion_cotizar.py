@@ -0,0 +1,295 @@
+"""
+Regresión de /cotizar y /cotizar/batch: caché, ETag, coalescencia y lotes.
+
+Copia el proyecto (src, benchmarks y assets) a una carpeta temporal y, en un
+proceso con un trabajador en el ejecutor, llama a la aplicación por ASGI
+(sin servidor ni cliente HTTP) para comprobar que:
+
+- una cotización leída de la caché es igual a la calculada
+- If-None-Match con el ETag (también débil, W/"...") o con "*" responde 304
+  sin cotizar, y con otro ETag responde 200
+- tras modificar los assets cambian el ETag y la clave de la caché: la
+  cotización se calcula de nuevo y el ETag anterior ya no da 304
+- solicitudes idénticas simultáneas comparten un único cálculo
+- en un lote (arreglo JSON o NDJSON), los errores de una entrada (422 por
+  validación, 400 por una línea o un final de arreglo inválidos) no afectan
+  al resto, y con orden=entrada las líneas llegan en el orden del lote
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.regresion_cotizar
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.cambio_assets import ESPERA_CAMBIO_SEGUNDOS, RAIZ, _modificar_assets
+
+COTIZAR = "/api/v1/productos/cotizar"
+LOTE = "/api/v1/productos/cotizar/batch"
+
+# Solicitudes idénticas simultáneas y demora del cálculo, para que todas
+# lleguen mientras el primero está en curso
+SIMULTANEAS = 8
+DEMORA_CALCULO_SEGUNDOS = 0.3
+
+
+def _entrada(edad: int, periodo: int = 5) -> dict:
+    return {
+        "producto": "RUMBO",
+        "parametros": {
+            "edad_actuarial": edad,
+            "sexo": "M",
+            "fumador": False,
+            "periodo_vigencia": periodo,
+            "periodo_pago_primas": periodo,
+            "prima": 1000,
+            "frecuencia_pago_primas": "MENSUAL",
+        },
+    }
+
+
+# Perfil con porcentaje de devolución óptimo interior, que cambia con los
+# assets modificados (ver benchmarks.cambio_assets)
+ENTRADA = _entrada(30)
+# Edad fuera del rango del esquema: 422
+ENTRADA_INVALIDA = _entrada(5)
+
+
+async def _solicitud(app, metodo, ruta, cuerpo=b"", cabeceras=None, consulta=""):
+    """Llama a la aplicación ASGI y retorna (estado, cabeceras, cuerpo)"""
+    alcance = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": metodo,
+        "scheme": "http",
+        "path": ruta,
+        "raw_path": ruta.encode(),
+        "query_string": consulta.encode(),
+        "root_path": "",
+        "headers": [
+            (nombre.lower().encode(), valor.encode())
+            for nombre, valor in (cabeceras or {}).items()
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    pendiente = [{"type": "http.request", "body": cuerpo, "more_body": False}]
+    respuesta = {"cuerpo": []}
+
+    async def recibir():
+        if pendiente:
+            return pendiente.pop()
+        # El cliente no se desconecta: se espera hasta que termine la respuesta
+        await asyncio.Event().wait()
+
+    async def enviar(mensaje):
+        if mensaje["type"] == "http.response.start":
+            respuesta["estado"] = mensaje["status"]
+            respuesta["cabeceras"] = {
+                nombre.decode(): valor.decode() for nombre, valor in mensaje["headers"]
+            }
+        elif mensaje["type"] == "http.response.body":
+            respuesta["cuerpo"].append(mensaje.get("body", b""))
+
+    await app(alcance, recibir, enviar)
+    return respuesta["estado"], respuesta["cabeceras"], b"".join(respuesta["cuerpo"])
+
+
+async def _cotizar(app, entrada, if_none_match=None):
+    cabeceras = {"content-type": "application/json"}
+    if if_none_match is not None:
+        cabeceras["if-none-match"] = if_none_match
+    return await _solicitud(app, "POST", COTIZAR, json.dumps(entrada).encode(), cabeceras)
+
+
+async def _lote(app, cuerpo: bytes, tipo="application/json", orden="entrada"):
+    estado, _, respuesta = await _solicitud(
+        app, "POST", LOTE, cuerpo, {"content-type": tipo}, consulta=f"orden={orden}"
+    )
+    assert estado == 200, f"lote: estado {estado}: {respuesta[:200]!r}"
+    return [json.loads(linea) for linea in respuesta.decode().splitlines()]
+
+
+async def verificar_cache(app, contenedor) -> None:
+    cache = contenedor.cache_cotizaciones
+    antes = cache.estadisticas()
+    estado, cabeceras, calculada = await _cotizar(app, ENTRADA)
+    assert estado == 200, f"estado {estado}: {calculada[:200]!r}"
+    estado, _, guardada = await _cotizar(app, ENTRADA)
+    assert estado == 200
+    despues = cache.estadisticas()
+    assert despues["fallos"] == antes["fallos"] + 1, "la primera no fue un fallo"
+    assert despues["aciertos"] == antes["aciertos"] + 1, "la segunda no fue un acierto"
+    assert json.loads(guardada) == json.loads(calculada), "acierto distinto del cálculo"
+
+
+async def verificar_if_none_match(app, contenedor) -> None:
+    _, cabeceras, _ = await _cotizar(app, ENTRADA)
+    etag = cabeceras["etag"]
+    ejecutadas = contenedor.cotizaciones_en_curso.estadisticas()["ejecutadas"]
+    for if_none_match in ("*", etag, f"W/{etag}", f'"otro", W/{etag}'):
+        estado, cabeceras, cuerpo = await _cotizar(app, ENTRADA, if_none_match)
+        assert estado == 304, f"If-None-Match {if_none_match}: estado {estado}"
+        assert cabeceras["etag"] == etag and cuerpo == b""
+    assert contenedor.cotizaciones_en_curso.estadisticas()["ejecutadas"] == ejecutadas
+    estado, _, _ = await _cotizar(app, ENTRADA, '"otro", W/"otro"')
+    assert estado == 200, f"If-None-Match distinto: estado {estado}"
+
+
+async def verificar_cambio_assets(app, contenedor) -> None:
+    cache = contenedor.cache_cotizaciones
+    _, cabeceras, anterior = await _cotizar(app, ENTRADA)
+    etag = cabeceras["etag"]
+
+    _modificar_assets(Path("assets") / "rumbo")
+    time.sleep(ESPERA_CAMBIO_SEGUNDOS)
+
+    antes = cache.estadisticas()
+    estado, cabeceras, nueva = await _cotizar(app, ENTRADA, etag)
+    assert estado == 200, f"el ETag anterior respondió {estado}"
+    assert cabeceras["etag"] != etag, "el ETag no cambió con los assets"
+    assert cache.estadisticas()["fallos"] == antes["fallos"] + 1, "se leyó de la caché"
+    assert json.loads(nueva) != json.loads(anterior), "la cotización no cambió"
+
+    estado, _, guardada = await _cotizar(app, ENTRADA, etag)
+    assert estado == 200 and json.loads(guardada) == json.loads(nueva)
+    estado, _, _ = await _cotizar(app, ENTRADA, cabeceras["etag"])
+    assert estado == 304, f"el ETag nuevo respondió {estado}"
+
+
+async def verificar_coalescencia(app, contenedor) -> None:
+    ejecutor = contenedor.ejecutor_cotizaciones
+    ejecutar = ejecutor.ejecutar
+
+    async def ejecutar_con_demora(*argumentos):
+        await asyncio.sleep(DEMORA_CALCULO_SEGUNDOS)
+        return await ejecutar(*argumentos)
+
+    en_curso = contenedor.cotizaciones_en_curso.estadisticas()
+    calculadas = ejecutor.estadisticas()["ejecutadas"]
+    ejecutor.ejecutar = ejecutar_con_demora
+    try:
+        respuestas = await asyncio.gather(
+            *(_cotizar(app, _entrada(35)) for _ in range(SIMULTANEAS))
+        )
+    finally:
+        del ejecutor.ejecutar
+
+    assert all(estado == 200 for estado, _, _ in respuestas)
+    assert len({cuerpo for _, _, cuerpo in respuestas}) == 1, "respuestas distintas"
+    assert ejecutor.estadisticas()["ejecutadas"] == calculadas + 1, (
+        f"{ejecutor.estadisticas()['ejecutadas'] - calculadas} cálculos"
+    )
+    despues = contenedor.cotizaciones_en_curso.estadisticas()
+    assert despues["ejecutadas"] == en_curso["ejecutadas"] + 1
+    assert despues["coalescidas"] == en_curso["coalescidas"] + SIMULTANEAS - 1
+
+
+async def verificar_lote(app, contenedor) -> None:
+    entradas = [_entrada(40), _entrada(45, periodo=10)]
+    esperados = []
+    for entrada in entradas:
+        _, _, cuerpo = await _cotizar(app, entrada)
+        esperados.append(json.loads(cuerpo))
+
+    # Arreglo JSON con índices propios; los válidos se calculan de nuevo
+    # (otro periodo) para que terminen después de los inválidos
+    nuevas = [_entrada(40, periodo=15), _entrada(45, periodo=20)]
+    arreglo = [
+        {"indice": "a", **nuevas[0]},
+        {"indice": "b", **ENTRADA_INVALIDA},
+        {"indice": "c", **nuevas[1]},
+        {"indice": "d", "producto": "NO-EXISTE", "parametros": {}},
+    ]
+    cuerpo = json.dumps(arreglo).encode()
+    lineas = await _lote(app, cuerpo, orden="entrada")
+    assert [linea["indice"] for linea in lineas] == ["a", "b", "c", "d"], lineas
+    assert [linea["estado"] for linea in lineas] == [200, 422, 200, 422], lineas
+    terminado = await _lote(app, cuerpo, orden="terminado")
+    assert sorted(terminado, key=lambda linea: linea["indice"]) == lineas
+
+    # NDJSON sin índices: se usa la posición; una línea inválida es un 400
+    ndjson = "\n".join(
+        [
+            json.dumps(entradas[0]),
+            "{no es json",
+            json.dumps(ENTRADA_INVALIDA),
+            json.dumps(entradas[1]),
+        ]
+    )
+    lineas = await _lote(app, ndjson.encode(), tipo="application/x-ndjson")
+    assert [linea["indice"] for linea in lineas] == [0, 1, 2, 3], lineas
+    assert [linea["estado"] for linea in lineas] == [200, 400, 422, 200], lineas
+    assert [lineas[0]["resultado"], lineas[3]["resultado"]] == esperados
+
+    # Un arreglo cortado: los elementos leídos se cotizan y el error va al final
+    truncado = json.dumps(entradas)[:-1] + ', {"producto": '
+    lineas = await _lote(app, truncado.encode())
+    assert [linea["estado"] for linea in lineas] == [200, 200, 400], lineas
+    assert lineas[-1]["indice"] is None
+    assert [linea["resultado"] for linea in lineas[:2]] == esperados
+
+
+VERIFICACIONES = [
+    verificar_cache,
+    verificar_if_none_match,
+    verificar_coalescencia,
+    verificar_lote,
+    # Al final: modifica los assets de la copia
+    verificar_cambio_assets,
+]
+
+
+async def _etapa() -> int:
+    from src.main import app
+
+    fallas = 0
+    async with app.router.lifespan_context(app):
+        contenedor = app.state.contenedor
+        for verificacion in VERIFICACIONES:
+            nombre = verificacion.__name__.replace("verificar_", "")
+            try:
+                await verificacion(app, contenedor)
+            except AssertionError as e:
+                fallas += 1
+                print(f"{nombre:<18} FALLA: {e}")
+            else:
+                print(f"{nombre:<18} ok")
+    return 1 if fallas else 0
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as temporal:
+        copia = Path(temporal)
+        ignorar = shutil.ignore_patterns("__pycache__", "*.pyc")
+        for carpeta in ("src", "benchmarks", "assets"):
+            shutil.copytree(RAIZ / carpeta, copia / carpeta, ignore=ignorar)
+        entorno = {
+            **os.environ,
+            "CACHE_ALMACEN": "memoria",
+            "CACHE_COTIZACIONES_HABILITADA": "true",
+            "COALESCENCIA_COTIZACIONES_HABILITADA": "true",
+            "EJECUTOR_COTIZACIONES_PROCESOS": "1",
+            "GRILLA_COTIZACIONES_HABILITADA": "false",
+        }
+        proceso = subprocess.run(
+            [sys.executable, "-m", "benchmarks.regresion_cotizar", "--etapa"],
+            cwd=copia,
+            env=entorno,
+        )
+    return proceso.returncode
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--etapa"]:
+        sys.exit(asyncio.run(_etapa()))
+    else:
+        sys.exit(main())
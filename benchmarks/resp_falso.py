@@ -0,0 +1,191 @@
+"""
+Servidor falso del protocolo de Redis (RESP) para las verificaciones.
+
+Guarda los valores en memoria y entiende los comandos que usa AlmacenRedis
+(AUTH, SELECT, PING, GET, SET con PX, DEL y SCAN con MATCH y COUNT); al
+resto responde con un error, como Redis. Permite forzar la respuesta cruda
+del próximo comando y cortar las conexiones abiertas para simular fallas.
+"""
+
+import fnmatch
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+
+class _ManejadorResp(socketserver.StreamRequestHandler):
+    def handle(self):
+        servidor: "ServidorRespFalso" = self.server.falso
+        servidor._registrar_conexion(self.request)
+        try:
+            while True:
+                comando = self._leer_comando()
+                if comando is None:
+                    return
+                self.wfile.write(servidor._responder(comando))
+        except (OSError, ValueError):
+            return
+        finally:
+            servidor._olvidar_conexion(self.request)
+
+    def _leer_comando(self) -> Optional[List[bytes]]:
+        linea = self.rfile.readline()
+        if not linea:
+            return None
+        if not linea.startswith(b"*"):
+            raise ValueError(f"Comando no reconocido: {linea!r}")
+        argumentos = []
+        for _ in range(int(linea[1:])):
+            cabecera = self.rfile.readline()
+            largo = int(cabecera[1:])
+            argumentos.append(self.rfile.read(largo + 2)[:-2])
+        return argumentos
+
+
+class _ServidorTCP(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ServidorRespFalso:
+    """
+    Servidor RESP en memoria en un hilo, escuchando en 127.0.0.1 y un puerto
+    libre. Se usa como gestor de contexto.
+    """
+
+    def __init__(self, contrasena: Optional[str] = None):
+        self.contrasena = contrasena
+        # Valor, vencimiento y ranura de cada clave; SCAN recorre las ranuras
+        # en orden, así borrar durante el recorrido no salta claves
+        self._valores: Dict[bytes, Tuple[bytes, Optional[float], int]] = {}
+        self._proxima_ranura = 0
+        self._respuestas_forzadas: Deque[bytes] = deque()
+        self._conexiones: Set[socket.socket] = set()
+        self._lock = threading.Lock()
+        self.conexiones_aceptadas = 0
+        self._servidor = _ServidorTCP(("127.0.0.1", 0), _ManejadorResp)
+        self._servidor.falso = self
+        self._hilo = threading.Thread(
+            target=self._servidor.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def puerto(self) -> int:
+        return self._servidor.server_address[1]
+
+    def url(self, base_datos: int = 0) -> str:
+        credenciales = f":{self.contrasena}@" if self.contrasena else ""
+        return f"redis://{credenciales}127.0.0.1:{self.puerto}/{base_datos}"
+
+    def __enter__(self) -> "ServidorRespFalso":
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cortar_conexiones()
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def forzar_respuesta(self, respuesta: bytes) -> None:
+        """Responde el próximo comando con estos bytes, sin ejecutarlo"""
+        with self._lock:
+            self._respuestas_forzadas.append(respuesta)
+
+    def cortar_conexiones(self) -> None:
+        """Cierra las conexiones abiertas, como un reinicio del servidor"""
+        with self._lock:
+            conexiones = list(self._conexiones)
+        for conexion in conexiones:
+            try:
+                conexion.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def claves(self) -> List[bytes]:
+        with self._lock:
+            return sorted(clave for clave in self._valores if self._vigente(clave))
+
+    def _registrar_conexion(self, conexion: socket.socket) -> None:
+        with self._lock:
+            self._conexiones.add(conexion)
+            self.conexiones_aceptadas += 1
+
+    def _olvidar_conexion(self, conexion: socket.socket) -> None:
+        with self._lock:
+            self._conexiones.discard(conexion)
+
+    def _vigente(self, clave: bytes) -> bool:
+        _, vence, _ = self._valores[clave]
+        if vence is not None and vence <= time.monotonic():
+            del self._valores[clave]
+            return False
+        return True
+
+    def _responder(self, comando: List[bytes]) -> bytes:
+        with self._lock:
+            if self._respuestas_forzadas:
+                return self._respuestas_forzadas.popleft()
+            nombre = comando[0].upper().decode()
+            argumentos = comando[1:]
+            if nombre == "AUTH":
+                if argumentos[-1].decode() != self.contrasena:
+                    return b"-WRONGPASS invalid username-password pair\r\n"
+                return b"+OK\r\n"
+            if nombre == "SELECT":
+                return b"+OK\r\n"
+            if nombre == "PING":
+                return b"+PONG\r\n"
+            if nombre == "GET":
+                clave = argumentos[0]
+                if clave not in self._valores or not self._vigente(clave):
+                    return b"$-1\r\n"
+                return _cadena(self._valores[clave][0])
+            if nombre == "SET":
+                vence = None
+                if len(argumentos) == 4 and argumentos[2].upper() == b"PX":
+                    vence = time.monotonic() + int(argumentos[3]) / 1000
+                clave = argumentos[0]
+                if clave in self._valores:
+                    ranura = self._valores[clave][2]
+                else:
+                    ranura = self._proxima_ranura
+                    self._proxima_ranura += 1
+                self._valores[clave] = (argumentos[1], vence, ranura)
+                return b"+OK\r\n"
+            if nombre == "DEL":
+                eliminadas = 0
+                for clave in argumentos:
+                    if self._valores.pop(clave, None) is not None:
+                        eliminadas += 1
+                return b":%d\r\n" % eliminadas
+            if nombre == "SCAN":
+                return self._scan(argumentos)
+            return f"-ERR unknown command '{nombre}'\r\n".encode()
+
+    def _scan(self, argumentos: List[bytes]) -> bytes:
+        opciones = dict(zip(argumentos[1::2], argumentos[2::2]))
+        patron = opciones.get(b"MATCH", b"*").decode()
+        cantidad = int(opciones.get(b"COUNT", b"10"))
+        cursor = int(argumentos[0])
+        ranuras = sorted(
+            (self._valores[clave][2], clave)
+            for clave in list(self._valores)
+            if self._vigente(clave) and self._valores[clave][2] >= cursor
+        )
+        pagina = [clave for _, clave in ranuras[:cantidad]]
+        siguiente = ranuras[cantidad][0] if len(ranuras) > cantidad else 0
+        coincidentes = [c for c in pagina if fnmatch.fnmatchcase(c.decode(), patron)]
+        claves = b"".join(_cadena(clave) for clave in coincidentes)
+        return (
+            b"*2\r\n"
+            + _cadena(str(siguiente).encode())
+            + b"*%d\r\n" % len(coincidentes)
+            + claves
+        )
+
+
+def _cadena(valor: bytes) -> bytes:
+    return b"$%d\r\n%s\r\n" % (len(valor), valor)
@@ -10,6 +10,7 @@ setup(
         "pydantic>=2.4.2",
         "pydantic-settings>=2.0.3",
         "python-dotenv>=1.0.0",
+        "numpy>=1.26.0",
         "scipy>=1.15.2",
     ],
 ) 
\ No newline at end of file
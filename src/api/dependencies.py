@@ -1,33 +1,48 @@
-from fastapi import Depends
-from typing import Generator
+from fastapi import Depends, Request
 
-from src.repositories.cotizacion_repository import CotizacionRepository
+from src.services.contenedor_servicios import ContenedorServicios
 from src.services.cotizacion import CotizadorService
+from src.services.cotizacion.cache_cotizaciones import CacheCotizaciones
+from src.services.cotizacion.cotizaciones_en_curso import CotizacionesEnCurso
+from src.services.cotizacion.ejecutor_cotizaciones import EjecutorCotizaciones
 
 
-def get_cotizacion_repository() -> Generator[CotizacionRepository, None, None]:
+def get_contenedor(request: Request) -> ContenedorServicios:
     """
-    Devuelve una instancia del repositorio de cotizaciones.
-    En un entorno de producción, aquí se manejaría la conexión a BD.
+    Devuelve el contenedor de servicios construido en el inicio de la
+    aplicación. Si la aplicación se usa sin su ciclo de vida (ej: en pruebas),
+    se construye una vez y se guarda en app.state.
     """
-    repository = CotizacionRepository()
-    try:
-        yield repository
-    finally:
-        # Cerrar conexiones si fuera necesario
-        pass
+    contenedor = getattr(request.app.state, "contenedor", None)
+    if contenedor is None:
+        contenedor = ContenedorServicios.construir()
+        request.app.state.contenedor = contenedor
+    return contenedor
 
 
 def get_cotizador_service(
-    repository: CotizacionRepository = Depends(get_cotizacion_repository),
-) -> Generator[CotizadorService, None, None]:
-    """
-    Devuelve una instancia del servicio de cotizaciones.
-    Utiliza el patrón de inyección de dependencias.
-    """
-    service = CotizadorService(repository)
-    try:
-        yield service
-    finally:
-        # Limpieza si fuera necesaria
-        pass
+    contenedor: ContenedorServicios = Depends(get_contenedor),
+) -> CotizadorService:
+    """Servicio de cotizaciones compartido por todas las solicitudes"""
+    return contenedor.cotizador_service
+
+
+def get_cache_cotizaciones(
+    contenedor: ContenedorServicios = Depends(get_contenedor),
+) -> CacheCotizaciones:
+    """Caché de cotizaciones del proceso"""
+    return contenedor.cache_cotizaciones
+
+
+def get_cotizaciones_en_curso(
+    contenedor: ContenedorServicios = Depends(get_contenedor),
+) -> CotizacionesEnCurso:
+    """Cálculos de cotización en curso, compartidos por solicitudes idénticas"""
+    return contenedor.cotizaciones_en_curso
+
+
+def get_ejecutor_cotizaciones(
+    contenedor: ContenedorServicios = Depends(get_contenedor),
+) -> EjecutorCotizaciones:
+    """Ejecutor que corre las cotizaciones fuera del event loop"""
+    return contenedor.ejecutor_cotizaciones
@@ -0,0 +1,54 @@
+import hashlib
+import json
+from typing import Dict, Optional
+
+from src.models.schemas.cotizacion_schema import CotizacionInput
+from src.repositories.registro_datos_referencia import registro_datos_referencia
+from src.services.cotizacion.cache_cotizaciones import (
+    clave_cotizacion,
+    huella_configuracion,
+)
+
+
+def etag_cotizacion(cotizacion_input: CotizacionInput, recurso: str) -> str:
+    """
+    ETag fuerte de una cotización: hash del recurso, la clave canónica de la
+    entrada, la versión de los assets del producto y la configuración que
+    afecta al resultado. Se calcula sin ejecutar el pipeline.
+
+    Args:
+        cotizacion_input: Entrada de la cotización
+        recurso: Endpoint que genera la respuesta (ej: "cotizar")
+    """
+    producto = cotizacion_input.producto.value
+    datos = [
+        recurso,
+        clave_cotizacion(cotizacion_input),
+        registro_datos_referencia.obtener(producto).version,
+        huella_configuracion(producto),
+    ]
+    huella = hashlib.sha256(json.dumps(datos).encode("utf-8")).hexdigest()
+    return f'"{huella[:32]}"'
+
+
+def coincide_if_none_match(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Indica si la cabecera If-None-Match incluye el ETag (comparación débil,
+    como pide la RFC 9110 para esta cabecera) o es "*".
+    """
+    if not if_none_match:
+        return False
+    for candidato in if_none_match.split(","):
+        candidato = candidato.strip()
+        if candidato == "*":
+            return True
+        if candidato.startswith("W/"):
+            candidato = candidato[2:]
+        if candidato == etag:
+            return True
+    return False
+
+
+def cabeceras_etag(etag: str) -> Dict[str, str]:
+    """Cabeceras de una respuesta con ETag: el cliente debe revalidar siempre"""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
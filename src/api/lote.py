@@ -0,0 +1,90 @@
+import json
+from typing import Any, Iterator, Tuple
+
+from fastapi import Request
+
+TIPOS_NDJSON = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+_decodificador = json.JSONDecoder()
+
+
+def es_ndjson(request: Request) -> bool:
+    """Indica si el cuerpo de la solicitud es NDJSON (un JSON por línea)"""
+    tipo = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    return tipo in TIPOS_NDJSON
+
+
+def _indice(posicion: int, elemento: Any) -> Any:
+    """Índice del elemento: su campo "indice" o su posición en el lote"""
+    if isinstance(elemento, dict) and "indice" in elemento:
+        return elemento["indice"]
+    return posicion
+
+
+def leer_ndjson(cuerpo: bytes) -> Iterator[Tuple[Any, Any]]:
+    """
+    Entrega (indice, elemento) por cada línea no vacía de un cuerpo NDJSON, a
+    medida que se recorre; si una línea no es JSON válido, el elemento es el
+    ValueError correspondiente
+    """
+    posicion = 0
+    inicio = 0
+    while inicio < len(cuerpo):
+        fin = cuerpo.find(b"\n", inicio)
+        if fin < 0:
+            fin = len(cuerpo)
+        linea = cuerpo[inicio:fin]
+        inicio = fin + 1
+        if not linea.strip():
+            continue
+        try:
+            elemento = json.loads(linea)
+        except ValueError as e:
+            yield posicion, ValueError(f"La línea {posicion + 1} no es JSON válido: {e}")
+        else:
+            yield _indice(posicion, elemento), elemento
+        posicion += 1
+
+
+def leer_arreglo_json(cuerpo: bytes) -> Iterator[Tuple[Any, Any]]:
+    """
+    Entrega (indice, elemento) por cada elemento de un arreglo JSON, leyendo
+    uno a la vez para no construir el lote completo en memoria
+
+    Raises:
+        ValueError: Si el cuerpo no es un arreglo JSON; un elemento inválido
+            se detecta al llegar a él, durante la iteración
+    """
+    texto = cuerpo.decode("utf-8")
+    posicion = _saltar_espacios(texto, 0)
+    if not texto.startswith("[", posicion):
+        raise ValueError("El cuerpo debe ser un arreglo JSON de cotizaciones")
+    return _elementos_arreglo(texto, _saltar_espacios(texto, posicion + 1))
+
+
+def _elementos_arreglo(texto: str, posicion: int) -> Iterator[Tuple[Any, Any]]:
+    if texto.startswith("]", posicion):
+        return
+
+    cantidad = 0
+    while True:
+        elemento, posicion = _decodificador.raw_decode(texto, posicion)
+        yield _indice(cantidad, elemento), elemento
+        cantidad += 1
+        posicion = _saltar_espacios(texto, posicion)
+        if texto.startswith("]", posicion):
+            break
+        if not texto.startswith(",", posicion):
+            raise ValueError(
+                f"Se esperaba ',' o ']' después del elemento {cantidad - 1} "
+                f"(carácter {posicion})"
+            )
+        posicion = _saltar_espacios(texto, posicion + 1)
+    if _saltar_espacios(texto, posicion + 1) != len(texto):
+        raise ValueError("Contenido adicional después del arreglo JSON")
+
+
+def _saltar_espacios(texto: str, posicion: int) -> int:
+    while posicion < len(texto) and texto[posicion] in " \t\r\n":
+        posicion += 1
+    return posicion
@@ -1,19 +1,25 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from typing import Dict, Any
-from src.services.cotizacion import CotizadorService
+from src.services.cotizacion.cache_cotizaciones import clave_cotizacion
+from src.services.cotizacion.cotizaciones_en_curso import CotizacionesEnCurso
+from src.services.cotizacion.ejecutor_cotizaciones import (
+    ColaCotizacionesLlena,
+    EjecutorCotizaciones,
+)
 from src.models.schemas.cotizacion_schema import CotizacionInput
+from src.api.dependencies import get_cotizaciones_en_curso, get_ejecutor_cotizaciones
+from src.api.etag import cabeceras_etag, coincide_if_none_match, etag_cotizacion
 
 router = APIRouter()
 
 
-def get_coleccion_cotizacion():
-    return CotizadorService()
-
-
 @router.post("/coleccion-cotizacion")
 async def get_coleccion_cotizacion(
     cotizacion: CotizacionInput,
-    service: CotizadorService = Depends(get_coleccion_cotizacion),
+    request: Request,
+    response: Response,
+    ejecutor: EjecutorCotizaciones = Depends(get_ejecutor_cotizaciones),
+    en_curso: CotizacionesEnCurso = Depends(get_cotizaciones_en_curso),
 ):
     """
     🚀 ENDPOINT REFACTORIZADO SIGUIENDO EL PATRÓN STRATEGY
@@ -23,16 +29,34 @@ async def get_coleccion_cotizacion(
     
     Args:
         cotizacion: Datos de cotización validados automáticamente por Pydantic
-        service: Servicio de cotización inyectado
+        ejecutor: Ejecutor que corre la cotización fuera del event loop
+        en_curso: Cálculos en curso; las solicitudes idénticas simultáneas
+            comparten uno solo
         
     Returns:
-        Colección de cotizaciones según el producto especificado
+        Colección de cotizaciones según el producto especificado, con un ETag;
+        si la solicitud envía ese ETag en If-None-Match, se responde 304 sin
+        volver a cotizar
     """
+    etag = etag_cotizacion(cotizacion, "coleccion-cotizacion")
+    if coincide_if_none_match(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cabeceras_etag(etag))
+
     try:
-        return service.get_coleccion_cotizacion(cotizacion)
+        resultado = await en_curso.ejecutar(
+            f"coleccion-cotizacion:{clave_cotizacion(cotizacion)}",
+            lambda: ejecutor.get_coleccion_cotizacion(cotizacion),
+        )
+    except ColaCotizacionesLlena as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error al procesar la cotización: {str(e)}"
         )
+
+    response.headers.update(cabeceras_etag(etag))
+    return resultado
@@ -1,25 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from enum import Enum
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from src.core.config import settings
 from src.models.schemas.cotizacion_schema import (
     CotizacionInput,
     CotizacionOutput,
     TipoProducto,
 )
-from src.services.cotizacion import CotizadorService
+from src.services.cotizacion.cache_cotizaciones import clave_cotizacion
+from src.services.cotizacion.cotizaciones_en_curso import CotizacionesEnCurso
+from src.services.cotizacion.ejecutor_cotizaciones import (
+    ColaCotizacionesLlena,
+    EjecutorCotizaciones,
+)
+from src.services.cotizacion.lote_cotizaciones import cotizar_lote
+from src.api.dependencies import get_cotizaciones_en_curso, get_ejecutor_cotizaciones
+from src.api.etag import cabeceras_etag, coincide_if_none_match, etag_cotizacion
+from src.api.lote import es_ndjson, leer_arreglo_json, leer_ndjson
 
 router = APIRouter()
 
 
-def get_cotizador_service():
-    """Dependencia para obtener el servicio unificado de cotizaciones"""
-    return CotizadorService()
-
-
 @router.post(
     "/cotizar", response_model=CotizacionOutput, response_model_exclude_none=True
 )
 async def cotizar(
     cotizacion: CotizacionInput,
-    service: CotizadorService = Depends(get_cotizador_service),
+    request: Request,
+    response: Response,
+    ejecutor: EjecutorCotizaciones = Depends(get_ejecutor_cotizaciones),
+    en_curso: CotizacionesEnCurso = Depends(get_cotizaciones_en_curso),
 ):
     """
     Cotiza un seguro basado en el producto y parámetros proporcionados.
@@ -63,12 +76,115 @@ async def cotizar(
         }
     }
     ```
+
+    La respuesta lleva un ETag que depende de la entrada y de la versión de
+    los datos. Si la solicitud envía ese ETag en If-None-Match, se responde
+    304 sin volver a cotizar. Las solicitudes idénticas simultáneas comparten
+    un único cálculo, que corre fuera del event loop; si hay demasiadas
+    cotizaciones pendientes se responde 503.
     """
+    etag = etag_cotizacion(cotizacion, "cotizar")
+    if coincide_if_none_match(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cabeceras_etag(etag))
+
     try:
-        return service.cotizar(cotizacion)
+        resultado = await en_curso.ejecutar(
+            f"cotizar:{clave_cotizacion(cotizacion)}",
+            lambda: ejecutor.cotizar(cotizacion),
+        )
+    except ColaCotizacionesLlena as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error al procesar la cotización: {str(e)}"
         )
+
+    response.headers.update(cabeceras_etag(etag))
+    return resultado
+
+
+class OrdenLote(str, Enum):
+    TERMINADO = "terminado"
+    ENTRADA = "entrada"
+
+
+@router.post(
+    "/cotizar/batch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {}}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def cotizar_batch(
+    request: Request,
+    paralelismo: Optional[int] = Query(
+        None, ge=1, le=settings.LOTE_PARALELISMO_MAXIMO
+    ),
+    orden: OrdenLote = OrdenLote.TERMINADO,
+    ejecutor: EjecutorCotizaciones = Depends(get_ejecutor_cotizaciones),
+    en_curso: CotizacionesEnCurso = Depends(get_cotizaciones_en_curso),
+):
+    """
+    Cotiza un lote de entradas y responde en NDJSON, una línea por entrada
+    apenas está lista.
+
+    El cuerpo es un arreglo JSON de entradas como las de /cotizar o, con
+    Content-Type application/x-ndjson, una entrada por línea. Cada entrada
+    puede traer un campo "indice"; si no, se usa su posición en el lote
+    (desde 0).
+
+    Cada línea de la respuesta trae el índice, el estado HTTP de esa entrada
+    y su resultado o su error; el error de una entrada no afecta al resto.
+
+    - paralelismo: cotizaciones en curso a la vez (por defecto, dos por
+      proceso del ejecutor), hasta LOTE_PARALELISMO_MAXIMO
+    - orden: "terminado" entrega cada resultado al terminar; "entrada" en el
+      orden del lote
+
+    Ejemplo de línea:
+    ```json
+    {"indice": 0, "estado": 200, "resultado": {"producto": "RUMBO", ...}}
+    ```
+    """
+    cuerpo = await request.body()
+    if es_ndjson(request):
+        elementos = leer_ndjson(cuerpo)
+    else:
+        try:
+            elementos = leer_arreglo_json(cuerpo)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def cotizar(cotizacion):
+        return en_curso.ejecutar(
+            f"cotizar:{clave_cotizacion(cotizacion)}",
+            lambda: ejecutor.cotizar(cotizacion),
+        )
+
+    async def lineas():
+        async for resultado in cotizar_lote(
+            elementos,
+            cotizar,
+            # El valor por defecto (configurado o por procesos) también se acota
+            paralelismo=min(
+                paralelismo
+                or settings.LOTE_PARALELISMO
+                or 2 * max(ejecutor.procesos, 1),
+                settings.LOTE_PARALELISMO_MAXIMO,
+            ),
+            ordenado=orden == OrdenLote.ENTRADA,
+        ):
+            yield json.dumps(resultado, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lineas(), media_type="application/x-ndjson")
@@ -1,28 +1,50 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-import json
-from decimal import Decimal
+from typing import Optional
 
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+
+from src.core.config import settings
 from src.services.expuestos_mes_service import expuestos_mes_service
+from src.models.domain.proyeccion_frame import ProyeccionFrame
 from src.models.schemas.expuestos_mes_schema import (
+    FormatoProyeccion,
     ProyeccionActuarialInput,
-    ProyeccionActuarialOutput
+    ProyeccionActuarialOutput,
 )
 
 
-# Clase personalizada para codificar números sin notación científica
-class CustomJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return str(obj)
-        return super().default(obj)
+router = APIRouter()
 
 
-router = APIRouter()
+def _calcular_proyeccion(datos: ProyeccionActuarialInput) -> ProyeccionFrame:
+    """Valida los parámetros y calcula la proyección, con los errores como HTTP"""
+    # Validar coherencia de parámetros
+    if datos.periodo_pago_primas > datos.periodo_vigencia:
+        raise HTTPException(
+            status_code=400,
+            detail="El período de pago no puede ser mayor al período de vigencia",
+        )
+
+    try:
+        return expuestos_mes_service.calcular_expuestos_mes(
+            edad_actuarial=datos.edad_actuarial,
+            sexo=datos.sexo.value,
+            fumador=datos.fumador,
+            frecuencia_pago_primas=datos.frecuencia_pago_primas.value,
+            periodo_vigencia=datos.periodo_vigencia,
+            periodo_pago_primas=datos.periodo_pago_primas,
+            ajuste_mortalidad=datos.ajuste_mortalidad
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al calcular proyección actuarial: {str(e)}"
+        )
 
 
-@router.post("/expuestos_mes")
-async def calcular_expuestos_mes(datos: ProyeccionActuarialInput):
+@router.post("/expuestos_mes", response_model=ProyeccionActuarialOutput)
+def calcular_expuestos_mes(datos: ProyeccionActuarialInput):
     """
     Calcula la proyección actuarial de expuestos para un conjunto de parámetros.
 
@@ -46,40 +68,66 @@ async def calcular_expuestos_mes(datos: ProyeccionActuarialInput):
     }
     ```
     """
-    try:
-        # Validar coherencia de parámetros
-        if datos.periodo_pago_primas > datos.periodo_vigencia:
-            raise HTTPException(
-                status_code=400,
-                detail="El período de pago no puede ser mayor al período de vigencia",
-            )
-
-        # Llamar al servicio
-        resultado = expuestos_mes_service.calcular_expuestos_mes(
-            edad_actuarial=datos.edad_actuarial,
-            sexo=datos.sexo.value,
-            fumador=datos.fumador,
-            frecuencia_pago_primas=datos.frecuencia_pago_primas.value,
-            periodo_vigencia=datos.periodo_vigencia,
-            periodo_pago_primas=datos.periodo_pago_primas,
-            ajuste_mortalidad=datos.ajuste_mortalidad
-        )
+    expuestos_mes = _calcular_proyeccion(datos)
 
-        # Validar con el modelo Pydantic
-        resultado_validado = ProyeccionActuarialOutput(**resultado)
+    # Se serializa una sola vez, con los decimales como texto sin notación
+    # científica (mismo documento que ProyeccionActuarialOutput)
+    contenido = "".join(expuestos_mes_service.serializar_proyeccion(expuestos_mes))
+    return Response(content=contenido, media_type="application/json")
 
-        # Devolver como JSON formateado sin notación científica
-        content = json.loads(resultado_validado.model_dump_json(indent=2))
-        formatted_json = json.dumps(content, indent=2, cls=CustomJSONEncoder)
-        
-        return JSONResponse(
-            content=json.loads(formatted_json),
-            status_code=200,
-        )
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
+@router.post("/expuestos_mes/proyeccion", response_class=StreamingResponse)
+def proyectar_expuestos_mes(
+    datos: ProyeccionActuarialInput,
+    formato: Optional[FormatoProyeccion] = Query(
+        None,
+        description=(
+            "filas (un objeto por mes) o columnas (un arreglo por variable); "
+            "por defecto columnas sobre EXPUESTOS_MESES_FORMATO_COLUMNAS meses"
+        ),
+    ),
+    mes_desde: int = Query(1, ge=1, description="Primer mes a entregar"),
+    mes_hasta: Optional[int] = Query(
+        None, ge=1, description="Último mes a entregar, inclusive"
+    ),
+):
+    """
+    Proyección actuarial de expuestos transmitida a medida que se serializa.
+
+    Permite pedir un rango de meses (paginación) y elegir entre filas y
+    columnas; con horizontes largos la salida por columnas evita repetir los
+    nombres de los campos en cada mes. La respuesta incluye el formato
+    usado, los meses calculados, el rango entregado y el resumen de la
+    proyección completa.
+    """
+    expuestos_mes = _calcular_proyeccion(datos)
+
+    meses = expuestos_mes.meses
+    mes_hasta = meses if mes_hasta is None else min(mes_hasta, meses)
+    if mes_desde > mes_hasta:
         raise HTTPException(
-            status_code=500, detail=f"Error al calcular proyección actuarial: {str(e)}"
+            status_code=400,
+            detail=f"El rango de meses {mes_desde}-{mes_hasta} está fuera de la "
+            f"proyección de {meses} meses",
         )
+
+    if formato is None:
+        formato = (
+            FormatoProyeccion.COLUMNAS
+            if mes_hasta - mes_desde + 1 > settings.EXPUESTOS_MESES_FORMATO_COLUMNAS
+            else FormatoProyeccion.FILAS
+        )
+
+    fragmentos = expuestos_mes_service.serializar_proyeccion(
+        expuestos_mes,
+        por_columnas=formato == FormatoProyeccion.COLUMNAS,
+        mes_desde=mes_desde,
+        mes_hasta=mes_hasta,
+        encabezado={
+            "formato": formato.value,
+            "meses_calculados": meses,
+            "mes_desde": mes_desde,
+            "mes_hasta": mes_hasta,
+        },
+    )
+    return StreamingResponse(fragmentos, media_type="application/json")
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends
+from src.api.dependencies import (
+    get_cache_cotizaciones,
+    get_cotizaciones_en_curso,
+    get_ejecutor_cotizaciones,
+)
+from src.services.cotizacion.cache_cotizaciones import CacheCotizaciones
+from src.services.cotizacion.cotizaciones_en_curso import CotizacionesEnCurso
+from src.services.cotizacion.ejecutor_cotizaciones import EjecutorCotizaciones
+
+router = APIRouter()
+
+
+@router.get("/cache")
+async def metricas_cache(
+    cache_cotizaciones: CacheCotizaciones = Depends(get_cache_cotizaciones),
+):
+    """
+    Estado de la caché de cotizaciones: tamaño, límites y contadores de
+    aciertos, fallos, desalojos, expiraciones e invalidaciones.
+    """
+    return cache_cotizaciones.estadisticas()
+
+
+@router.get("/coalescencia")
+async def metricas_coalescencia(
+    cotizaciones_en_curso: CotizacionesEnCurso = Depends(get_cotizaciones_en_curso),
+):
+    """
+    Cálculos de cotización lanzados, en curso y con error, y solicitudes
+    que esperaron un cálculo idéntico en curso (coalescidas).
+    """
+    return cotizaciones_en_curso.estadisticas()
+
+
+@router.get("/ejecutor")
+async def metricas_ejecutor(
+    ejecutor_cotizaciones: EjecutorCotizaciones = Depends(get_ejecutor_cotizaciones),
+):
+    """
+    Estado del ejecutor de cotizaciones: procesos, cotizaciones pendientes y
+    su límite, rechazos por cola llena y tiempos promedio de espera en cola
+    y de ejecución.
+    """
+    return ejecutor_cotizaciones.estadisticas()
@@ -11,9 +11,74 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     PORT: Optional[int] = 8000
     
+    # Método de búsqueda del porcentaje de devolución óptimo
+    # (biseccion, illinois, brent, itp, rejilla, lineal_por_tramos en RUMBO).
+    # Se puede sobrescribir por producto.
+    METODO_OPTIMIZACION: str = "brent"
+    METODO_OPTIMIZACION_RUMBO: Optional[str] = None
+    
+    # Arranque tibio del optimizador: intervalo inicial centrado en el óptimo
+    # de un perfil vecino resuelto recientemente
+    OPTIMIZACION_ARRANQUE_TIBIO: bool = True
+    MEMORIA_OPTIMOS_TAMANO: int = 4096
+    MEMORIA_OPTIMOS_SEMIAMPLITUD: float = 0.5
+    
+    # Implementación de los cálculos de flujo y resultado que usa el motor
+    # actuarial (clasica, vectorizada); ambas dan los mismos resultados
+    FLUJO_RESULTADO_IMPLEMENTACION: str = "vectorizada"
+    
+    # Caché de resultados de cotización
+    CACHE_COTIZACIONES_HABILITADA: bool = True
+    CACHE_COTIZACIONES_TAMANO: int = 1024
+    CACHE_COTIZACIONES_TTL_SEGUNDOS: Optional[float] = 3600.0
+    
+    # Almacén de la caché (memoria, sqlite, redis). sqlite se comparte entre
+    # los procesos de un host y redis entre instancias. La ruta de SQLite es
+    # relativa a la raíz del proyecto.
+    CACHE_ALMACEN: str = "memoria"
+    CACHE_SQLITE_RUTA: str = "data/cache.sqlite3"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_REDIS_TIEMPO_ESPERA_SEGUNDOS: float = 0.5
+    CACHE_PREFIJO: str = "cotizador"
+    
+    # Solicitudes idénticas simultáneas esperan un único cálculo
+    COALESCENCIA_COTIZACIONES_HABILITADA: bool = True
+    
+    # Pool de procesos para las cotizaciones (None: uno por CPU disponible;
+    # 0: pool de hilos del proceso) y cotizaciones que pueden esperar en cola
+    # además de las que están en ejecución
+    EJECUTOR_COTIZACIONES_PROCESOS: Optional[int] = None
+    EJECUTOR_COTIZACIONES_COLA: int = 64
+    
+    # Las cotizaciones de cada período de una colección se calculan en
+    # paralelo en el pool, en lugar de una tras otra en un mismo proceso
+    COLECCION_PARALELA_HABILITADA: bool = True
+    
+    # Cotizaciones en curso a la vez por lote en /cotizar/batch (None: dos por
+    # proceso del ejecutor) y máximo, que acota también el valor por defecto
+    LOTE_PARALELISMO: Optional[int] = None
+    LOTE_PARALELISMO_MAXIMO: int = 64
+    
+    # Proyección de expuestos: sin formato explícito, sobre esta cantidad de
+    # meses se responde por columnas en lugar de una fila por mes
+    EXPUESTOS_MESES_FORMATO_COLUMNAS: int = 240
+    
+    # Grilla precalculada de cotizaciones RUMBO (ruta relativa a la raíz del
+    # proyecto). Se construye con: python -m src.services.cotizacion.construir_grilla
+    # y no se versiona (data/), así que se activa solo donde se construyó
+    GRILLA_COTIZACIONES_HABILITADA: bool = False
+    GRILLA_COTIZACIONES_RUTA: str = "data/grilla_cotizaciones"
+    
     # Configuraciones adicionales aquí
     # DB_URL: str = "sqlite:///./sql_app.db"
     
+    def metodo_optimizacion(self, producto: str) -> str:
+        """Método de optimización del producto, o el global si no tiene uno propio"""
+        return (
+            getattr(self, f"METODO_OPTIMIZACION_{producto.upper()}", None)
+            or self.METODO_OPTIMIZACION
+        )
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -40,7 +40,9 @@ PORCENTAJE_INICIAL = 100.0
 PORCENTAJE_MAXIMO_INICIAL = 130.0
 PORCENTAJE_LIMITE = 200.0
 PASO_INCREMENTO = 10.0
-TOLERANCIA = 1e-6
+# Precisión cercana a la de máquina: el óptimo no depende del intervalo
+# inicial (fijo o sugerido por la memoria de óptimos) al redondear montos
+TOLERANCIA = 1e-10
 MAX_ITERACIONES = 50
 
 # Configuración de cálculos actuariales
@@ -0,0 +1,21 @@
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from src.services.contenedor_servicios import ContenedorServicios
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ciclo de vida de la aplicación: el contenedor de servicios se construye
+    al iniciar y queda en app.state para todas las solicitudes. Los procesos
+    del ejecutor de cotizaciones se inician con los datos precargados antes
+    de aceptar solicitudes y se detienen al terminar las pendientes.
+    """
+    contenedor = ContenedorServicios.construir()
+    await contenedor.ejecutor_cotizaciones.iniciar()
+    app.state.contenedor = contenedor
+    yield
+    await contenedor.ejecutor_cotizaciones.cerrar()
+    app.state.contenedor = None
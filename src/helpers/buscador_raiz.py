@@ -0,0 +1,312 @@
+"""
+Buscadores de raíz sobre un intervalo con cambio de signo.
+Cada implementación recibe la función, el intervalo [a, b] y los valores ya
+evaluados en sus extremos, y cuenta solo las evaluaciones nuevas.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Type
+
+import numpy as np
+
+EPSILON_MAQUINA = 2.220446049250313e-16
+
+
+@dataclass
+class ResultadoRaiz:
+    """Resultado de una búsqueda de raíz"""
+
+    raiz: float
+    valor: float
+    evaluaciones: int
+    convergio: bool
+
+
+class BuscadorRaiz(ABC):
+    """
+    Interfaz común de los buscadores de raíz.
+    Se detienen cuando |f(x)| < tol o cuando el intervalo mide menos de tol.
+    """
+
+    nombre: str = ""
+
+    @abstractmethod
+    def buscar(
+        self,
+        funcion: Callable[[float], float],
+        a: float,
+        b: float,
+        fa: float,
+        fb: float,
+        tol: float,
+        max_iter: int,
+    ) -> ResultadoRaiz:
+        pass
+
+
+class Biseccion(BuscadorRaiz):
+    """Bisección clásica: un bit de precisión por evaluación"""
+
+    nombre = "biseccion"
+
+    def buscar(self, funcion, a, b, fa, fb, tol, max_iter) -> ResultadoRaiz:
+        evaluaciones = 0
+
+        for _ in range(max_iter):
+            c = (a + b) / 2.0
+            fc = funcion(c)
+            evaluaciones += 1
+
+            if abs(fc) < tol:
+                return ResultadoRaiz(c, fc, evaluaciones, True)
+
+            if fa * fc < 0:
+                b, fb = c, fc
+            else:
+                a, fa = c, fc
+
+            if abs(b - a) < tol:
+                break
+
+        raiz, valor = (a, fa) if abs(fa) < abs(fb) else (b, fb)
+        return ResultadoRaiz(raiz, valor, evaluaciones, abs(b - a) < tol)
+
+
+class Illinois(BuscadorRaiz):
+    """
+    Regula falsi con la modificación de Illinois: si el mismo extremo se
+    conserva dos veces seguidas, su valor se divide a la mitad.
+    """
+
+    nombre = "illinois"
+
+    def buscar(self, funcion, a, b, fa, fb, tol, max_iter) -> ResultadoRaiz:
+        evaluaciones = 0
+        lado = 0
+        mejor = (a, fa) if abs(fa) < abs(fb) else (b, fb)
+
+        for _ in range(max_iter):
+            c = (a * fb - b * fa) / (fb - fa)
+            fc = funcion(c)
+            evaluaciones += 1
+
+            if abs(fc) < abs(mejor[1]):
+                mejor = (c, fc)
+            if abs(fc) < tol:
+                return ResultadoRaiz(c, fc, evaluaciones, True)
+
+            if fc * fb > 0:
+                b, fb = c, fc
+                if lado == -1:
+                    fa /= 2
+                lado = -1
+            else:
+                a, fa = c, fc
+                if lado == 1:
+                    fb /= 2
+                lado = 1
+
+            if abs(b - a) < tol:
+                return ResultadoRaiz(mejor[0], mejor[1], evaluaciones, True)
+
+        return ResultadoRaiz(mejor[0], mejor[1], evaluaciones, False)
+
+
+class Brent(BuscadorRaiz):
+    """
+    Método de Brent (variante de brentq): interpolación inversa cuadrática o
+    secante cuando reduce el intervalo lo suficiente, bisección en otro caso.
+    """
+
+    nombre = "brent"
+
+    def buscar(self, funcion, a, b, fa, fb, tol, max_iter) -> ResultadoRaiz:
+        evaluaciones = 0
+        x_pre, x_cur = a, b
+        f_pre, f_cur = fa, fb
+        x_blk, f_blk = 0.0, 0.0
+        s_pre = s_cur = 0.0
+
+        for _ in range(max_iter):
+            if f_pre * f_cur < 0:
+                x_blk, f_blk = x_pre, f_pre
+                s_pre = s_cur = x_cur - x_pre
+
+            if abs(f_blk) < abs(f_cur):
+                x_pre, x_cur, x_blk = x_cur, x_blk, x_cur
+                f_pre, f_cur, f_blk = f_cur, f_blk, f_cur
+
+            delta = (tol + 4 * EPSILON_MAQUINA * abs(x_cur)) / 2
+            s_bis = (x_blk - x_cur) / 2
+            if abs(f_cur) < tol or abs(s_bis) < delta:
+                return ResultadoRaiz(x_cur, f_cur, evaluaciones, True)
+
+            if abs(s_pre) > delta and abs(f_cur) < abs(f_pre):
+                if x_pre == x_blk:
+                    # Secante
+                    s_try = -f_cur * (x_cur - x_pre) / (f_cur - f_pre)
+                else:
+                    # Interpolación inversa cuadrática
+                    d_pre = (f_pre - f_cur) / (x_pre - x_cur)
+                    d_blk = (f_blk - f_cur) / (x_blk - x_cur)
+                    s_try = (
+                        -f_cur
+                        * (f_blk * d_blk - f_pre * d_pre)
+                        / (d_blk * d_pre * (f_blk - f_pre))
+                    )
+
+                if 2 * abs(s_try) < min(abs(s_pre), 3 * abs(s_bis) - delta):
+                    s_pre, s_cur = s_cur, s_try
+                else:
+                    s_pre = s_cur = s_bis
+            else:
+                s_pre = s_cur = s_bis
+
+            x_pre, f_pre = x_cur, f_cur
+            if abs(s_cur) > delta:
+                x_cur += s_cur
+            else:
+                x_cur += delta if s_bis > 0 else -delta
+
+            f_cur = funcion(x_cur)
+            evaluaciones += 1
+
+        return ResultadoRaiz(x_cur, f_cur, evaluaciones, abs(f_cur) < tol)
+
+
+class ITP(BuscadorRaiz):
+    """
+    Método ITP (Interpolate, Truncate, Project) de Oliveira y Takahashi:
+    converge como la secante en funciones suaves sin hacer más evaluaciones
+    que la bisección en el peor caso.
+    """
+
+    nombre = "itp"
+
+    def __init__(self, kappa_1: float = 0.2, kappa_2: float = 2.0, n_0: int = 1):
+        self.kappa_1 = kappa_1
+        self.kappa_2 = kappa_2
+        self.n_0 = n_0
+
+    def buscar(self, funcion, a, b, fa, fb, tol, max_iter) -> ResultadoRaiz:
+        evaluaciones = 0
+        # Intervalo final de ancho menor que tol, igual que en bisección
+        epsilon = tol / 2
+        k_1 = self.kappa_1 / (b - a)
+        n_medio = max(math.ceil(math.log2((b - a) / (2 * epsilon))), 0)
+        n_max = n_medio + self.n_0
+        j = 0
+
+        while b - a > 2 * epsilon and evaluaciones < max_iter:
+            x_medio = (a + b) / 2
+            radio = epsilon * 2 ** (n_max - j) - (b - a) / 2
+            delta = k_1 * (b - a) ** self.kappa_2
+
+            # Interpolación (regula falsi)
+            x_f = (fb * a - fa * b) / (fb - fa)
+
+            # Truncamiento hacia el punto medio
+            sigma = math.copysign(1.0, x_medio - x_f)
+            x_t = x_f + sigma * delta if delta <= abs(x_medio - x_f) else x_medio
+
+            # Proyección sobre la vecindad minimax de la bisección
+            x_itp = x_t if abs(x_t - x_medio) <= radio else x_medio - sigma * radio
+
+            f_itp = funcion(x_itp)
+            evaluaciones += 1
+            j += 1
+
+            if abs(f_itp) < tol:
+                return ResultadoRaiz(x_itp, f_itp, evaluaciones, True)
+
+            if f_itp * fb > 0:
+                b, fb = x_itp, f_itp
+            else:
+                a, fa = x_itp, f_itp
+
+        raiz, valor = (a, fa) if abs(fa) < abs(fb) else (b, fb)
+        return ResultadoRaiz(raiz, valor, evaluaciones, b - a <= 2 * epsilon)
+
+
+class Rejilla(BuscadorRaiz):
+    """
+    Refinamiento por rejilla de grueso a fino.
+
+    En cada ronda evalúa en lote una rejilla de puntos interiores del
+    intervalo más el punto de interpolación lineal entre los extremos, y se
+    queda con la celda donde cambia el signo. Con una función de evaluación
+    vectorizada cada ronda es una sola pasada; sin ella se evalúa punto a punto.
+    """
+
+    nombre = "rejilla"
+
+    def __init__(
+        self,
+        evaluar_lote: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        puntos: int = 32,
+    ):
+        self.evaluar_lote = evaluar_lote
+        self.puntos = puntos
+
+    def buscar(self, funcion, a, b, fa, fb, tol, max_iter) -> ResultadoRaiz:
+        evaluaciones = 0
+
+        for _ in range(max_iter):
+            interpolado = (a * fb - b * fa) / (fb - fa)
+            candidatos = np.append(
+                np.linspace(a, b, self.puntos + 2)[1:-1], interpolado
+            )
+            valores = self._evaluar(funcion, candidatos)
+            evaluaciones += candidatos.size
+
+            mejor = int(np.argmin(np.abs(valores)))
+            if abs(valores[mejor]) < tol:
+                return ResultadoRaiz(
+                    float(candidatos[mejor]), float(valores[mejor]), evaluaciones, True
+                )
+
+            # Primera celda con cambio de signo entre puntos ordenados
+            orden = np.argsort(candidatos, kind="stable")
+            puntos = np.concatenate(([a], candidatos[orden], [b]))
+            signos = np.concatenate(([fa], valores[orden], [fb]))
+            celda = int(np.flatnonzero(signos[:-1] * signos[1:] < 0)[0])
+            a, b = float(puntos[celda]), float(puntos[celda + 1])
+            fa, fb = float(signos[celda]), float(signos[celda + 1])
+
+            if abs(b - a) < tol:
+                break
+
+        raiz, valor = (a, fa) if abs(fa) < abs(fb) else (b, fb)
+        return ResultadoRaiz(raiz, valor, evaluaciones, abs(b - a) < tol)
+
+    def _evaluar(self, funcion, candidatos: np.ndarray) -> np.ndarray:
+        if self.evaluar_lote is not None:
+            return np.asarray(self.evaluar_lote(candidatos), dtype=np.float64)
+        return np.array([funcion(float(x)) for x in candidatos])
+
+
+BUSCADORES_RAIZ: Dict[str, Type[BuscadorRaiz]] = {
+    Biseccion.nombre: Biseccion,
+    Illinois.nombre: Illinois,
+    Brent.nombre: Brent,
+    ITP.nombre: ITP,
+    Rejilla.nombre: Rejilla,
+}
+
+
+def obtener_buscador_raiz(nombre: str) -> BuscadorRaiz:
+    """
+    Retorna una instancia del buscador de raíz por su nombre.
+
+    Raises:
+        ValueError: Si el método no está registrado
+    """
+    clave = nombre.strip().lower()
+    if clave not in BUSCADORES_RAIZ:
+        disponibles = ", ".join(BUSCADORES_RAIZ)
+        raise ValueError(
+            f"Método de optimización no soportado: {nombre}. Disponibles: {disponibles}"
+        )
+    return BUSCADORES_RAIZ[clave]()
@@ -1,10 +1,12 @@
 from src.core.constants import FACTOR_RESERVA
 
 
-def tasa_interes_reserva(tasas_interes: dict) -> float:
-    """Se agregar el atributo tasa_reserva a cada periodo de la tabla de tasas de interés"""
-    tasa_reserva = 0
-    for key, value in tasas_interes.items():
-        tasa_reserva = float(value["tasa_inversion"]) - FACTOR_RESERVA
-        tasas_interes[key]["tasa_reserva"] = tasa_reserva
-    return tasas_interes
+def tasa_interes_reserva(tasas_interes: dict) -> dict:
+    """
+    Copia de la tabla de tasas de interés con el atributo tasa_reserva en cada
+    periodo. No modifica la tabla recibida, que puede ser compartida.
+    """
+    return {
+        key: {**value, "tasa_reserva": float(value["tasa_inversion"]) - FACTOR_RESERVA}
+        for key, value in tasas_interes.items()
+    }
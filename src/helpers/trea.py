@@ -1,43 +1,213 @@
-def calcular_trea(periodo_pago_primas, prima, porcentaje_devolucion):
-    """
-    Calcula la TREA según la fórmula de Excel:
-    =(1+TASA(C8*12;C22;0;-(C22*C8*C11*12);1))^(12)-1
-    Donde:
-    C8 = periodo de pago de primas (años)
-    C22 = prima
-    C11 = porcentaje de devolución (en porcentaje, ej: 125.32 para 125.32%)
-    """
-    nper = periodo_pago_primas * 12
-    pmt = prima
-    pv = 0
-    fv = -(prima * periodo_pago_primas * 12 * (porcentaje_devolucion / 100))
-    tipo = 1  # pagos al inicio
-
-    def funcion_tasa(r):
-        if r == 0:
-            return pmt * nper + pv + fv
-        return (
-            pmt * (1 + r * tipo) * (1 - (1 + r) ** -nper) / r
-            + pv
-            + fv / ((1 + r) ** nper)
+"""
+TREA (tasa de rendimiento efectivo anual) de RUMBO.
+
+Equivale a la fórmula de Excel:
+=(1+TASA(C8*12;C22;0;-(C22*C8*C11*12);1))^(12)-1
+Donde:
+C8 = periodo de pago de primas (años)
+C22 = prima
+C11 = porcentaje de devolución (en porcentaje, ej: 125.32 para 125.32%)
+
+La tasa mensual r iguala el valor acumulado de n = 12 * C8 primas pagadas al
+inicio de cada mes con la devolución total:
+
+    (1 + r) * ((1 + r)^n - 1) / r = n * C11 / 100
+
+La prima se cancela, así que la tasa depende solo de n y del porcentaje. El
+lado izquierdo es creciente y convexo en r > -1, por lo que la raíz es única:
+se busca con Newton con derivada analítica dentro de un intervalo con cambio
+de signo, y con bisección cuando el paso de Newton sale del intervalo.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+TOLERANCIA_TREA = 1e-15
+MAX_ITERACIONES_TREA = 200
+# Debajo de este |r| se usa el desarrollo en serie alrededor de r = 0
+R_SERIE = 1e-9
+
+
+def _validar(periodo_pago_primas, prima, porcentaje_devolucion) -> None:
+    if np.any(np.asarray(periodo_pago_primas) <= 0):
+        raise ValueError("El periodo de pago de primas debe ser positivo")
+    if np.any(np.asarray(prima) <= 0):
+        raise ValueError("La prima debe ser positiva")
+    if np.any(np.asarray(porcentaje_devolucion) <= 0):
+        raise ValueError("El porcentaje de devolución debe ser positivo")
+
+
+def _acumulado(r: np.ndarray, n: np.ndarray):
+    """Valor acumulado de n pagos anticipados de 1 a la tasa r y su derivada"""
+    en_serie = np.abs(r) < R_SERIE
+    r_seguro = np.where(en_serie, 1.0, r)
+    # Con tasas muy altas el acumulado se desborda a infinito; el intervalo
+    # sigue siendo válido y la búsqueda cae en bisección
+    with np.errstate(over="ignore", invalid="ignore"):
+        acumulado_menos_uno = np.expm1(n * np.log1p(r_seguro))
+        acumulado = acumulado_menos_uno + 1.0
+        valor = (1.0 + r_seguro) * acumulado_menos_uno / r_seguro
+        derivada = (n * acumulado * r_seguro - acumulado_menos_uno) / r_seguro**2
+
+    # Desarrollo en serie: n + r * n(n+1)/2 y n(n+1)/2 + r * n(n+1)(n-1)/3
+    valor_serie = n + r * n * (n + 1) / 2
+    derivada_serie = n * (n + 1) / 2 + r * n * (n + 1) * (n - 1) / 3
+    return (
+        np.where(en_serie, valor_serie, valor),
+        np.where(en_serie, derivada_serie, derivada),
+    )
+
+
+def _tasas_mensuales(n: np.ndarray, objetivo: np.ndarray) -> np.ndarray:
+    """
+    Tasas mensuales r tales que el valor acumulado de n pagos anticipados
+    sea igual al objetivo (n * porcentaje / 100). Cada elemento itera de forma
+    independiente, así que el resultado no depende del resto del lote.
+    """
+    # Intervalo con cambio de signo: la raíz es positiva si objetivo > n
+    inferior = np.where(objetivo > n, 0.0, -0.5)
+    superior = np.where(objetivo > n, 0.01, 0.0)
+    for _ in range(MAX_ITERACIONES_TREA):
+        valor_superior, _ = _acumulado(superior, n)
+        corto = valor_superior < objetivo
+        if not corto.any():
+            break
+        inferior = np.where(corto, superior, inferior)
+        superior = np.where(corto, superior * 2.0, superior)
+    for _ in range(MAX_ITERACIONES_TREA):
+        valor_inferior, _ = _acumulado(inferior, n)
+        largo = valor_inferior > objetivo
+        if not largo.any():
+            break
+        superior = np.where(largo, inferior, superior)
+        inferior = np.where(largo, (inferior - 1.0) / 2.0, inferior)
+
+    # Aproximación de primer orden: n + r * n(n+1)/2 = objetivo
+    r = np.clip(2.0 * (objetivo - n) / (n * (n + 1)), inferior, superior)
+    activo = np.ones(r.shape, dtype=bool)
+    for _ in range(MAX_ITERACIONES_TREA):
+        valor, derivada = _acumulado(r, n)
+        diferencia = valor - objetivo
+        inferior = np.where(activo & (diferencia < 0), r, inferior)
+        superior = np.where(activo & (diferencia > 0), r, superior)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = r - diferencia / derivada
+        fuera = ~((newton > inferior) & (newton < superior))
+        siguiente = np.where(fuera, (inferior + superior) / 2.0, newton)
+
+        terminado = (diferencia == 0) | (
+            np.abs(siguiente - r) <= TOLERANCIA_TREA * np.maximum(1.0, np.abs(r))
         )
+        r = np.where(activo & (diferencia != 0), siguiente, r)
+        activo &= ~terminado
+        if not activo.any():
+            break
+    return r
+
+
+def _acumulado_escalar(r: float, n: float):
+    """Versión escalar de _acumulado"""
+    if abs(r) < R_SERIE:
+        return n + r * n * (n + 1) / 2, n * (n + 1) / 2 + r * n * (n + 1) * (n - 1) / 3
+    try:
+        acumulado_menos_uno = math.expm1(n * math.log1p(r))
+    except OverflowError:
+        return math.inf, math.nan
+    acumulado = acumulado_menos_uno + 1.0
+    valor = (1.0 + r) * acumulado_menos_uno / r
+    derivada = (n * acumulado * r - acumulado_menos_uno) / r**2
+    return valor, derivada
 
-    def derivada_f(r, h=1e-6):
-        return (funcion_tasa(r + h) - funcion_tasa(r - h)) / (2 * h)
-
-    def newton_raphson(f, f_prime, x0, tol=1e-7, max_iter=100):
-        x = x0
-        for _ in range(max_iter):
-            fx = f(x)
-            dfx = f_prime(x)
-            if dfx == 0:
-                raise Exception("Derivada cero")
-            x_new = x - fx / dfx
-            if abs(x_new - x) < tol:
-                return x_new
-            x = x_new
-        raise Exception("No converge")
-
-    tasa_mensual = newton_raphson(funcion_tasa, derivada_f, 0.01)
-    trea = ((1 + tasa_mensual) ** 12 - 1) * 100
-    return trea
+
+def _tasa_mensual(n: float, objetivo: float) -> float:
+    """
+    Versión escalar de _tasas_mensuales, con los mismos pasos; evita el costo
+    de numpy en las cotizaciones individuales
+    """
+    inferior, superior = (0.0, 0.01) if objetivo > n else (-0.5, 0.0)
+    for _ in range(MAX_ITERACIONES_TREA):
+        if _acumulado_escalar(superior, n)[0] >= objetivo:
+            break
+        inferior, superior = superior, superior * 2.0
+    for _ in range(MAX_ITERACIONES_TREA):
+        if _acumulado_escalar(inferior, n)[0] <= objetivo:
+            break
+        inferior, superior = (inferior - 1.0) / 2.0, inferior
+
+    r = min(max(2.0 * (objetivo - n) / (n * (n + 1)), inferior), superior)
+    for _ in range(MAX_ITERACIONES_TREA):
+        valor, derivada = _acumulado_escalar(r, n)
+        diferencia = valor - objetivo
+        if diferencia == 0:
+            break
+        if diferencia < 0:
+            inferior = r
+        else:
+            superior = r
+
+        try:
+            newton = r - diferencia / derivada
+        except ZeroDivisionError:
+            newton = math.nan
+        siguiente = (
+            newton if inferior < newton < superior else (inferior + superior) / 2.0
+        )
+
+        terminado = abs(siguiente - r) <= TOLERANCIA_TREA * max(1.0, abs(r))
+        r = siguiente
+        if terminado:
+            break
+    return r
+
+
+def calcular_trea_lote(periodos_pago_primas, primas, porcentajes_devolucion) -> np.ndarray:
+    """
+    TREA (en porcentaje) para arreglos de periodos de pago, primas y
+    porcentajes de devolución, resueltos en una sola pasada vectorizada.
+    Las combinaciones repetidas se resuelven una vez.
+
+    Raises:
+        ValueError: Si algún periodo, prima o porcentaje no es positivo
+    """
+    periodos, primas, porcentajes = np.broadcast_arrays(
+        np.asarray(periodos_pago_primas, dtype=np.float64),
+        np.asarray(primas, dtype=np.float64),
+        np.asarray(porcentajes_devolucion, dtype=np.float64),
+    )
+    _validar(periodos, primas, porcentajes)
+    if periodos.size == 0:
+        return np.empty(periodos.shape)
+
+    n = periodos.ravel() * 12
+    objetivo = n * (porcentajes.ravel() / 100)
+    claves, inverso = np.unique(np.column_stack((n, objetivo)), axis=0, return_inverse=True)
+    tasas = _tasas_mensuales(claves[:, 0], claves[:, 1])
+    trea = np.expm1(12 * np.log1p(tasas)) * 100
+    return trea[inverso.ravel()].reshape(periodos.shape)
+
+
+@lru_cache(maxsize=4096)
+def _trea_memo(periodo_pago_primas: float, porcentaje_devolucion: float) -> float:
+    n = periodo_pago_primas * 12
+    tasa = _tasa_mensual(n, n * (porcentaje_devolucion / 100))
+    return math.expm1(12 * math.log1p(tasa)) * 100
+
+
+def calcular_trea(periodo_pago_primas, prima, porcentaje_devolucion) -> float:
+    """
+    Calcula la TREA (en porcentaje) de una cotización, con los mismos pasos
+    que calcular_trea_lote, y recuerda los resultados de entradas repetidas.
+
+    Raises:
+        ValueError: Si el periodo, la prima o el porcentaje no es positivo
+    """
+    if periodo_pago_primas <= 0:
+        raise ValueError("El periodo de pago de primas debe ser positivo")
+    if prima <= 0:
+        raise ValueError("La prima debe ser positiva")
+    if porcentaje_devolucion <= 0:
+        raise ValueError("El porcentaje de devolución debe ser positivo")
+    return _trea_memo(float(periodo_pago_primas), float(porcentaje_devolucion))
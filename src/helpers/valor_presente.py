@@ -0,0 +1,20 @@
+import numpy as np
+
+
+def valor_presente_prospectivo(flujos, tasa: float) -> np.ndarray:
+    """
+    Valor presente de cada flujo más todos los posteriores, para todos los meses.
+
+    PV_i = f_i + VNA(tasa; f_{i+1} ... f_n) = f_i + PV_{i+1} / (1 + tasa)
+
+    Se resuelve la recursión hacia atrás en una sola pasada como una suma
+    acumulada inversa de los flujos descontados al mes 0, O(n) en lugar de
+    recalcular el VNA de la cola para cada mes.
+    """
+    flujos = np.asarray(flujos, dtype=np.float64)
+    if flujos.size == 0:
+        return flujos.copy()
+
+    descuento = (1 + tasa) ** -np.arange(flujos.shape[-1], dtype=np.float64)
+    acumulado = np.cumsum((flujos * descuento)[..., ::-1], axis=-1)[..., ::-1]
+    return acumulado / descuento
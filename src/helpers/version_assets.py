@@ -0,0 +1,65 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+# Ruta por defecto: raíz del proyecto / assets
+RUTA_ASSETS = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "assets"
+
+
+def version_assets(producto: str, base_path: Optional[Path] = None) -> str:
+    """
+    Huella de los archivos de datos de un producto (assets/<producto>).
+
+    Se calcula a partir de la ruta relativa, el tamaño y la fecha de
+    modificación de cada archivo, sin leer su contenido, de modo que cambia
+    cuando se agrega, elimina o modifica cualquiera de ellos.
+
+    Args:
+        producto: Nombre del producto (ej: "rumbo")
+        base_path: Carpeta de assets, por defecto la del proyecto
+
+    Returns:
+        Huella hexadecimal; la de una carpeta inexistente es la de una vacía
+    """
+    carpeta = Path(base_path or RUTA_ASSETS) / producto.lower()
+    huella = hashlib.blake2b(digest_size=16)
+
+    pendientes = [carpeta]
+    archivos = []
+    while pendientes:
+        try:
+            entradas = list(os.scandir(pendientes.pop()))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        for entrada in entradas:
+            if entrada.is_dir(follow_symlinks=False):
+                pendientes.append(Path(entrada.path))
+            elif entrada.is_file():
+                estado = entrada.stat()
+                relativa = os.path.relpath(entrada.path, carpeta)
+                archivos.append((relativa, estado.st_size, estado.st_mtime_ns))
+
+    for relativa, tamano, modificado in sorted(archivos):
+        huella.update(f"{relativa}\0{tamano}\0{modificado}\n".encode("utf-8"))
+    return huella.hexdigest()
+
+
+def huella_contenido_assets(producto: str, base_path: Optional[Path] = None) -> str:
+    """
+    Huella del contenido de los archivos de datos de un producto.
+
+    A diferencia de version_assets, lee cada archivo y no depende de la fecha
+    de modificación, por lo que se conserva al copiar o clonar los assets.
+    Sirve para validar artefactos construidos fuera de línea.
+    """
+    carpeta = Path(base_path or RUTA_ASSETS) / producto.lower()
+    huella = hashlib.blake2b(digest_size=16)
+    if not carpeta.is_dir():
+        return huella.hexdigest()
+    for ruta in sorted(p for p in carpeta.rglob("*") if p.is_file()):
+        relativa = ruta.relative_to(carpeta).as_posix()
+        contenido = ruta.read_bytes()
+        huella.update(f"{relativa}\0{len(contenido)}\0".encode("utf-8"))
+        huella.update(contenido)
+    return huella.hexdigest()
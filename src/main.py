@@ -3,16 +3,19 @@ from fastapi.middleware.cors import CORSMiddleware
 import os
 
 from src.core.config import settings
+from src.core.events import lifespan
 from src.api.routes import cotizacion_router  # Router unificado para productos
 from src.api.routes import expuestos_mes_router
 from src.api.routes import gastos_router
 from src.api.routes import coleccion_cotizacion_router
+from src.api.routes import metricas_router
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.DESCRIPTION,
     version=settings.VERSION,
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 # Configuración de CORS
@@ -37,6 +40,18 @@ app.include_router(
     tags=["productos"],
 )
 
+app.include_router(
+    expuestos_mes_router.router,
+    prefix=settings.API_V1_STR,
+    tags=["expuestos"],
+)
+
+app.include_router(
+    metricas_router.router,
+    prefix=f"{settings.API_V1_STR}/metricas",
+    tags=["metricas"],
+)
+
 
 # Endpoint base para verificar que la API está funcionando
 @app.get("/")
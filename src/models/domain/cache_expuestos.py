@@ -0,0 +1,158 @@
+import threading
+from collections import OrderedDict
+from dataclasses import fields
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.core.constants import PERIODO_VIGENCIA_MAXIMO, PROBABILIDAD_VIVOS
+from src.models.domain.proyeccion_expuestos import (
+    ProyeccionExpuestos,
+    proyectar_expuestos,
+)
+from src.models.domain.tablas_decremento import (
+    TablasDecremento,
+    obtener_tablas_decremento,
+)
+from src.repositories.tabla_mortalidad_repository import EstadoFumador, Sexo
+
+# Versión de las tablas, edad, sexo, fumador, ajuste y vivos iniciales
+ClaveExpuestos = Tuple[Optional[str], int, Sexo, EstadoFumador, float, float]
+
+
+def _solo_lectura(arreglo: np.ndarray) -> np.ndarray:
+    arreglo.flags.writeable = False
+    return arreglo
+
+
+class CacheExpuestos:
+    """
+    Proyecciones de expuestos compartidas entre periodos de vigencia.
+
+    Para un mismo asegurado (edad, sexo, fumador, ajuste de mortalidad) la
+    proyección de vigencia N coincide con la de cualquier vigencia mayor en
+    los primeros 12N-1 meses: solo cambia el último mes, donde la caducidad
+    es total. Se proyecta una vez el horizonte más largo con la caducidad
+    continua y cada vigencia se obtiene recortándolo y corrigiendo el mes
+    final. Las columnas son de solo lectura y se comparten sin copiar.
+
+    Sin tablas explícitas se usan las de la versión vigente de los assets
+    (ver obtener_tablas_decremento). La clave incluye la versión de las
+    tablas y, al cambiar, se descartan las proyecciones de la anterior.
+    """
+
+    def __init__(
+        self,
+        tablas: Optional[TablasDecremento] = None,
+        tamano_maximo: int = 256,
+        anios_minimos: int = PERIODO_VIGENCIA_MAXIMO,
+    ):
+        self.tablas = tablas
+        self.tamano_maximo = tamano_maximo
+        self.anios_minimos = anios_minimos
+        self._proyecciones: "OrderedDict[ClaveExpuestos, ProyeccionExpuestos]" = (
+            OrderedDict()
+        )
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def proyectar(
+        self,
+        edad_actuarial: int,
+        sexo: Sexo,
+        fumador: EstadoFumador,
+        ajuste_mortalidad: float,
+        periodo_vigencia: int,
+        probabilidad_vivos_inicial: float = PROBABILIDAD_VIVOS,
+    ) -> ProyeccionExpuestos:
+        """
+        Proyección de expuestos para el periodo de vigencia indicado.
+
+        Returns:
+            ProyeccionExpuestos idéntica a la de proyectar_expuestos con la
+            curva de caducidad del periodo
+        """
+        sexo = Sexo.MASCULINO if sexo == Sexo.MASCULINO else Sexo.FEMENINO
+        tablas = self.tablas if self.tablas is not None else obtener_tablas_decremento()
+        clave = (
+            tablas.version,
+            edad_actuarial,
+            sexo,
+            EstadoFumador(fumador),
+            float(ajuste_mortalidad),
+            float(probabilidad_vivos_inicial),
+        )
+        return _recortar(
+            self._horizonte(tablas, clave, periodo_vigencia), periodo_vigencia * 12
+        )
+
+    def limpiar(self) -> None:
+        """Elimina todas las proyecciones guardadas"""
+        with self._lock:
+            self._proyecciones.clear()
+
+    def _horizonte(
+        self, tablas: TablasDecremento, clave: ClaveExpuestos, anios: int
+    ) -> ProyeccionExpuestos:
+        with self._lock:
+            if tablas.version != self._version:
+                # Las proyecciones guardadas son de otra versión de los assets
+                self._proyecciones.clear()
+                self._version = tablas.version
+            proyeccion = self._proyecciones.get(clave)
+            if proyeccion is not None and len(proyeccion) >= anios * 12:
+                self._proyecciones.move_to_end(clave)
+                return proyeccion
+
+        _, edad_actuarial, sexo, fumador, ajuste_mortalidad, vivos_inicial = clave
+        anios = max(anios, self.anios_minimos)
+        proyeccion = proyectar_expuestos(
+            edad_actuarial=edad_actuarial,
+            mortalidad=tablas.mortalidad(
+                sexo=sexo,
+                fumador=fumador,
+                ajuste_mortalidad=ajuste_mortalidad,
+                edad_inicial=edad_actuarial,
+                anios=anios,
+            ),
+            tasas_caducidad=tablas.caducidad_continua(anios),
+            probabilidad_vivos_inicial=vivos_inicial,
+        )
+        for campo in fields(proyeccion):
+            getattr(proyeccion, campo.name).flags.writeable = False
+
+        with self._lock:
+            if tablas.version != self._version:
+                # Los assets cambiaron durante la proyección: no se guarda
+                return proyeccion
+            self._proyecciones[clave] = proyeccion
+            self._proyecciones.move_to_end(clave)
+            while len(self._proyecciones) > self.tamano_maximo:
+                self._proyecciones.popitem(last=False)
+        return proyeccion
+
+
+def _recortar(horizonte: ProyeccionExpuestos, meses: int) -> ProyeccionExpuestos:
+    """Primeros meses del horizonte con la caducidad total en el último mes"""
+    columnas = {
+        campo.name: getattr(horizonte, campo.name)[:meses] for campo in fields(horizonte)
+    }
+    if meses == 0:
+        return ProyeccionExpuestos(**columnas)
+
+    # Mismas operaciones que proyectar_expuestos con tasa de caducidad 1
+    tasa_caducidad = columnas["tasa_caducidad"].copy()
+    caducados = columnas["caducados"].copy()
+    vivos_final = columnas["vivos_final"].copy()
+    tasa_caducidad[-1] = 1.0
+    caducados[-1] = columnas["vivos_despues_fallecidos"][-1] * tasa_caducidad[-1]
+    vivos_final[-1] = columnas["vivos_despues_fallecidos"][-1] - caducados[-1]
+
+    columnas["tasa_caducidad"] = _solo_lectura(tasa_caducidad)
+    columnas["caducados"] = _solo_lectura(caducados)
+    columnas["vivos_final"] = _solo_lectura(vivos_final)
+    return ProyeccionExpuestos(**columnas)
+
+
+# Instancia global compartida por todas las cotizaciones
+cache_expuestos = CacheExpuestos()
@@ -1,20 +1,18 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Union
 from enum import Enum
-import math
 from decimal import Decimal
 from src.core.constants import PROBABILIDAD_VIVOS
 
 from src.repositories.tabla_mortalidad_repository import (
-    tabla_mortalidad_repository,
     Sexo,
     EstadoFumador,
 )
 from src.repositories.caducidad_repository import caducidad_repository
-from src.helpers.caducidad_mensual import caducidad_mensual
-from src.utils.anios_meses import anios_meses
 from src.utils.frecuencia_meses import frecuencia_meses
 from src.common.frecuencia_pago import FrecuenciaPago
+from src.models.domain.proyeccion_expuestos import ProyeccionExpuestos
+from src.models.domain.cache_expuestos import cache_expuestos
 
 
 @dataclass
@@ -68,63 +66,43 @@ class ExpuestosMes:
 
     parametros: ParametrosActuariales
     resultados: List[ResultadoMensual] = field(default_factory=list)
+    proyeccion: Optional[ProyeccionExpuestos] = None
 
-    def calcular_expuestos_mes(self) -> List[ResultadoMensual]:
+    def proyectar(self) -> ProyeccionExpuestos:
         """
-        Calcula la proyección de expuestos para un número determinado de meses
-
-        Args:
-            meses: Número de meses a proyectar
+        Calcula la proyección de expuestos para todo el periodo de vigencia
+        como arreglos columnares (un valor por mes en cada columna)
 
         Returns:
-            Lista de resultados mensuales
-        """
-        self.resultados = []
-
-        # Inicializar valores para el primer mes
-        # Por defecto usamos 1.0 pero puede ser ajustado según parámetros específicos
-        vivos_inicio = self.parametros.probabilidad_vivos_inicial
-
-        # Si estamos calculando para un producto concreto, podemos establecer
-        # un valor inicial fijo para alinear con el Excel de referencia
-        # vivos_inicio = 1.0  # Valor por defecto
-
-        caducidad_mensual = self._obtener_tasa_caducidad_mensual(
-            self.parametros.periodo_vigencia
+            ProyeccionExpuestos con vivos, fallecidos y caducados por mes
+        """
+        parametros = self.parametros
+
+        # Las vigencias de un mismo asegurado comparten la proyección
+        self.proyeccion = cache_expuestos.proyectar(
+            edad_actuarial=parametros.edad_actuarial,
+            sexo=parametros.sexo,
+            fumador=parametros.fumador,
+            ajuste_mortalidad=parametros.ajuste_mortalidad,
+            periodo_vigencia=parametros.periodo_vigencia,
+            probabilidad_vivos_inicial=parametros.probabilidad_vivos_inicial,
         )
+        return self.proyeccion
 
-        meses_proyeccion = anios_meses(self.parametros.periodo_vigencia)
-
-        for mes in range(1, meses_proyeccion + 1):
-            # Determinar año de póliza y edad actual
-            anio_poliza = math.ceil(mes / 12)
-            edad_actual = self.parametros.edad_actuarial + anio_poliza - 1
-
-            # Cálculo de mortalidad
-            mortalidad_anual = self._obtener_mortalidad_anual(edad_actual)
-            mortalidad_mensual = self._calcular_mortalidad_mensual(mortalidad_anual)
-
-            # CORRECCIÓN: El ajuste de mortalidad (ej: 150) viene como porcentaje
-            # Primero convertimos a multiplicador (ej: 1.5) y luego aplicamos
-            factor_ajuste = self.parametros.ajuste_mortalidad / 100.0
-            mortalidad_ajustada = mortalidad_mensual * factor_ajuste
-
-            # CORRECCIÓN: Aplicar la tasa correctamente por mil
-            # Si mortalidad_mensual está en formato "por mil", debemos dividir por 1000
-            fallecidos = vivos_inicio * mortalidad_ajustada / 1000.0
-            vivos_despues_fallecidos = vivos_inicio - fallecidos
+    def calcular_expuestos_mes(self) -> List[ResultadoMensual]:
+        """
+        Calcula la proyección de expuestos como lista de resultados mensuales.
 
-            # Cálculo de caducidad - Usamos los valores personalizados
-            tasa_caducidad = caducidad_mensual.get(mes, 0.0)
-            # La tasa está en formato decimal (ej: 0.04339 para 4.339%)
-            # No necesitamos dividir por 100 porque ya viene en formato decimal
-            caducados = vivos_despues_fallecidos * tasa_caducidad
+        Adaptador sobre proyectar() para los consumidores que necesitan la
+        vista fila a fila; los cálculos internos deben usar proyectar().
 
-            # Vivos final
-            vivos_final = vivos_despues_fallecidos - caducados
+        Returns:
+            Lista de resultados mensuales
+        """
+        proyeccion = self.proyeccion if self.proyeccion is not None else self.proyectar()
 
-            # Registrar resultados
-            resultado = ResultadoMensual(
+        self.resultados = [
+            ResultadoMensual(
                 mes=mes,
                 anio_poliza=anio_poliza,
                 edad_actual=edad_actual,
@@ -135,55 +113,39 @@ class ExpuestosMes:
                 vivos_final=Decimal(str(vivos_final)),
                 mortalidad_anual=Decimal(str(mortalidad_anual)),
                 mortalidad_mensual=Decimal(str(mortalidad_mensual)),
-                mortalidad_ajustada=Decimal(
-                    str(mortalidad_ajustada)
-                ),  # Mantener en formato "por mil"
+                mortalidad_ajustada=Decimal(str(mortalidad_ajustada)),
                 tasa_caducidad=Decimal(str(tasa_caducidad)),
             )
-
-            self.resultados.append(resultado)
-
-            # El vivos inicio del siguiente mes es el vivos final del mes actual
-            vivos_inicio = vivos_final
-
-        return self.resultados
-
-    def _obtener_mortalidad_anual(self, edad: int) -> float:
-        """
-        Obtiene la tasa de mortalidad anual para una edad específica
-
-        Args:
-            edad: Edad actual
-
-        Returns:
-            Tasa de mortalidad anual
-        """
-        # Si la edad supera la duración de pagos, no hay mortalidad
-        if edad > self.parametros.get_duracion_pagos():
-            return 0.0
-
-        try:
-            # Obtener la tasa de mortalidad desde el repositorio
-            tasa_mortalidad = tabla_mortalidad_repository.get_tasa_mortalidad(
-                edad=edad, sexo=self.parametros.sexo, fumador=self.parametros.fumador
+            for (
+                mes,
+                anio_poliza,
+                edad_actual,
+                vivos_inicio,
+                fallecidos,
+                vivos_despues_fallecidos,
+                caducados,
+                vivos_final,
+                mortalidad_anual,
+                mortalidad_mensual,
+                mortalidad_ajustada,
+                tasa_caducidad,
+            ) in zip(
+                proyeccion.mes.tolist(),
+                proyeccion.anio_poliza.tolist(),
+                proyeccion.edad_actual.tolist(),
+                proyeccion.vivos_inicio.tolist(),
+                proyeccion.fallecidos.tolist(),
+                proyeccion.vivos_despues_fallecidos.tolist(),
+                proyeccion.caducados.tolist(),
+                proyeccion.vivos_final.tolist(),
+                proyeccion.mortalidad_anual.tolist(),
+                proyeccion.mortalidad_mensual.tolist(),
+                proyeccion.mortalidad_ajustada.tolist(),
+                proyeccion.tasa_caducidad.tolist(),
             )
-            return tasa_mortalidad
-        except ValueError:
-            # Si no se encuentra en la tabla, usar un valor por defecto
-            return 0.0
-
-    def _calcular_mortalidad_mensual(self, mortalidad_anual: float) -> float:
-        """
-        Calcula la tasa de mortalidad mensual a partir de la anual
-
-        Args:
-            mortalidad_anual: Tasa de mortalidad anual
+        ]
 
-        Returns:
-            Tasa de mortalidad mensual
-        """
-        # Fórmula: (1-(1-q_x/1000)^(1/12))*1000
-        return (1 - math.pow(1 - mortalidad_anual / 1000, 1 / 12)) * 1000
+        return self.resultados
 
     def _es_mes_pago(self, mes: int) -> bool:
         """
@@ -198,29 +160,6 @@ class ExpuestosMes:
         meses_frecuencia = self.parametros.get_meses_frecuencia()
         return (mes - 1) % meses_frecuencia == 0
 
-    def _obtener_tasa_caducidad_mensual(self, periodo_vigencia: int) -> float:
-        """
-        Obtiene la tasa de caducidad para un año específico usando valores personalizados
-
-        Args:
-            anio: Año de póliza
-
-        Returns:
-            Tasa de caducidad como porcentaje
-        """
-        # Valores personalizados proporcionados por el usuario
-
-        caducidad_parametrizado_mensual = (
-            caducidad_repository.get_caducidad_mensual_data()
-        )
-        caducidad_por_año = caducidad_repository.get_caducidad_data()
-
-        _caducidad_mensual = caducidad_mensual(
-            periodo_vigencia, caducidad_parametrizado_mensual, caducidad_por_año
-        )
-
-        return _caducidad_mensual
-
     def _obtener_tasa_caducidad(self, anio: int, plazo: int) -> float:
         """
         Obtiene la tasa de caducidad para un año y plazo específicos
@@ -269,32 +208,7 @@ class ExpuestosMes:
         Returns:
             Diccionario con el resumen de resultados
         """
-        if not self.resultados:
-            self.calcular_expuestos_mes()
+        if self.proyeccion is None:
+            self.proyectar()
 
-        return {
-            "vivos_inicial": self.resultados[0].vivos_inicio if self.resultados else 0,
-            "vivos_final": self.resultados[-1].vivos_final if self.resultados else 0,
-            "fallecidos_total": sum(r.fallecidos for r in self.resultados),
-            "caducados_total": sum(r.caducados for r in self.resultados),
-            "meses_calculados": len(self.resultados),
-            "por_anio": {
-                anio: {
-                    "fallecidos": sum(
-                        r.fallecidos for r in self.resultados if r.anio_poliza == anio
-                    ),
-                    "caducados": sum(
-                        r.caducados for r in self.resultados if r.anio_poliza == anio
-                    ),
-                    "vivos_final": next(
-                        (
-                            r.vivos_final
-                            for r in reversed(self.resultados)
-                            if r.anio_poliza == anio
-                        ),
-                        0,
-                    ),
-                }
-                for anio in sorted(set(r.anio_poliza for r in self.resultados))
-            },
-        }
+        return self.proyeccion.obtener_resumen()
@@ -2,10 +2,12 @@ from dataclasses import dataclass
 from src.models.domain.expuestos_mes import ExpuestosMes
 from src.models.domain.parametros_calculados import ParametrosCalculados
 from src.common.frecuencia_pago import FrecuenciaPago
-from src.models.schemas.expuestos_mes_schema import ProyeccionActuarialOutput
+from src.models.domain.proyeccion_frame import ProyeccionFrame
 from src.utils.frecuencia_meses import frecuencia_meses
 from src.utils.anios_meses import anios_meses
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Type
+import numpy as np
 
 
 @dataclass
@@ -18,7 +20,7 @@ class FlujoResultado:
 
     def calcular_primas_recurrentes(
         self,
-        expuestos_mes: ProyeccionActuarialOutput,
+        expuestos_mes: ProyeccionFrame,
         periodo_pago_primas: int,
         frecuencia_pago_primas: FrecuenciaPago,
         prima: float,
@@ -44,12 +46,11 @@ class FlujoResultado:
                    E9 (Fracionamiento de primas) : input #! [ok] CONSTANTE
         """
 
-        resultados_mensuales = expuestos_mes.get("resultados_mensuales", [])
         frecuencia_meses_valor = frecuencia_meses(frecuencia_pago_primas)
 
         primas_recurrentes = []
 
-        for idx, fila in enumerate(resultados_mensuales):
+        for idx, vivos_inicio in enumerate(expuestos_mes["vivos_inicio"].tolist()):
             mes_poliza = idx + 1
 
             if mes_poliza / 12 > periodo_pago_primas:
@@ -58,7 +59,6 @@ class FlujoResultado:
                 validador_pago = (
                     1 if ((mes_poliza - 1) % frecuencia_meses_valor == 0) else 0
                 )
-                vivos_inicio = float(fila.get("vivos_inicio", "0"))
                 prima_mes = (
                     validador_pago * prima * vivos_inicio * fraccionamiento_primas
                 )
@@ -68,38 +68,29 @@ class FlujoResultado:
         return primas_recurrentes
 
     def calcular_siniestros(
-        self, expuestos_mes: ProyeccionActuarialOutput, suma_asegurada: float
+        self, expuestos_mes: ProyeccionFrame, suma_asegurada: float
     ) -> List[float]:
         """
         Calcula los siniestros mensuales con signo negativo:
         siniestro = -suma_asegurada * fallecidos
         """
-        resultados_mensuales = expuestos_mes.get("resultados_mensuales", [])
-        siniestros = []
-
-        for fila in resultados_mensuales:
-            try:
-                fallecidos = float(fila.get("fallecidos", 0))
-                # ! print("fallecidos => ", fallecidos)
-            except (TypeError, ValueError):
-                fallecidos = 0.0
-            siniestros.append(-suma_asegurada * fallecidos)
-
-        return siniestros
-
-    def calcular_gastos_mantenimiento(self, gastos_mantenimiento: float) -> List[float]:
         return [
-            float(_.get("gasto_mantenimiento_total", 0))
-            for _ in gastos_mantenimiento.get("resultados_mensuales", [])
+            -suma_asegurada * fallecidos
+            for fallecidos in expuestos_mes["fallecidos"].tolist()
         ]
 
+    def calcular_gastos_mantenimiento(
+        self, gastos_mantenimiento: ProyeccionFrame
+    ) -> List[float]:
+        return gastos_mantenimiento["gasto_mantenimiento_total"].tolist()
+
     def calcular_comision(
         self,
         primas_recurrentes: List[float],
         asistencia: bool,
-        frecuencia_pago_primas: int,
+        frecuencia_pago_primas: FrecuenciaPago,
         costo_asistencia_funeraria: float,
-        expuestos_mes: dict,
+        expuestos_mes: ProyeccionFrame,
         comision: float,
     ) -> List[float]:
         """
@@ -126,17 +117,19 @@ class FlujoResultado:
 
           Parametros_Supuestos!$E$5 # * COMISIONES INPUT [OK]
         """
-        resultados_mensuales = expuestos_mes.get("resultados_mensuales", [])
+        vivos_inicio_mes = expuestos_mes["vivos_inicio"].tolist()
         comisiones = []
 
+        # Parametros_Supuestos!$C$17 es la frecuencia elegida en meses
+        frecuencia_meses_valor = frecuencia_meses(frecuencia_pago_primas)
+
         for idx, prima in enumerate(primas_recurrentes):
             vivos_inicio = 0
-            if idx < len(resultados_mensuales):
-                vivos_inicio = float(resultados_mensuales[idx].get("vivos_inicio", 0))
+            if idx < len(vivos_inicio_mes):
+                vivos_inicio = vivos_inicio_mes[idx]
 
             mes_poliza = idx + 1
 
-            frecuencia_meses_valor = frecuencia_meses(frecuencia_pago_primas)
             # calcular validador pago primas mes a mes
             if ((mes_poliza - 1) % frecuencia_meses_valor) == 0:
                 validador_pago_primas = 1
@@ -147,7 +140,7 @@ class FlujoResultado:
             if asistencia:
                 ajuste_asistencia = (
                     validador_pago_primas
-                    * frecuencia_pago_primas
+                    * frecuencia_meses_valor
                     * costo_asistencia_funeraria
                     * vivos_inicio
                 )
@@ -257,3 +250,179 @@ class FlujoResultado:
             flujo_accionista, tasa_costo_capital_mes
         )
         return vna_resultado
+
+
+@lru_cache(maxsize=None)
+def mascara_meses_pago(meses_frecuencia: int, meses: int) -> np.ndarray:
+    """
+    Validador de pago de primas para todo el horizonte: True en los meses
+    de póliza donde (mes - 1) es múltiplo de la frecuencia. Se calcula una
+    sola vez por frecuencia y horizonte y se comparte en solo lectura.
+    """
+    mascara = np.arange(meses) % meses_frecuencia == 0
+    mascara.flags.writeable = False
+    return mascara
+
+
+class FlujoResultadoVectorizado(FlujoResultado):
+    """
+    Flujo y resultado con los cálculos mensuales hechos sobre arreglos
+    completos en lugar de recorrer mes a mes.
+
+    Mismas fórmulas y mismo orden de operaciones que FlujoResultado, por lo
+    que los resultados coinciden; las salidas siguen siendo listas.
+    """
+
+    def calcular_primas_recurrentes(
+        self,
+        expuestos_mes: ProyeccionFrame,
+        periodo_pago_primas: int,
+        frecuencia_pago_primas: FrecuenciaPago,
+        prima: float,
+        fraccionamiento_primas: float,
+    ):
+        vivos_inicio = expuestos_mes["vivos_inicio"]
+        meses = len(vivos_inicio)
+
+        mes_poliza = np.arange(1, meses + 1)
+        paga = mascara_meses_pago(frecuencia_meses(frecuencia_pago_primas), meses) & (
+            mes_poliza / 12 <= periodo_pago_primas
+        )
+        return np.where(
+            paga, prima * vivos_inicio * fraccionamiento_primas, 0.0
+        ).tolist()
+
+    def calcular_siniestros(
+        self, expuestos_mes: ProyeccionFrame, suma_asegurada: float
+    ) -> List[float]:
+        return (-suma_asegurada * expuestos_mes["fallecidos"]).tolist()
+
+    def calcular_comision(
+        self,
+        primas_recurrentes: List[float],
+        asistencia: bool,
+        frecuencia_pago_primas: FrecuenciaPago,
+        costo_asistencia_funeraria: float,
+        expuestos_mes: ProyeccionFrame,
+        comision: float,
+    ) -> List[float]:
+        """
+        Comisión = -(prima - ajuste_asistencia) * comisión.
+
+        El ajuste por asistencia multiplica por la frecuencia elegida
+        expresada en meses (Parametros_Supuestos!$C$17).
+        """
+        primas = np.asarray(primas_recurrentes, dtype=np.float64)
+        meses = len(primas)
+
+        if not asistencia:
+            return (-primas * comision).tolist()
+
+        meses_frecuencia = frecuencia_meses(frecuencia_pago_primas)
+        vivos_inicio = np.zeros(meses)
+        disponibles = expuestos_mes["vivos_inicio"][:meses]
+        vivos_inicio[: len(disponibles)] = disponibles
+
+        ajuste_asistencia = np.where(
+            mascara_meses_pago(meses_frecuencia, meses),
+            meses_frecuencia * costo_asistencia_funeraria * vivos_inicio,
+            0.0,
+        )
+        return (-(primas - ajuste_asistencia) * comision).tolist()
+
+    def calcular_utilidad_pre_pi_ms(
+        self,
+        primas_recurrentes: List[float],
+        comision: List[float],
+        gasto_adquisicion: float,
+        gastos_mantenimiento: List[float],
+        siniestros: List[float],
+        rescates: List[float],
+        variacion_reserva: List[float],
+    ) -> List[float]:
+        meses = len(primas_recurrentes)
+
+        adquisicion = np.zeros(meses)
+        adquisicion[:1] = gasto_adquisicion
+
+        # Una sola conversión para todos los egresos, que se restan en valor absoluto
+        egresos = np.abs(
+            np.array(
+                [
+                    comision[:meses],
+                    gastos_mantenimiento[:meses],
+                    siniestros[:meses],
+                    rescates[:meses],
+                    variacion_reserva[:meses],
+                ],
+                dtype=np.float64,
+            )
+        )
+        comisiones, mantenimiento, siniestros_mes, rescates_mes, variacion = egresos
+
+        utilidad_pre_pi_ms = (
+            np.asarray(primas_recurrentes, dtype=np.float64)
+            - comisiones
+            - adquisicion
+            - mantenimiento
+            - siniestros_mes
+            - rescates_mes
+            - variacion
+        ).tolist()
+
+        utilidad_pre_pi_ms.append(variacion_reserva[-1])
+
+        return utilidad_pre_pi_ms
+
+    def calcular_IR(
+        self, utilidad_pre_pi_ms: List[float], impuesto_renta: float
+    ) -> List[float]:
+        return (np.asarray(utilidad_pre_pi_ms, dtype=np.float64) * impuesto_renta).tolist()
+
+    def calcular_flujo_accionista(
+        self,
+        utilidad_pre_pi_ms: List[float],
+        varianza_margen_solvencia: List[float],
+        IR: List[float],
+        producto_inversion: List[float],
+    ) -> List[float]:
+        utilidad = np.asarray(utilidad_pre_pi_ms, dtype=np.float64)
+        meses = len(utilidad)
+
+        # El margen de solvencia se libera en el último mes y se constituye en el resto
+        margen = np.abs(np.asarray(varianza_margen_solvencia[:meses], dtype=np.float64))
+        margen[:-1] *= -1
+
+        inversion = np.zeros(meses)
+        disponibles = np.asarray(producto_inversion[:meses], dtype=np.float64)
+        inversion[: len(disponibles)] = disponibles
+
+        return (
+            utilidad
+            + margen
+            - np.abs(np.asarray(IR[:meses], dtype=np.float64))
+            + inversion
+        ).tolist()
+
+
+IMPLEMENTACIONES_FLUJO_RESULTADO: Dict[str, Type[FlujoResultado]] = {
+    "clasica": FlujoResultado,
+    "vectorizada": FlujoResultadoVectorizado,
+}
+
+
+def obtener_flujo_resultado(implementacion: str) -> FlujoResultado:
+    """
+    Retorna una instancia de la implementación del flujo y resultado por su nombre.
+
+    Raises:
+        ValueError: Si la implementación no está registrada
+    """
+    clave = implementacion.strip().lower()
+    if clave not in IMPLEMENTACIONES_FLUJO_RESULTADO:
+        disponibles = ", ".join(IMPLEMENTACIONES_FLUJO_RESULTADO)
+        raise ValueError(
+            f"Implementación de flujo y resultado no soportada: {implementacion}. "
+            f"Disponibles: {disponibles}"
+        )
+    return IMPLEMENTACIONES_FLUJO_RESULTADO[clave]()
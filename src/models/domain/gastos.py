@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from src.models.domain.expuestos_mes import ExpuestosMes
+from src.models.domain.proyeccion_frame import ProyeccionFrame
 from src.models.domain.parametros_calculados import ParametrosCalculados
 from src.common.frecuencia_pago import FrecuenciaPago
 from typing import List
@@ -30,7 +30,7 @@ class Gastos:
     periodo_pago_primas: int
     frecuencia_pago_primas: FrecuenciaPago  # Usar la enumeración
     prima: float
-    expuestos_mes: ExpuestosMes  # (vivos_inicio)
+    expuestos_mes: ProyeccionFrame  # (vivos_inicio)
 
     def calcular_gasto_mantenimiento_prima_co(
         self, primas_recurrentes: List[float], mantenimiento_poliza: float
@@ -79,17 +79,11 @@ class Gastos:
         return gasto_total
 
     def calcular_gastos_mantenimiento_fijo_poliza_anual(
-        self, expuestos_mes: ExpuestosMes, gastos_mantenimiento_moneda_poliza: float
+        self, expuestos_mes: ProyeccionFrame, gastos_mantenimiento_moneda_poliza: float
     ):
-        resultados_mensuales = expuestos_mes.get("resultados_mensuales", [])
-
         gastos_mantenimiento_fijo_poliza_anual = []
 
-        for idx, fila in enumerate(resultados_mensuales):
-            mes_poliza = idx + 1
-
-            vivos_inicio = float(fila.get("vivos_inicio", "0"))
-
+        for vivos_inicio in expuestos_mes["vivos_inicio"].tolist():
             gasto_mantenimiento_fijo_poliza_anual = (
                 gastos_mantenimiento_moneda_poliza * vivos_inicio
             )
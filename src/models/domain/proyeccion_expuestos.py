@@ -0,0 +1,148 @@
+from dataclasses import dataclass, fields
+from decimal import Decimal
+from typing import Dict, Union
+
+import numpy as np
+
+from src.core.constants import PROBABILIDAD_VIVOS
+from src.models.domain.proyeccion_frame import ProyeccionFrame
+from src.models.domain.tablas_decremento import VectoresMortalidad
+
+
+@dataclass(frozen=True)
+class ProyeccionExpuestos:
+    """
+    Resultado columnar de la proyección de expuestos.
+
+    Cada atributo es un arreglo contiguo con un valor por mes de póliza
+    (índice 0 = mes 1). Las columnas de conteo (mes, anio_poliza, edad_actual)
+    son enteras; el resto son float64.
+    """
+
+    mes: np.ndarray
+    anio_poliza: np.ndarray
+    edad_actual: np.ndarray
+    vivos_inicio: np.ndarray
+    fallecidos: np.ndarray
+    vivos_despues_fallecidos: np.ndarray
+    caducados: np.ndarray
+    vivos_final: np.ndarray
+    mortalidad_anual: np.ndarray
+    mortalidad_mensual: np.ndarray
+    mortalidad_ajustada: np.ndarray
+    tasa_caducidad: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.mes)
+
+    def obtener_resumen(self) -> Dict[str, Union[Decimal, int, Dict]]:
+        """Resumen por póliza y por año de póliza"""
+        return resumir_expuestos(self.a_frame())
+
+    def a_frame(self) -> ProyeccionFrame:
+        """Proyección como frame inmutable para el intercambio entre servicios"""
+        return ProyeccionFrame(
+            {campo.name: getattr(self, campo.name) for campo in fields(self)}
+        )
+
+
+def resumir_expuestos(expuestos_mes: ProyeccionFrame) -> Dict[str, Union[Decimal, int, Dict]]:
+    """
+    Resumen por póliza y por año de póliza.
+
+    Las sumas se hacen en Decimal sobre la representación de cada float,
+    igual que el resumen construido a partir de ResultadoMensual.
+    """
+    if expuestos_mes.meses == 0:
+        return {
+            "vivos_inicial": 0,
+            "vivos_final": 0,
+            "fallecidos_total": 0,
+            "caducados_total": 0,
+            "meses_calculados": 0,
+            "por_anio": {},
+        }
+
+    fallecidos = [Decimal(str(x)) for x in expuestos_mes["fallecidos"].tolist()]
+    caducados = [Decimal(str(x)) for x in expuestos_mes["caducados"].tolist()]
+    vivos_final = expuestos_mes["vivos_final"].tolist()
+    anios = expuestos_mes["anio_poliza"].tolist()
+
+    por_anio = {}
+    for i, anio in enumerate(anios):
+        datos = por_anio.setdefault(
+            anio, {"fallecidos": 0, "caducados": 0, "vivos_final": 0}
+        )
+        datos["fallecidos"] += fallecidos[i]
+        datos["caducados"] += caducados[i]
+        datos["vivos_final"] = Decimal(str(vivos_final[i]))
+
+    return {
+        "vivos_inicial": Decimal(str(expuestos_mes["vivos_inicio"][0])),
+        "vivos_final": Decimal(str(vivos_final[-1])),
+        "fallecidos_total": sum(fallecidos),
+        "caducados_total": sum(caducados),
+        "meses_calculados": expuestos_mes.meses,
+        "por_anio": por_anio,
+    }
+
+
+def proyectar_expuestos(
+    edad_actuarial: int,
+    mortalidad: VectoresMortalidad,
+    tasas_caducidad: np.ndarray,
+    probabilidad_vivos_inicial: float = PROBABILIDAD_VIVOS,
+) -> ProyeccionExpuestos:
+    """
+    Proyecta vivos, fallecidos y caducados para todo el horizonte en una pasada.
+
+    Args:
+        edad_actuarial: Edad actuarial al inicio de la póliza
+        mortalidad: Mortalidad anual, mensual y ajustada (por mil) por año de póliza
+        tasas_caducidad: Tasa de caducidad mensual para cada mes de póliza
+        probabilidad_vivos_inicial: Vivos al inicio del primer mes
+
+    Returns:
+        ProyeccionExpuestos con una columna por variable
+    """
+    tasas_caducidad = np.ascontiguousarray(tasas_caducidad, dtype=np.float64)
+    meses = len(tasas_caducidad)
+
+    mes = np.arange(1, meses + 1)
+    anio_poliza = (mes - 1) // 12 + 1
+    edad_actual = edad_actuarial + anio_poliza - 1
+
+    # La mortalidad solo cambia con el año de póliza
+    mortalidad_anual = np.repeat(mortalidad.anual, 12)[:meses]
+    mortalidad_mensual = np.repeat(mortalidad.mensual, 12)[:meses]
+    mortalidad_ajustada = np.repeat(mortalidad.ajustada, 12)[:meses]
+
+    # Los vivos al inicio de cada mes son el producto acumulado de las
+    # supervivencias (a muerte y a caducidad) de los meses anteriores
+    q = mortalidad_ajustada / 1000.0
+    supervivencia = (1 - q) * (1 - tasas_caducidad)
+    vivos_inicio = np.empty(meses)
+    if meses:
+        vivos_inicio[0] = probabilidad_vivos_inicial
+        np.cumprod(supervivencia[:-1], out=vivos_inicio[1:])
+        vivos_inicio[1:] *= probabilidad_vivos_inicial
+
+    fallecidos = vivos_inicio * q
+    vivos_despues_fallecidos = vivos_inicio - fallecidos
+    caducados = vivos_despues_fallecidos * tasas_caducidad
+    vivos_final = vivos_despues_fallecidos - caducados
+
+    return ProyeccionExpuestos(
+        mes=mes,
+        anio_poliza=anio_poliza,
+        edad_actual=edad_actual,
+        vivos_inicio=vivos_inicio,
+        fallecidos=fallecidos,
+        vivos_despues_fallecidos=vivos_despues_fallecidos,
+        caducados=caducados,
+        vivos_final=vivos_final,
+        mortalidad_anual=mortalidad_anual,
+        mortalidad_mensual=mortalidad_mensual,
+        mortalidad_ajustada=mortalidad_ajustada,
+        tasa_caducidad=tasas_caducidad,
+    )
@@ -0,0 +1,62 @@
+from types import MappingProxyType
+from typing import Iterator, Mapping
+
+import numpy as np
+
+
+class ProyeccionFrame(Mapping[str, np.ndarray]):
+    """
+    Proyección mensual columnar e inmutable para el intercambio entre servicios.
+
+    Cada columna es un arreglo numpy de solo lectura con un valor por mes de
+    póliza (índice 0 = mes 1); las columnas numéricas se guardan en float64
+    salvo las de conteo (mes, año de póliza, edad), que conservan su tipo
+    entero. El formateo a texto/Decimal se hace solo en la capa HTTP.
+    """
+
+    __slots__ = ("_columnas", "_meses")
+
+    def __init__(self, columnas: Mapping[str, object]):
+        meses = None
+        congeladas = {}
+        for nombre, valores in columnas.items():
+            arreglo = np.asarray(valores)
+            if arreglo.dtype.kind not in "iu":
+                arreglo = arreglo.astype(np.float64, copy=False)
+            if arreglo.ndim != 1:
+                raise ValueError(f"La columna {nombre} debe ser unidimensional")
+            if meses is None:
+                meses = len(arreglo)
+            elif len(arreglo) != meses:
+                raise ValueError(
+                    f"La columna {nombre} tiene {len(arreglo)} meses, se esperaban {meses}"
+                )
+            # Las columnas ya congeladas se comparten sin copiar
+            if arreglo.flags.writeable:
+                arreglo = arreglo.copy()
+                arreglo.flags.writeable = False
+            congeladas[nombre] = arreglo
+
+        self._columnas = MappingProxyType(congeladas)
+        self._meses = meses or 0
+
+    def __getitem__(self, nombre: str) -> np.ndarray:
+        return self._columnas[nombre]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columnas)
+
+    def __len__(self) -> int:
+        return len(self._columnas)
+
+    @property
+    def meses(self) -> int:
+        """Cantidad de meses (filas) de la proyección"""
+        return self._meses
+
+    def con_columnas(self, **columnas: object) -> "ProyeccionFrame":
+        """Retorna una nueva proyección con columnas agregadas o reemplazadas"""
+        return ProyeccionFrame({**self._columnas, **columnas})
+
+    def __repr__(self) -> str:
+        return f"ProyeccionFrame(meses={self._meses}, columnas={list(self._columnas)})"
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
-from src.models.domain.expuestos_mes import ExpuestosMes
+import numpy as np
+from src.models.domain.proyeccion_frame import ProyeccionFrame
 from src.utils.anios_meses import anios_meses
 from src.helpers.margen_reserva import margen_reserva
+from src.helpers.valor_presente import valor_presente_prospectivo
 
 
 @dataclass
@@ -45,21 +47,13 @@ class Reserva:
         if not _margen_reserva:
             return []
 
-        resultados_moce = []
-
-        for i in range(len(_margen_reserva)):
-            flujo_inicial = _margen_reserva[i]
-            flujos_futuros = _margen_reserva[i + 1 :]  # del siguiente en adelante
-
-            vna = sum(
-                flujo / ((1 + tasa_interes_mensual) ** j)
-                for j, flujo in enumerate(flujos_futuros, start=1)
-            )
-
-            moce = tasa_costo_capital_mensual * (vna + flujo_inicial)
-            resultados_moce.append(moce)
+        # Y2 + VNA(C59; Y3:Y851) para todos los meses con una suma acumulada
+        # inversa de los márgenes descontados, sin recorrer la cola en cada mes
+        valor_presente = valor_presente_prospectivo(
+            _margen_reserva, tasa_interes_mensual
+        )
 
-        return resultados_moce
+        return (tasa_costo_capital_mensual * valor_presente).tolist()
 
     def calcular_saldo_reserva(
         self,
@@ -77,27 +71,20 @@ class Reserva:
         # R2 calculo_rescate => rescate
         # L2 expuestos_mes (vivos_inicio)
 
-        def vna(tasa, flujos):
-            # Valor Neto Actual: suma de flujos descontados al periodo i+1, i+2, ...
-            return sum(f / (1 + tasa) ** (idx + 1) for idx, f in enumerate(flujos))
-
-        saldo_reserva = []
-        n = len(flujo_pasivo)
-
-        for i in range(n):
-            flujo_actual = flujo_pasivo[i]
-            flujos_futuros = flujo_pasivo[i + 1 :] if i + 1 < n else []
+        if not len(flujo_pasivo):
+            return []
 
-            vna_valor = (
-                vna(tasa_interes_mensual, flujos_futuros) if flujos_futuros else 0.0
-            )
-            suma = flujo_actual + vna_valor
+        # I2 + VNA(C59; I3:I946) para todos los meses en una pasada hacia atrás
+        valor_presente = valor_presente_prospectivo(flujo_pasivo, tasa_interes_mensual)
 
-            # Aplicar condición de máximo entre (suma>=0 ? suma : 0) y rescate * vivos_inicio
-            valor = max(suma if suma >= 0 else 0, rescate[i] * float(vivos_inicio[i]))
-            saldo_reserva.append(valor)
+        # Aplicar condición de máximo entre (suma>=0 ? suma : 0) y rescate * vivos_inicio
+        saldo_reserva = np.maximum(
+            np.maximum(valor_presente, 0.0),
+            np.asarray(rescate, dtype=np.float64)
+            * np.asarray(vivos_inicio, dtype=np.float64),
+        )
 
-        return saldo_reserva
+        return saldo_reserva.tolist()
 
     def calcular_flujo_pasivo(
         self,
@@ -133,18 +120,14 @@ class Reserva:
 
     def calcular_ajuste_devolucion_anticipada(
         self,
-        expuestos_mes: ExpuestosMes,
+        expuestos_mes: ProyeccionFrame,
         rescates: list[float],
     ):
-        # print("rescate desde ajuste de devolucion anticipada => ", rescates)
-
         # * CADUCADOS
-        resultados_mes = expuestos_mes.get("resultados_mensuales", [])
-        rescate = []
-        for idx, fila in enumerate(resultados_mes):
-            rescate.append(float(rescates[idx]) * float(fila.get("caducados", 0)))
-
-        return rescate
+        return [
+            float(rescates[idx]) * caducados
+            for idx, caducados in enumerate(expuestos_mes["caducados"].tolist())
+        ]
 
     def calcular_rescate(
         self,
@@ -173,33 +156,22 @@ class Reserva:
             periodo_vigencia, prima, fraccionamiento_primas, devolucion
         )
 
-        rescates = []
-        suma_acumulada = 0.0
-
-        for i in range(len(primas_pagadas)):
-            suma_acumulada += primas_pagadas[i]
-            porc_actual = porcentaje_devolucion_mensual[i]
-            porc_siguiente = (
-                porcentaje_devolucion_mensual[i + 1]
-                if i + 1 < len(porcentaje_devolucion_mensual)
-                else 0.0
-            )
-
-            # Verificamos si estamos en el último período y aplicamos un tratamiento especial
-            if i == len(primas_pagadas) - 1:
-                # Para el último período, calculamos de manera dinámica
-                # Usamos el 10% de la suma acumulada total como base y ajustamos según el porcentaje de devolución
-                rescate = suma_acumulada * 0.01 * porcentaje_devolucion
-            elif porc_siguiente == 0.0:
-                # Para períodos con porcentaje siguiente igual a 0
-                rescate = suma_acumulada * porc_actual * porcentaje_devolucion
-            else:
-                # Para el resto de los períodos
-                rescate = suma_acumulada * porc_actual
-
-            rescates.append(rescate)
-
-        return rescates
+        suma_acumulada = np.cumsum(np.asarray(primas_pagadas, dtype=np.float64))
+        porcentaje_actual = np.asarray(porcentaje_devolucion_mensual, dtype=np.float64)
+        if not suma_acumulada.size:
+            return []
+        porcentaje_siguiente = np.append(porcentaje_actual[1:], 0.0)
+
+        # Para el resto de los períodos: primas acumuladas por su porcentaje
+        rescates = suma_acumulada * porcentaje_actual
+        # Períodos con porcentaje siguiente igual a 0: escalan con el porcentaje
+        escala = porcentaje_siguiente == 0.0
+        rescates[escala] *= porcentaje_devolucion
+        # Último período: 1% de la suma acumulada total, ajustado según el
+        # porcentaje de devolución
+        rescates[-1] = suma_acumulada[-1] * 0.01 * porcentaje_devolucion
+
+        return rescates.tolist()
 
     def calcular_primas_pagadas(
         self, periodo_vigencia: int, prima: float, fraccionamiento_primas: float
@@ -0,0 +1,223 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from src.core.constants import AJUSTE_MORTALIDAD_POR_DEFECTO, PERIODO_VIGENCIA_MAXIMO
+from src.helpers.caducidad_mensual import caducidad_mensual
+from src.repositories.caducidad_repository import (
+    CaducidadRepository,
+    caducidad_repository,
+)
+from src.repositories.parametros_repository import parametros_repository
+from src.repositories.registro_datos_referencia import registro_datos_referencia
+from src.repositories.tabla_mortalidad_repository import (
+    EstadoFumador,
+    Sexo,
+    TablaMortalidadRepository,
+    tabla_mortalidad_repository,
+)
+
+# Producto de cuyos assets (mortalidad, caducidad y parámetros) salen las tablas
+PRODUCTO_TABLAS = "rumbo"
+
+
+def _solo_lectura(arreglo: np.ndarray) -> np.ndarray:
+    arreglo.flags.writeable = False
+    return arreglo
+
+
+@dataclass(frozen=True)
+class VectoresMortalidad:
+    """
+    Mortalidad (por mil) indexada por año: la anual de la tabla, su
+    equivalente mensual y la mensual con el ajuste de mortalidad aplicado.
+    """
+
+    anual: np.ndarray
+    mensual: np.ndarray
+    ajustada: np.ndarray
+
+
+class TablasDecremento:
+    """
+    Tablas de decremento precalculadas y compartidas entre cotizaciones.
+
+    Al construirse calcula, para cada combinación de sexo y fumador, la
+    mortalidad anual y mensual de todas las edades de la tabla, la mortalidad
+    ajustada para los ajustes conocidos, y la curva de caducidad mensual de
+    cada periodo de vigencia admitido, además de la curva continua (sin la
+    caducidad total del último mes). Todos los vectores son de solo lectura.
+
+    Las tablas no siguen los cambios de los assets: version indica la de los
+    datos con que se construyeron (ver obtener_tablas_decremento).
+    """
+
+    def __init__(
+        self,
+        mortalidad_repository: TablaMortalidadRepository = tabla_mortalidad_repository,
+        caducidad_repository: CaducidadRepository = caducidad_repository,
+        ajustes_mortalidad: Optional[Iterable[float]] = None,
+        periodo_vigencia_maximo: int = PERIODO_VIGENCIA_MAXIMO,
+        version: Optional[str] = None,
+    ):
+        self.version = version
+        self.caducidad_repository = caducidad_repository
+
+        tabla = mortalidad_repository.get_tabla_mortalidad()
+        edades = [int(edad) for edad in tabla]
+        total_edades = max(edades) + 1 if edades else 0
+
+        # Edades fuera de la tabla o combinaciones faltantes no tienen mortalidad
+        self._mortalidad_anual: Dict[Tuple[Sexo, EstadoFumador], np.ndarray] = {}
+        self._mortalidad_mensual: Dict[Tuple[Sexo, EstadoFumador], np.ndarray] = {}
+        for sexo in Sexo:
+            clave_base = "hombres" if sexo == Sexo.MASCULINO else "mujeres"
+            for fumador in EstadoFumador:
+                clave = f"{clave_base}_{fumador.value}"
+                anual = np.zeros(total_edades)
+                for edad in edades:
+                    anual[edad] = tabla[str(edad)].get(clave, 0.0)
+                # Fórmula: (1-(1-q_x/1000)^(1/12))*1000
+                mensual = (1 - (1 - anual / 1000) ** (1 / 12)) * 1000
+                self._mortalidad_anual[sexo, fumador] = _solo_lectura(anual)
+                self._mortalidad_mensual[sexo, fumador] = _solo_lectura(mensual)
+
+        self._mortalidad_ajustada: Dict[
+            Tuple[Sexo, EstadoFumador, float], np.ndarray
+        ] = {}
+        if ajustes_mortalidad is None:
+            ajustes_mortalidad = {
+                AJUSTE_MORTALIDAD_POR_DEFECTO,
+                parametros_repository.get_parametros_by_producto("rumbo").get(
+                    "ajuste_mortalidad", AJUSTE_MORTALIDAD_POR_DEFECTO
+                ),
+            }
+        for ajuste in ajustes_mortalidad:
+            for sexo, fumador in self._mortalidad_mensual:
+                self._ajustada(sexo, fumador, ajuste)
+
+        self._caducidad: Dict[int, np.ndarray] = {
+            periodo: self._calcular_caducidad(periodo)
+            for periodo in range(1, periodo_vigencia_maximo + 1)
+        }
+        self._caducidad_continua = self._calcular_caducidad_continua(
+            periodo_vigencia_maximo
+        )
+
+    def mortalidad(
+        self,
+        sexo: Sexo,
+        fumador: EstadoFumador,
+        ajuste_mortalidad: float,
+        edad_inicial: int,
+        anios: int,
+    ) -> VectoresMortalidad:
+        """
+        Mortalidad para cada año de póliza a partir de la edad inicial.
+
+        Args:
+            sexo: Sexo del asegurado
+            fumador: Estado de fumador del asegurado
+            ajuste_mortalidad: Ajuste de la tabla en porcentaje (ej: 150)
+            edad_inicial: Edad en el primer año de póliza
+            anios: Cantidad de años de póliza
+
+        Returns:
+            VectoresMortalidad con un valor por año de póliza
+        """
+        sexo = Sexo.MASCULINO if sexo == Sexo.MASCULINO else Sexo.FEMENINO
+        fumador = EstadoFumador(fumador)
+        tramo = slice(edad_inicial, edad_inicial + anios)
+        return VectoresMortalidad(
+            anual=self._por_anio(self._mortalidad_anual[sexo, fumador], tramo),
+            mensual=self._por_anio(self._mortalidad_mensual[sexo, fumador], tramo),
+            ajustada=self._por_anio(
+                self._ajustada(sexo, fumador, ajuste_mortalidad), tramo
+            ),
+        )
+
+    def caducidad(self, periodo_vigencia: int) -> np.ndarray:
+        """
+        Tasa de caducidad mensual para cada mes del periodo de vigencia.
+        Los periodos fuera del rango precalculado se calculan al vuelo.
+        """
+        tasas = self._caducidad.get(periodo_vigencia)
+        if tasas is None:
+            tasas = self._calcular_caducidad(periodo_vigencia)
+        return tasas
+
+    def caducidad_continua(self, anios: int) -> np.ndarray:
+        """
+        Tasa de caducidad mensual de los primeros años de póliza sin forzar la
+        caducidad total del último mes. La curva de un periodo de vigencia es
+        el prefijo de esta con el último mes en 1.
+        """
+        meses = anios * 12
+        if meses <= len(self._caducidad_continua):
+            return self._caducidad_continua[:meses]
+        return self._calcular_caducidad_continua(anios)
+
+    def _ajustada(
+        self, sexo: Sexo, fumador: EstadoFumador, ajuste_mortalidad: float
+    ) -> np.ndarray:
+        clave = (sexo, fumador, float(ajuste_mortalidad))
+        ajustada = self._mortalidad_ajustada.get(clave)
+        if ajustada is None:
+            ajustada = _solo_lectura(
+                self._mortalidad_mensual[sexo, fumador] * (ajuste_mortalidad / 100.0)
+            )
+            self._mortalidad_ajustada[clave] = ajustada
+        return ajustada
+
+    @staticmethod
+    def _por_anio(por_edad: np.ndarray, tramo: slice) -> np.ndarray:
+        if tramo.stop <= len(por_edad):
+            return por_edad[tramo]
+        # Edades posteriores a la tabla: sin mortalidad
+        completo = np.zeros(tramo.stop - tramo.start)
+        disponibles = por_edad[tramo]
+        completo[: len(disponibles)] = disponibles
+        return _solo_lectura(completo)
+
+    def _calcular_caducidad(self, periodo_vigencia: int) -> np.ndarray:
+        por_mes = caducidad_mensual(
+            periodo_vigencia,
+            self.caducidad_repository.get_caducidad_mensual_data(),
+            self.caducidad_repository.get_caducidad_data(),
+        )
+        return _solo_lectura(
+            np.fromiter(
+                (por_mes.get(mes, 0.0) for mes in range(1, periodo_vigencia * 12 + 1)),
+                dtype=np.float64,
+            )
+        )
+
+    def _calcular_caducidad_continua(self, anios: int) -> np.ndarray:
+        # El último mes de un periodo más largo aún no es el de cierre
+        return _solo_lectura(self._calcular_caducidad(anios + 1)[: anios * 12].copy())
+
+
+# Instancia global compartida por todas las cotizaciones, reconstruida cuando
+# cambia la versión de los assets
+_tablas_decremento: Optional[TablasDecremento] = None
+_lock_tablas_decremento = threading.Lock()
+
+
+def obtener_tablas_decremento() -> TablasDecremento:
+    """
+    Tablas de la versión vigente de los assets en el registro de datos de
+    referencia. Si la versión cambió desde la última construcción, se
+    vuelven a construir con los datos nuevos.
+    """
+    global _tablas_decremento
+    version = registro_datos_referencia.obtener(PRODUCTO_TABLAS).version
+    tablas = _tablas_decremento
+    if tablas is None or tablas.version != version:
+        with _lock_tablas_decremento:
+            tablas = _tablas_decremento
+            if tablas is None or tablas.version != version:
+                tablas = TablasDecremento(version=version)
+                _tablas_decremento = tablas
+    return tablas
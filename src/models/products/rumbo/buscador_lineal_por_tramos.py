@@ -0,0 +1,62 @@
+"""
+Búsqueda exacta del porcentaje de devolución óptimo de Rumbo.
+Aprovecha que el VNA es lineal por tramos en el porcentaje: en cada paso
+evalúa el VNA, su pendiente y el tramo afín que contiene al punto, y resuelve
+la raíz de forma cerrada cuando cae dentro de ese tramo.
+"""
+
+from src.helpers.buscador_raiz import BuscadorRaiz, ResultadoRaiz
+from src.models.products.rumbo.motor_actuarial import MotorActuarial
+
+
+class LinealPorTramos(BuscadorRaiz):
+    """
+    Newton salvaguardado sobre el modelo lineal por tramos del VNA.
+
+    Si la raíz de la recta del tramo actual cae dentro del tramo, es la raíz
+    exacta del VNA (salvo redondeo de punto flotante). Si no, se avanza a esa
+    raíz mientras quede dentro del intervalo con cambio de signo; en otro
+    caso se biseca. No depende de la tolerancia para converger.
+    """
+
+    nombre = "lineal_por_tramos"
+
+    def __init__(self, motor: MotorActuarial):
+        self.motor = motor
+
+    def buscar(self, funcion, a, b, fa, fb, tol, max_iter) -> ResultadoRaiz:
+        evaluaciones = 0
+        porcentaje = a if abs(fa) <= abs(fb) else b
+
+        for _ in range(max_iter):
+            vna, pendiente, inicio_tramo, fin_tramo = self.motor.evaluar_lineal(
+                porcentaje
+            )
+            evaluaciones += 1
+
+            if vna == 0.0:
+                return ResultadoRaiz(porcentaje, vna, evaluaciones, True)
+
+            # Mantener el intervalo con cambio de signo
+            if vna * fa < 0:
+                b, fb = porcentaje, vna
+            else:
+                a, fa = porcentaje, vna
+
+            siguiente = None
+            if pendiente != 0.0:
+                raiz = porcentaje - vna / pendiente
+                if inicio_tramo <= raiz <= fin_tramo and a <= raiz <= b:
+                    return ResultadoRaiz(
+                        raiz, vna + pendiente * (raiz - porcentaje), evaluaciones, True
+                    )
+                if a < raiz < b:
+                    siguiente = raiz
+
+            if abs(b - a) < tol:
+                break
+
+            porcentaje = siguiente if siguiente is not None else (a + b) / 2.0
+
+        raiz, valor = (a, fa) if abs(fa) < abs(fb) else (b, fb)
+        return ResultadoRaiz(raiz, valor, evaluaciones, abs(b - a) < tol)
@@ -0,0 +1,210 @@
+"""
+Memoria de porcentajes de devolución óptimos recientes.
+Propone un intervalo inicial estrecho a partir del óptimo de un perfil vecino.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.config import settings
+
+# Perfil sin edad ni prima: solo se comparan óptimos dentro del mismo grupo
+GrupoPerfil = Tuple[int, int, str, bool, str]
+
+
+@dataclass(frozen=True)
+class PerfilOptimizacion:
+    """Datos de la cotización que determinan el porcentaje óptimo"""
+
+    periodo_vigencia: int
+    periodo_pago_primas: int
+    sexo: str
+    fumador: bool
+    frecuencia_pago_primas: str
+    edad_actuarial: int
+    prima: float
+
+    @classmethod
+    def desde_input(
+        cls, cotizacion_input: Any, periodo_vigencia: int, periodo_pago_primas: int
+    ) -> "PerfilOptimizacion":
+        parametros = cotizacion_input.parametros
+        frecuencia = parametros.frecuencia_pago_primas
+        return cls(
+            periodo_vigencia=int(periodo_vigencia),
+            periodo_pago_primas=int(periodo_pago_primas),
+            sexo=getattr(parametros.sexo, "value", str(parametros.sexo)),
+            fumador=bool(parametros.fumador),
+            frecuencia_pago_primas=getattr(frecuencia, "value", str(frecuencia)),
+            edad_actuarial=int(parametros.edad_actuarial),
+            prima=float(parametros.prima),
+        )
+
+    @property
+    def grupo(self) -> GrupoPerfil:
+        return (
+            self.periodo_vigencia,
+            self.periodo_pago_primas,
+            self.sexo,
+            self.fumador,
+            self.frecuencia_pago_primas,
+        )
+
+
+class MemoriaOptimos:
+    """
+    Óptimos resueltos recientemente, con un índice de vecinos por grupo
+    (vigencia, pago de primas, sexo, fumador, frecuencia), edad y prima.
+
+    Los perfiles vecinos (edad ±1, prima contigua del catálogo) tienen casi el
+    mismo óptimo, así que el del vecino más cercano sirve como centro de un
+    intervalo inicial estrecho, cuya semiamplitud crece con la distancia al
+    vecino. El intervalo es solo una sugerencia: el optimizador verifica el
+    cambio de signo en sus extremos antes de usarlo y, si no lo hay, vuelve a
+    la búsqueda desde el intervalo fijo.
+
+    La distancia entre perfiles es |Δedad| + |Δprima| / paso_prima: con el
+    paso por defecto, la prima contigua del catálogo (20) está a la misma
+    distancia que dos años de edad, porque mueve más el óptimo. Solo se
+    guardan óptimos de búsquedas que convergieron.
+    """
+
+    def __init__(
+        self,
+        tamano_maximo: int = 4096,
+        semiamplitud: float = 0.5,
+        distancia_maxima: float = 2.0,
+        paso_prima: float = 10.0,
+    ):
+        self.tamano_maximo = tamano_maximo
+        self.semiamplitud = semiamplitud
+        self.distancia_maxima = distancia_maxima
+        self.paso_prima = paso_prima
+        self._optimos: "OrderedDict[PerfilOptimizacion, float]" = OrderedDict()
+        # grupo -> edad -> primas ordenadas con óptimo guardado
+        self._indice: Dict[GrupoPerfil, Dict[int, List[float]]] = {}
+        self._lock = threading.Lock()
+        self._contadores = dict.fromkeys(
+            ("consultas", "sugerencias", "aceptadas", "rechazadas"), 0
+        )
+
+    def intervalo_sugerido(
+        self, perfil: PerfilOptimizacion
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Intervalo centrado en el óptimo del vecino más cercano, de semiamplitud
+        semiamplitud * max(distancia, 1), o None si no hay vecinos a la
+        distancia máxima.
+        """
+        with self._lock:
+            self._contadores["consultas"] += 1
+            vecino, distancia = self._vecino_mas_cercano(perfil)
+            if vecino is None:
+                return None
+            self._contadores["sugerencias"] += 1
+            self._optimos.move_to_end(vecino)
+            optimo = self._optimos[vecino]
+        semiamplitud = self.semiamplitud * max(distancia, 1.0)
+        return optimo - semiamplitud, optimo + semiamplitud
+
+    def registrar(
+        self,
+        perfil: PerfilOptimizacion,
+        porcentaje_optimo: float,
+        convergio: bool,
+        arranque_tibio: Optional[bool] = None,
+    ) -> None:
+        """
+        Registra el resultado de una optimización.
+
+        Args:
+            perfil: Perfil optimizado
+            porcentaje_optimo: Porcentaje encontrado
+            convergio: Si la búsqueda convergió; si no, el óptimo no se guarda
+            arranque_tibio: Si se usó (True) o se descartó (False) el intervalo
+                sugerido; None si no hubo sugerencia
+        """
+        with self._lock:
+            if arranque_tibio is not None:
+                self._contadores["aceptadas" if arranque_tibio else "rechazadas"] += 1
+            if not convergio or self.tamano_maximo <= 0:
+                return
+            if perfil not in self._optimos:
+                insort(
+                    self._indice.setdefault(perfil.grupo, {}).setdefault(
+                        perfil.edad_actuarial, []
+                    ),
+                    perfil.prima,
+                )
+            self._optimos[perfil] = porcentaje_optimo
+            self._optimos.move_to_end(perfil)
+            while len(self._optimos) > self.tamano_maximo:
+                antiguo, _ = self._optimos.popitem(last=False)
+                self._quitar_del_indice(antiguo)
+
+    def limpiar(self) -> None:
+        """Elimina todos los óptimos guardados (los contadores se conservan)"""
+        with self._lock:
+            self._optimos.clear()
+            self._indice.clear()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Tamaño, límites y contadores de la memoria"""
+        with self._lock:
+            return {
+                "tamano": len(self._optimos),
+                "tamano_maximo": self.tamano_maximo,
+                **self._contadores,
+            }
+
+    def _vecino_mas_cercano(
+        self, perfil: PerfilOptimizacion
+    ) -> Tuple[Optional[PerfilOptimizacion], float]:
+        por_edad = self._indice.get(perfil.grupo)
+        if not por_edad:
+            return None, 0.0
+
+        mejor = None
+        mejor_distancia = self.distancia_maxima
+        alcance_edad = int(self.distancia_maxima)
+        for edad in range(
+            perfil.edad_actuarial - alcance_edad, perfil.edad_actuarial + alcance_edad + 1
+        ):
+            primas = por_edad.get(edad)
+            if not primas:
+                continue
+            # Primas guardadas inmediatamente por debajo y por encima
+            posicion = bisect_left(primas, perfil.prima)
+            for prima in primas[max(posicion - 1, 0) : posicion + 1]:
+                distancia = (
+                    abs(edad - perfil.edad_actuarial)
+                    + abs(prima - perfil.prima) / self.paso_prima
+                )
+                if distancia <= mejor_distancia and (
+                    mejor is None or distancia < mejor_distancia
+                ):
+                    mejor_distancia = distancia
+                    mejor = (edad, prima)
+
+        if mejor is None:
+            return None, 0.0
+        return PerfilOptimizacion(*perfil.grupo, *mejor), mejor_distancia
+
+    def _quitar_del_indice(self, perfil: PerfilOptimizacion) -> None:
+        por_edad = self._indice[perfil.grupo]
+        primas = por_edad[perfil.edad_actuarial]
+        primas.pop(bisect_left(primas, perfil.prima))
+        if not primas:
+            del por_edad[perfil.edad_actuarial]
+        if not por_edad:
+            del self._indice[perfil.grupo]
+
+
+# Instancia global compartida por todas las cotizaciones
+memoria_optimos = MemoriaOptimos(
+    tamano_maximo=settings.MEMORIA_OPTIMOS_TAMANO,
+    semiamplitud=settings.MEMORIA_OPTIMOS_SEMIAMPLITUD,
+)
@@ -0,0 +1,473 @@
+"""
+Motor actuarial de Rumbo.
+Calcula en una sola pasada sobre arreglos la cadena expuestos → gastos →
+flujos → reservas → márgenes → flujo accionista → VNA. Lo usan el paso de
+cálculos actuariales del pipeline (con el porcentaje de entrada) y el
+evaluador del optimizador (una evaluación por porcentaje candidato).
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.helpers.redondeo_mensual import redondeo_mensual
+from src.helpers.valor_presente import valor_presente_prospectivo
+from src.models.schemas.cotizacion_schema import (
+    CotizacionInput,
+    ParametrosAlmacenados,
+    ParametrosCalculados,
+)
+from src.services.expuestos_mes_service import ExpuestosMesService
+from src.services.flujo_resultado_service import FlujoResultadoService
+from src.services.gastos_service import GastosService
+from src.services.reserva_service import ReservaService
+
+
+@dataclass(frozen=True)
+class ResultadoActuarial:
+    """Vectores de una evaluación completa del motor (un valor por mes)"""
+
+    rescate: np.ndarray
+    rescates: np.ndarray
+    flujo_pasivo: np.ndarray
+    saldo_reserva: np.ndarray
+    moce: np.ndarray
+    reserva_fin_año: np.ndarray
+    margen_solvencia: np.ndarray
+    varianza_margen_solvencia: np.ndarray
+    ingreso_inversiones: np.ndarray
+    ingreso_inversiones_margen_solvencia: np.ndarray
+    ingreso_total_inversiones: np.ndarray
+    varianza_reserva: np.ndarray
+    varianza_moce: np.ndarray
+    variacion_reserva: np.ndarray
+    utilidad_pre_pi_ms: np.ndarray
+    IR: np.ndarray
+    flujo_accionista: np.ndarray
+    vna: float
+
+
+class MotorActuarial:
+    """
+    Cálculo actuarial completo de una cotización sobre arreglos compartidos.
+
+    Expuestos, primas recurrentes, siniestros, gastos, comisión y gasto de
+    adquisición no dependen del porcentaje de devolución, así que se calculan
+    una vez al construir el motor con los mismos servicios del cálculo
+    individual. La regla de rescate (Reserva.calcular_rescate) es afín en el
+    porcentaje (rescate = base + pendiente * porcentaje), de modo que también
+    se compila en dos vectores y cada evaluación solo recorre la cola que
+    depende de él.
+    """
+
+    def __init__(
+        self,
+        cotizacion_input: CotizacionInput,
+        parametros_almacenados: ParametrosAlmacenados,
+        parametros_calculados: ParametrosCalculados,
+        periodo_vigencia: int,
+        periodo_pago_primas: int,
+        prima: float,
+        expuestos_mes_service: Optional[ExpuestosMesService] = None,
+        gastos_service: Optional[GastosService] = None,
+        flujo_resultado_service: Optional[FlujoResultadoService] = None,
+        reserva_service: Optional[ReservaService] = None,
+    ):
+        expuestos_mes_service = expuestos_mes_service or ExpuestosMesService()
+        gastos_service = gastos_service or GastosService()
+        flujo_resultado_service = flujo_resultado_service or FlujoResultadoService()
+        reserva_service = reserva_service or ReservaService()
+
+        cotizacion = cotizacion_input.parametros
+        almacenados = parametros_almacenados
+        calculados = parametros_calculados
+
+        # Expuestos
+        self.expuestos_mes = expuestos_mes_service.calcular_expuestos_mes(
+            edad_actuarial=cotizacion.edad_actuarial,
+            sexo=cotizacion.sexo,
+            fumador=cotizacion.fumador if cotizacion.fumador else False,
+            frecuencia_pago_primas=cotizacion.frecuencia_pago_primas,
+            periodo_vigencia=periodo_vigencia,
+            periodo_pago_primas=periodo_pago_primas,
+            ajuste_mortalidad=almacenados.ajuste_mortalidad,
+        )
+        self.meses = meses = self.expuestos_mes.meses
+        self.vivos_inicio = self.expuestos_mes["vivos_inicio"]
+        self.caducados = self.expuestos_mes["caducados"]
+
+        # Gastos
+        self.gastos = gastos_service.calcular_gastos(
+            periodo_vigencia=periodo_vigencia,
+            periodo_pago_primas=periodo_pago_primas,
+            prima=prima,
+            expuestos_mes=self.expuestos_mes,
+            frecuencia_pago_primas=cotizacion.frecuencia_pago_primas,
+            mantenimiento_poliza=calculados.mantenimiento_poliza,
+            moneda=almacenados.moneda,
+            valor_dolar=almacenados.valor_dolar,
+            valor_soles=almacenados.valor_soles,
+            tiene_asistencia=almacenados.tiene_asistencia,
+            costo_mensual_asistencia_funeraria=almacenados.costo_mensual_asistencia_funeraria,
+            inflacion_mensual=calculados.inflacion_mensual,
+        )
+
+        # Flujos principales y secundarios
+        primas_recurrentes = flujo_resultado_service.calcular_primas_recurrentes(
+            expuestos_mes=self.expuestos_mes,
+            periodo_pago_primas=periodo_pago_primas,
+            frecuencia_pago_primas=cotizacion.frecuencia_pago_primas,
+            prima=prima,
+        )
+        siniestros = flujo_resultado_service.calcular_siniestros(
+            expuestos_mes=self.expuestos_mes,
+            suma_asegurada=almacenados.suma_asegurada_rumbo,
+        )
+        gastos_mantenimiento = flujo_resultado_service.calcular_gastos_mantenimiento(
+            gastos_mantenimiento=self.gastos,
+        )
+        self.gasto_adquisicion = float(
+            flujo_resultado_service.calcular_gasto_adquisicion(
+                gasto_adquisicion=almacenados.gasto_adquisicion,
+            )
+        )
+        comision = flujo_resultado_service.calcular_comision(
+            primas_recurrentes=primas_recurrentes,
+            asistencia=almacenados.tiene_asistencia,
+            frecuencia_pago_primas=cotizacion.frecuencia_pago_primas,
+            costo_asistencia_funeraria=almacenados.costo_mensual_asistencia_funeraria,
+            expuestos_mes=self.expuestos_mes,
+            comision=almacenados.comision,
+        )
+        self.primas_recurrentes = np.asarray(primas_recurrentes, dtype=np.float64)
+        self.siniestros = np.asarray(siniestros, dtype=np.float64)
+        self.gastos_mantenimiento = np.asarray(gastos_mantenimiento, dtype=np.float64)
+        self.comision = np.asarray(comision, dtype=np.float64)
+
+        # Rescate afín en el porcentaje: la regla de rescate evaluada en 0 da
+        # la parte fija y evaluada en 1, la pendiente (la regla solo escala
+        # por el porcentaje, así que la descomposición es exacta)
+        rescate_base = reserva_service.calcular_rescate(
+            periodo_vigencia=periodo_vigencia,
+            prima=prima,
+            fraccionamiento_primas=almacenados.fraccionamiento_primas,
+            porcentaje_devolucion=0.0,
+        )
+        rescate_unitario = reserva_service.calcular_rescate(
+            periodo_vigencia=periodo_vigencia,
+            prima=prima,
+            fraccionamiento_primas=almacenados.fraccionamiento_primas,
+            porcentaje_devolucion=1.0,
+        )
+        self.rescate_base = np.asarray(rescate_base, dtype=np.float64)
+        self.rescate_pendiente = (
+            np.asarray(rescate_unitario, dtype=np.float64) - self.rescate_base
+        )
+
+        # Flujo pasivo y utilidad sin rescates ni variación de reserva: ambos
+        # son lineales en esos términos, que se suman en la cola
+        sin_rescates = [0.0] * meses
+        self.flujo_pasivo_fijo = np.asarray(
+            reserva_service.calcular_flujo_pasivo(
+                siniestros,
+                sin_rescates,
+                gastos_mantenimiento,
+                comision,
+                self.gasto_adquisicion,
+                primas_recurrentes,
+            ),
+            dtype=np.float64,
+        )
+        self.utilidad_fija = np.asarray(
+            flujo_resultado_service.calcular_utilidad_pre_pi_ms(
+                primas_recurrentes=primas_recurrentes,
+                comision=comision,
+                gasto_adquisicion=self.gasto_adquisicion,
+                gastos_mantenimiento=gastos_mantenimiento,
+                siniestros=siniestros,
+                rescates=sin_rescates,
+                variacion_reserva=sin_rescates,
+            )[:meses],
+            dtype=np.float64,
+        )
+
+        self.tasa_interes_mensual = calculados.tasa_interes_mensual
+        self.tasa_costo_capital_mensual = calculados.tasa_costo_capital_mensual
+        self.factor_margen_reserva = almacenados.margen_solvencia
+        self.margen_solvencia_reserva = calculados.reserva
+        self.tasa_inversion_mensual = redondeo_mensual(calculados.tasa_inversion)
+        self.impuesto_renta = almacenados.impuesto_renta
+        # La varianza del margen se resta en todos los meses salvo el cierre
+        self.signo_margen_solvencia = np.full(meses + 1, -1.0)
+        self.signo_margen_solvencia[-1] = 1.0
+        self.descuento_accionista = (1 + calculados.tasa_costo_capital_mes) ** -np.arange(
+            meses + 1, dtype=np.float64
+        )
+
+    def calcular(self, porcentaje: float) -> ResultadoActuarial:
+        """
+        Evaluación completa para un porcentaje de devolución: todos los
+        vectores de la cola además del VNA del flujo del accionista.
+        """
+        cola = self._cola(float(porcentaje))
+        vna = float(cola["flujo_accionista"] @ self.descuento_accionista)
+        return ResultadoActuarial(vna=vna, **cola)
+
+    def evaluar(self, porcentaje: float) -> float:
+        """
+        Evalúa el VNA del flujo del accionista para un porcentaje de devolución.
+        """
+        if self.meses == 0:
+            return 0.0
+        return float(self._cola(porcentaje)["flujo_accionista"] @ self.descuento_accionista)
+
+    def evaluar_many(self, porcentajes) -> np.ndarray:
+        """
+        Evalúa el VNA para varios porcentajes en una sola pasada vectorizada.
+        Cada vector de la cola se calcula como matriz (candidatos × meses).
+
+        Returns:
+            Arreglo con un VNA por porcentaje, en el mismo orden
+        """
+        porcentajes = np.asarray(porcentajes, dtype=np.float64).reshape(-1)
+        if self.meses == 0 or porcentajes.size == 0:
+            return np.zeros(porcentajes.size)
+        cola = self._cola(porcentajes[:, np.newaxis])
+        return cola["flujo_accionista"] @ self.descuento_accionista
+
+    def _cola(self, porcentaje) -> Dict[str, np.ndarray]:
+        """
+        Cola rescate → flujo accionista. Con un porcentaje escalar trabaja
+        sobre vectores de meses; con una columna de porcentajes, sobre
+        matrices por fila.
+        """
+        # Rescate y rescates (ajuste por devolución anticipada)
+        rescate = self.rescate_base + self.rescate_pendiente * porcentaje
+        rescates = rescate * self.caducados
+
+        flujo_pasivo = self.flujo_pasivo_fijo + rescates
+
+        # Saldo de reserva
+        saldo_reserva = np.maximum(
+            np.maximum(
+                valor_presente_prospectivo(flujo_pasivo, self.tasa_interes_mensual),
+                0.0,
+            ),
+            rescate * self.vivos_inicio,
+        )
+
+        lineales = self._propagar_saldo_reserva(saldo_reserva)
+        variacion_reserva = lineales["variacion_reserva"]
+        variacion_reserva[..., -1] = np.abs(variacion_reserva[..., -1])
+
+        # Utilidad, impuesto y flujo del accionista
+        utilidad_pre_pi_ms = np.empty(variacion_reserva.shape)
+        utilidad_pre_pi_ms[..., :-1] = (
+            self.utilidad_fija
+            - np.abs(rescates)
+            - np.abs(variacion_reserva[..., :-1])
+        )
+        utilidad_pre_pi_ms[..., -1] = variacion_reserva[..., -1]
+
+        IR = utilidad_pre_pi_ms * self.impuesto_renta
+
+        flujo_accionista = (
+            utilidad_pre_pi_ms
+            + self.signo_margen_solvencia * np.abs(lineales["varianza_margen_solvencia"])
+            - np.abs(IR)
+        )
+        flujo_accionista[..., :-1] += lineales["ingreso_total_inversiones"]
+
+        return {
+            "rescate": rescate,
+            "rescates": rescates,
+            "flujo_pasivo": flujo_pasivo,
+            "saldo_reserva": saldo_reserva,
+            **lineales,
+            "utilidad_pre_pi_ms": utilidad_pre_pi_ms,
+            "IR": IR,
+            "flujo_accionista": flujo_accionista,
+        }
+
+    def evaluar_lineal(self, porcentaje: float) -> Tuple[float, float, float, float]:
+        """
+        Evalúa el VNA junto con su pendiente respecto al porcentaje.
+
+        El porcentaje entra de forma afín en el rescate y las únicas no
+        linealidades posteriores son max y abs, así que el VNA es lineal por
+        tramos. Cada vector se propaga como (valor, pendiente) y cada max/abs
+        acota el tramo en el que conserva su rama.
+
+        Returns:
+            (vna, pendiente, inicio_tramo, fin_tramo): el VNA es exactamente
+            vna + pendiente * (p - porcentaje) para p en [inicio_tramo, fin_tramo]
+        """
+        if self.meses == 0:
+            return 0.0, 0.0, -math.inf, math.inf
+
+        tramo = _Tramo()
+
+        # Rescate y rescates: afines en el porcentaje
+        rescate = self.rescate_base + self.rescate_pendiente * porcentaje
+        d_rescate = self.rescate_pendiente
+        rescates = rescate * self.caducados
+        d_rescates = d_rescate * self.caducados
+
+        valor_presente = valor_presente_prospectivo(
+            self.flujo_pasivo_fijo + rescates, self.tasa_interes_mensual
+        )
+        d_valor_presente = valor_presente_prospectivo(
+            d_rescates, self.tasa_interes_mensual
+        )
+
+        # Saldo de reserva: max(max(VP, 0), rescate * vivos)
+        positivo = tramo.rama(valor_presente, d_valor_presente)
+        reserva = np.where(positivo, valor_presente, 0.0)
+        d_reserva = np.where(positivo, d_valor_presente, 0.0)
+
+        rescate_vivos = rescate * self.vivos_inicio
+        d_rescate_vivos = d_rescate * self.vivos_inicio
+        gana_reserva = tramo.rama(
+            reserva - rescate_vivos, d_reserva - d_rescate_vivos
+        )
+        saldo_reserva = np.where(gana_reserva, reserva, rescate_vivos)
+        d_saldo_reserva = np.where(gana_reserva, d_reserva, d_rescate_vivos)
+
+        lineales = self._propagar_saldo_reserva(saldo_reserva)
+        d_lineales = self._propagar_saldo_reserva(d_saldo_reserva)
+        varianza_margen_solvencia = lineales["varianza_margen_solvencia"]
+        d_varianza_margen_solvencia = d_lineales["varianza_margen_solvencia"]
+        variacion_reserva = lineales["variacion_reserva"]
+        d_variacion_reserva = d_lineales["variacion_reserva"]
+        signo = tramo.signo(variacion_reserva[-1:], d_variacion_reserva[-1:])[0]
+        variacion_reserva[-1] *= signo
+        d_variacion_reserva[-1] *= signo
+
+        # Utilidad, impuesto y flujo del accionista
+        signo_rescates = tramo.signo(rescates, d_rescates)
+        signo_variacion = tramo.signo(variacion_reserva[:-1], d_variacion_reserva[:-1])
+        utilidad_pre_pi_ms = np.empty(self.meses + 1)
+        d_utilidad_pre_pi_ms = np.empty(self.meses + 1)
+        utilidad_pre_pi_ms[:-1] = (
+            self.utilidad_fija
+            - signo_rescates * rescates
+            - signo_variacion * variacion_reserva[:-1]
+        )
+        d_utilidad_pre_pi_ms[:-1] = (
+            -signo_rescates * d_rescates
+            - signo_variacion * d_variacion_reserva[:-1]
+        )
+        utilidad_pre_pi_ms[-1] = variacion_reserva[-1]
+        d_utilidad_pre_pi_ms[-1] = d_variacion_reserva[-1]
+
+        signo_ir = tramo.signo(utilidad_pre_pi_ms, d_utilidad_pre_pi_ms)
+        signo_margen = self.signo_margen_solvencia * tramo.signo(
+            varianza_margen_solvencia, d_varianza_margen_solvencia
+        )
+        factor_ir = self.impuesto_renta * signo_ir
+
+        flujo_accionista = (
+            utilidad_pre_pi_ms
+            + signo_margen * varianza_margen_solvencia
+            - factor_ir * utilidad_pre_pi_ms
+        )
+        flujo_accionista[:-1] += lineales["ingreso_total_inversiones"]
+        d_flujo_accionista = (
+            d_utilidad_pre_pi_ms
+            + signo_margen * d_varianza_margen_solvencia
+            - factor_ir * d_utilidad_pre_pi_ms
+        )
+        d_flujo_accionista[:-1] += d_lineales["ingreso_total_inversiones"]
+
+        return (
+            float(np.dot(flujo_accionista, self.descuento_accionista)),
+            float(np.dot(d_flujo_accionista, self.descuento_accionista)),
+            porcentaje + tramo.inicio,
+            porcentaje + tramo.fin,
+        )
+
+    def _propagar_saldo_reserva(self, saldo_reserva: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Parte lineal de la cola a partir del saldo de reserva: MOCE, margen de
+        solvencia, ingresos por inversiones y variación de reserva (sin el abs
+        del cierre). Al ser lineal sirve igual para valores y pendientes, y
+        opera sobre el último eje para aceptar una fila por candidato.
+        """
+        moce = self.tasa_costo_capital_mensual * valor_presente_prospectivo(
+            saldo_reserva * self.factor_margen_reserva, self.tasa_interes_mensual
+        )
+
+        # Margen de solvencia e ingresos por inversiones
+        reserva_fin_año = saldo_reserva + moce
+        margen_solvencia = reserva_fin_año * self.margen_solvencia_reserva
+        varianza_margen_solvencia = np.concatenate(
+            (
+                margen_solvencia[..., :1],
+                np.diff(margen_solvencia, axis=-1),
+                -margen_solvencia[..., -1:],
+            ),
+            axis=-1,
+        )
+        ingreso_inversiones = reserva_fin_año * self.tasa_inversion_mensual
+        ingreso_inversiones_margen_solvencia = (
+            margen_solvencia * self.tasa_inversion_mensual
+        )
+
+        # Variación de reserva (saldo + MOCE)
+        varianza_reserva = -np.concatenate(
+            (
+                saldo_reserva[..., :1],
+                np.diff(saldo_reserva, axis=-1),
+                saldo_reserva[..., -1:],
+            ),
+            axis=-1,
+        )
+        varianza_moce = -np.concatenate(
+            (moce[..., :1], np.diff(moce, axis=-1), moce[..., -1:]), axis=-1
+        )
+
+        return {
+            "moce": moce,
+            "reserva_fin_año": reserva_fin_año,
+            "margen_solvencia": margen_solvencia,
+            "varianza_margen_solvencia": varianza_margen_solvencia,
+            "ingreso_inversiones": ingreso_inversiones,
+            "ingreso_inversiones_margen_solvencia": ingreso_inversiones_margen_solvencia,
+            "ingreso_total_inversiones": (
+                ingreso_inversiones + ingreso_inversiones_margen_solvencia
+            ),
+            "varianza_reserva": varianza_reserva,
+            "varianza_moce": varianza_moce,
+            "variacion_reserva": varianza_reserva + varianza_moce,
+        }
+
+
+class _Tramo:
+    """
+    Intervalo de desplazamiento t alrededor del porcentaje evaluado en el que
+    todas las ramas de max/abs se mantienen. En un empate (x = 0) se toma la
+    rama de la derecha, de modo que el tramo siempre incluye t >= 0 pequeño.
+    """
+
+    def __init__(self):
+        self.inicio = -math.inf
+        self.fin = math.inf
+
+    def rama(self, x: np.ndarray, dx: np.ndarray) -> np.ndarray:
+        """Máscara de x > 0 (rama positiva) y acota el tramo donde no cambia"""
+        positivo = (x > 0) | ((x == 0) & (dx > 0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cruce = -x / dx
+        hacia_arriba = np.where(positivo, dx < 0, dx > 0)
+        hacia_abajo = np.where(positivo, dx > 0, dx < 0)
+        if hacia_arriba.any():
+            self.fin = min(self.fin, float(cruce[hacia_arriba].min()))
+        if hacia_abajo.any():
+            self.inicio = max(self.inicio, float(cruce[hacia_abajo].max()))
+        return positivo
+
+    def signo(self, x: np.ndarray, dx: np.ndarray) -> np.ndarray:
+        """Signo de x para abs(x), acotando el tramo donde no cambia"""
+        return np.where(self.rama(x, dx), 1.0, -1.0)
@@ -3,18 +3,25 @@ Producto RUMBO optimizado con mejor arquitectura.
 Separación de responsabilidades y código mucho más legible.
 """
 
-from src.helpers.TREA import calcular_trea
+from typing import Optional
+from src.core.config import settings
+from src.core.constants import COTIZACION_RUMBO
+from src.helpers.buscador_raiz import Rejilla, obtener_buscador_raiz
+from src.helpers.trea import calcular_trea
 from src.utils.frecuencia_meses import frecuencia_meses
 from src.models.products.rumbo.evaluador_rumbo import (
     ParametrosOptimizacion,
     EvaluadorVNA,
     OptimizadorBiseccion,
 )
-from src.services.expuestos_mes_service import ExpuestosMesService
-from src.services.gastos_service import GastosService
-from src.services.flujo_resultado_service import FlujoResultadoService
+from src.models.products.rumbo.buscador_lineal_por_tramos import LinealPorTramos
+from src.models.products.rumbo.motor_actuarial import MotorActuarial
+from src.models.products.rumbo.memoria_optimos import (
+    MemoriaOptimos,
+    PerfilOptimizacion,
+    memoria_optimos as memoria_optimos_global,
+)
 from src.services.reserva_service import ReservaService
-from src.services.margen_solvencia_service import MargenSolvenciaService
 
 
 class Rumbo:
@@ -25,18 +32,27 @@ class Rumbo:
 
     def __init__(
         self,
-        expuestos_mes_service: ExpuestosMesService,
-        flujo_resultado_service: FlujoResultadoService,
-        gastos_service: GastosService,
         reserva_service: ReservaService,
-        margen_solvencia_service: MargenSolvenciaService,
+        metodo_optimizacion: Optional[str] = None,
+        memoria_optimos: Optional[MemoriaOptimos] = None,
     ):
         # ✅ CORRECTO - Atributos directos con type safety
-        self.expuestos_mes_service = expuestos_mes_service
-        self.flujo_resultado_service = flujo_resultado_service
-        self.gastos_service = gastos_service
         self.reserva_service = reserva_service
-        self.margen_solvencia_service = margen_solvencia_service
+        self.metodo_optimizacion = (
+            metodo_optimizacion or settings.metodo_optimizacion(COTIZACION_RUMBO)
+        ).strip().lower()
+        # Los buscadores lineal por tramos y de rejilla se construyen por
+        # cotización porque necesitan el evaluador compilado; el resto se
+        # instancia una vez
+        self.buscador_raiz = (
+            None
+            if self.metodo_optimizacion in (LinealPorTramos.nombre, Rejilla.nombre)
+            else obtener_buscador_raiz(self.metodo_optimizacion)
+        )
+        # Óptimos recientes para el arranque tibio del optimizador
+        if memoria_optimos is None and settings.OPTIMIZACION_ARRANQUE_TIBIO:
+            memoria_optimos = memoria_optimos_global
+        self.memoria_optimos = memoria_optimos
 
     def calcular_porcentaje_devolucion_optimo(
         self,
@@ -44,7 +60,6 @@ class Rumbo:
         parametros_almacenados,
         tasas_interes_data,
         prima,
-        flujo_resultado_service,
         parametros_calculados,
         periodo_vigencia,
         periodo_pago_primas,
@@ -67,13 +82,15 @@ class Rumbo:
         comision=None,  # Ahora opcional, se calcula internamente
         IR=None,  # Ahora opcional, se calcula internamente
         utilidad_pre_pi_ms=None,  # Ahora opcional, se calcula internamente
+        motor_actuarial: Optional[MotorActuarial] = None,
     ) -> float:
         """
         Método optimizado que ahora tiene solo 15 líneas en lugar de 200+.
         Toda la complejidad se movió a clases especializadas.
 
         Los parámetros adicionales se mantienen para compatibilidad hacia atrás,
-        pero ahora son opcionales ya que se calculan internamente.
+        pero ahora son opcionales ya que se calculan internamente. Si se entrega
+        el motor actuarial ya construido para la cotización, se reutiliza.
         """
         # 1. Preparar parámetros de optimización
         params = ParametrosOptimizacion(
@@ -83,22 +100,37 @@ class Rumbo:
             periodo_vigencia=periodo_vigencia,
             periodo_pago_primas=periodo_pago_primas,
             prima=prima,
-            flujo_resultado_service=flujo_resultado_service,
         )
 
         # 2. Crear evaluador VNA especializado
-        servicios = {
-            "expuestos_mes": self.expuestos_mes_service,
-            "flujo_resultado": self.flujo_resultado_service,
-            "gastos": self.gastos_service,
-            "reserva": self.reserva_service,
-            "margen_solvencia": self.margen_solvencia_service,
-        }
-        evaluador = EvaluadorVNA(params, servicios)
+        evaluador = EvaluadorVNA(params, motor_actuarial)
 
         # 3. Ejecutar optimización con algoritmo separado
-        optimizador = OptimizadorBiseccion(evaluador.evaluar)
-        resultado = optimizador.optimizar()
+        evaluador_lote = None
+        if self.metodo_optimizacion == Rejilla.nombre:
+            # Intervalo y refinamiento evaluados en lote
+            evaluador_lote = evaluador.evaluar_many
+            buscador_raiz = Rejilla(evaluador_lote)
+        else:
+            buscador_raiz = self.buscador_raiz or LinealPorTramos(evaluador.motor)
+        optimizador = OptimizadorBiseccion(
+            evaluador.evaluar, buscador_raiz, evaluador_lote=evaluador_lote
+        )
+        if self.memoria_optimos is None:
+            resultado = optimizador.optimizar()
+        else:
+            perfil = PerfilOptimizacion.desde_input(
+                cotizacion_input, periodo_vigencia, periodo_pago_primas
+            )
+            resultado = optimizador.optimizar(
+                self.memoria_optimos.intervalo_sugerido(perfil)
+            )
+            self.memoria_optimos.registrar(
+                perfil,
+                resultado.porcentaje_optimo,
+                resultado.convergio,
+                resultado.arranque_tibio,
+            )
 
         # 4. Retornar porcentaje óptimo
         return resultado.porcentaje_optimo
@@ -45,6 +45,11 @@ class ProyeccionActuarialInput(BaseModel):
     )
 
 
+class FormatoProyeccion(str, Enum):
+    FILAS = "filas"
+    COLUMNAS = "columnas"
+
+
 class ResultadoMensualOutput(BaseModel):
     mes: int
     anio_poliza: int
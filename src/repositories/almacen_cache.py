@@ -0,0 +1,514 @@
+"""
+Almacenes de caché intercambiables: en memoria del proceso, SQLite (compartido
+entre procesos de un mismo host) y Redis (compartido entre instancias).
+
+Todos guardan bytes bajo claves de texto con un tiempo de vida opcional. Un
+almacén compartido nunca debe romper una cotización: los errores de conexión
+o de la base se cuentan y se tratan como fallos de caché.
+"""
+
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+from urllib.parse import unquote, urlparse
+
+from src.core.config import settings
+from src.helpers.version_assets import RUTA_ASSETS
+
+
+class AlmacenCache(ABC):
+    """Interfaz común de los almacenes de caché"""
+
+    nombre: str = ""
+
+    @abstractmethod
+    def obtener(self, clave: str) -> Optional[bytes]:
+        """Valor guardado bajo la clave, o None si no existe o expiró"""
+        pass
+
+    @abstractmethod
+    def guardar(
+        self, clave: str, valor: bytes, ttl_segundos: Optional[float] = None
+    ) -> None:
+        """Guarda el valor; sin ttl_segundos no expira por tiempo"""
+        pass
+
+    @abstractmethod
+    def eliminar(self, clave: str) -> None:
+        """Elimina la clave si existe"""
+        pass
+
+    @abstractmethod
+    def limpiar(self) -> None:
+        """Elimina todas las claves del almacén"""
+        pass
+
+    @abstractmethod
+    def estadisticas(self) -> Dict[str, Any]:
+        """Tamaño, límites y contadores propios del almacén"""
+        pass
+
+
+class AlmacenMemoria(AlmacenCache):
+    """LRU en memoria del proceso, acotado por cantidad de entradas"""
+
+    nombre = "memoria"
+
+    def __init__(
+        self,
+        tamano_maximo: int = 1024,
+        reloj: Callable[[], float] = time.monotonic,
+    ):
+        self.tamano_maximo = tamano_maximo
+        self._reloj = reloj
+        self._entradas: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._contadores = dict.fromkeys(("desalojos", "expirados"), 0)
+
+    def obtener(self, clave: str) -> Optional[bytes]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            valor, expira = entrada
+            if expira is not None and self._reloj() >= expira:
+                del self._entradas[clave]
+                self._contadores["expirados"] += 1
+                return None
+            self._entradas.move_to_end(clave)
+            return valor
+
+    def guardar(
+        self, clave: str, valor: bytes, ttl_segundos: Optional[float] = None
+    ) -> None:
+        if self.tamano_maximo <= 0:
+            return
+        expira = self._reloj() + ttl_segundos if ttl_segundos is not None else None
+        with self._lock:
+            self._entradas[clave] = (valor, expira)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.tamano_maximo:
+                self._entradas.popitem(last=False)
+                self._contadores["desalojos"] += 1
+
+    def eliminar(self, clave: str) -> None:
+        with self._lock:
+            self._entradas.pop(clave, None)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tamano": len(self._entradas),
+                "tamano_maximo": self.tamano_maximo,
+                **self._contadores,
+            }
+
+
+class AlmacenSQLite(AlmacenCache):
+    """
+    Almacén en un archivo SQLite, compartido por los procesos de un host.
+
+    Cada espacio (ej: "cotizaciones") ocupa sus propias filas de la misma
+    tabla. Al superar el tamaño máximo se desalojan las entradas guardadas
+    hace más tiempo; la limpieza se hace cada cierta cantidad de escrituras
+    para no pagarla en cada una. Usa el reloj de pared, común a los procesos.
+    """
+
+    nombre = "sqlite"
+
+    ESCRITURAS_POR_LIMPIEZA = 64
+
+    def __init__(
+        self,
+        ruta: Union[str, Path],
+        espacio: str = "",
+        tamano_maximo: int = 100_000,
+        tiempo_espera_segundos: float = 5.0,
+        reloj: Callable[[], float] = time.time,
+    ):
+        self.ruta = Path(ruta)
+        self.espacio = espacio
+        self.tamano_maximo = tamano_maximo
+        self.tiempo_espera_segundos = tiempo_espera_segundos
+        self._reloj = reloj
+        self._conexion: Optional[sqlite3.Connection] = None
+        self._escrituras = 0
+        self._lock = threading.Lock()
+        self._contadores = dict.fromkeys(("desalojos", "expirados", "errores"), 0)
+
+    def obtener(self, clave: str) -> Optional[bytes]:
+        with self._lock:
+            try:
+                fila = self._conectar().execute(
+                    "SELECT valor, expira FROM cache WHERE espacio = ? AND clave = ?",
+                    (self.espacio, clave),
+                ).fetchone()
+                if fila is None:
+                    return None
+                valor, expira = fila
+                if expira is not None and self._reloj() >= expira:
+                    self._conectar().execute(
+                        "DELETE FROM cache WHERE espacio = ? AND clave = ?",
+                        (self.espacio, clave),
+                    )
+                    self._contadores["expirados"] += 1
+                    return None
+                return bytes(valor)
+            except (sqlite3.Error, OSError) as e:
+                self._registrar_error(e)
+                return None
+
+    def guardar(
+        self, clave: str, valor: bytes, ttl_segundos: Optional[float] = None
+    ) -> None:
+        if self.tamano_maximo <= 0:
+            return
+        ahora = self._reloj()
+        expira = ahora + ttl_segundos if ttl_segundos is not None else None
+        with self._lock:
+            try:
+                conexion = self._conectar()
+                conexion.execute(
+                    "INSERT OR REPLACE INTO cache (espacio, clave, valor, expira, guardado) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.espacio, clave, sqlite3.Binary(valor), expira, ahora),
+                )
+                self._escrituras += 1
+                if self._escrituras % self.ESCRITURAS_POR_LIMPIEZA == 0:
+                    self._limpiar_excedentes(conexion, ahora)
+            except (sqlite3.Error, OSError) as e:
+                self._registrar_error(e)
+
+    def eliminar(self, clave: str) -> None:
+        with self._lock:
+            try:
+                self._conectar().execute(
+                    "DELETE FROM cache WHERE espacio = ? AND clave = ?",
+                    (self.espacio, clave),
+                )
+            except (sqlite3.Error, OSError) as e:
+                self._registrar_error(e)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            try:
+                self._conectar().execute(
+                    "DELETE FROM cache WHERE espacio = ?", (self.espacio,)
+                )
+            except (sqlite3.Error, OSError) as e:
+                self._registrar_error(e)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            try:
+                (tamano,) = self._conectar().execute(
+                    "SELECT COUNT(*) FROM cache WHERE espacio = ?", (self.espacio,)
+                ).fetchone()
+            except (sqlite3.Error, OSError) as e:
+                self._registrar_error(e)
+                tamano = None
+            return {
+                "tamano": tamano,
+                "tamano_maximo": self.tamano_maximo,
+                **self._contadores,
+            }
+
+    def _conectar(self) -> sqlite3.Connection:
+        if self._conexion is None:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            conexion = sqlite3.connect(
+                self.ruta,
+                timeout=self.tiempo_espera_segundos,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            try:
+                conexion.execute("PRAGMA journal_mode=WAL")
+                conexion.execute("PRAGMA synchronous=NORMAL")
+                conexion.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    "espacio TEXT NOT NULL, clave TEXT NOT NULL, valor BLOB NOT NULL, "
+                    "expira REAL, guardado REAL NOT NULL, PRIMARY KEY (espacio, clave))"
+                )
+                conexion.execute(
+                    "CREATE INDEX IF NOT EXISTS cache_guardado ON cache (espacio, guardado)"
+                )
+            except sqlite3.Error:
+                conexion.close()
+                raise
+            self._conexion = conexion
+        return self._conexion
+
+    def _limpiar_excedentes(self, conexion: sqlite3.Connection, ahora: float) -> None:
+        expirados = conexion.execute(
+            "DELETE FROM cache WHERE espacio = ? AND expira IS NOT NULL AND expira <= ?",
+            (self.espacio, ahora),
+        ).rowcount
+        self._contadores["expirados"] += max(expirados, 0)
+        (tamano,) = conexion.execute(
+            "SELECT COUNT(*) FROM cache WHERE espacio = ?", (self.espacio,)
+        ).fetchone()
+        exceso = tamano - self.tamano_maximo
+        if exceso > 0:
+            desalojados = conexion.execute(
+                "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache "
+                "WHERE espacio = ? ORDER BY guardado LIMIT ?)",
+                (self.espacio, exceso),
+            ).rowcount
+            self._contadores["desalojos"] += max(desalojados, 0)
+
+    def _registrar_error(self, error: Exception) -> None:
+        self._contadores["errores"] += 1
+        print(f"Error en la caché SQLite {self.ruta}: {error}")
+
+
+class ErrorResp(Exception):
+    """Respuesta de error de un servidor Redis"""
+
+
+class ClienteResp:
+    """
+    Cliente mínimo del protocolo de Redis (RESP) sobre un socket TCP.
+    Envía comandos como arreglos de cadenas y lee respuestas de tipo simple,
+    error, entero, cadena y arreglo. Reconecta en el siguiente comando si la
+    conexión se pierde o queda desincronizada (un error dentro de un arreglo).
+    Se verifica contra un servidor falso con python -m benchmarks.almacen_redis.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        puerto: int = 6379,
+        base_datos: int = 0,
+        contrasena: Optional[str] = None,
+        tiempo_espera_segundos: float = 0.5,
+    ):
+        self.host = host
+        self.puerto = puerto
+        self.base_datos = base_datos
+        self.contrasena = contrasena
+        self.tiempo_espera_segundos = tiempo_espera_segundos
+        self._socket: Optional[socket.socket] = None
+        self._lectura = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde_url(cls, url: str, tiempo_espera_segundos: float = 0.5) -> "ClienteResp":
+        """Crea el cliente desde una URL redis://[:contraseña@]host[:puerto][/base]"""
+        partes = urlparse(url)
+        if partes.scheme != "redis":
+            raise ValueError(f"URL de Redis no soportada: {url}")
+        ruta = partes.path.lstrip("/")
+        return cls(
+            host=partes.hostname or "localhost",
+            puerto=partes.port or 6379,
+            base_datos=int(ruta) if ruta else 0,
+            contrasena=unquote(partes.password) if partes.password else None,
+            tiempo_espera_segundos=tiempo_espera_segundos,
+        )
+
+    def ejecutar(self, *argumentos: Union[str, bytes, int, float]) -> Any:
+        """
+        Ejecuta un comando y retorna su respuesta.
+
+        Raises:
+            ErrorResp: Si el servidor responde con un error
+            OSError: Si falla la conexión (se cierra y se reabre en el próximo comando)
+        """
+        with self._lock:
+            if self._socket is None:
+                try:
+                    self._conectar()
+                except (OSError, ErrorResp):
+                    self.cerrar()
+                    raise
+            try:
+                self._enviar(argumentos)
+                return self._leer()
+            except OSError:
+                self.cerrar()
+                raise
+
+    def cerrar(self) -> None:
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            finally:
+                self._socket = None
+                self._lectura = None
+
+    def _conectar(self) -> None:
+        self._socket = socket.create_connection(
+            (self.host, self.puerto), timeout=self.tiempo_espera_segundos
+        )
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._lectura = self._socket.makefile("rb")
+        if self.contrasena:
+            self._enviar(("AUTH", self.contrasena))
+            self._leer()
+        if self.base_datos:
+            self._enviar(("SELECT", self.base_datos))
+            self._leer()
+
+    def _enviar(self, argumentos) -> None:
+        partes = [b"*%d\r\n" % len(argumentos)]
+        for argumento in argumentos:
+            if isinstance(argumento, bytes):
+                datos = argumento
+            else:
+                datos = str(argumento).encode("utf-8")
+            partes.append(b"$%d\r\n%s\r\n" % (len(datos), datos))
+        self._socket.sendall(b"".join(partes))
+
+    def _leer(self) -> Any:
+        linea = self._lectura.readline()
+        if not linea.endswith(b"\r\n"):
+            raise ConnectionError("Conexión con Redis cerrada")
+        tipo, contenido = linea[:1], linea[1:-2]
+        if tipo in (b":", b"$", b"*") and not contenido.lstrip(b"-").isdigit():
+            raise ConnectionError(f"Respuesta de Redis no reconocida: {linea!r}")
+        if tipo == b"+":
+            return contenido.decode("utf-8")
+        if tipo == b"-":
+            raise ErrorResp(contenido.decode("utf-8"))
+        if tipo == b":":
+            return int(contenido)
+        if tipo == b"$":
+            largo = int(contenido)
+            if largo < 0:
+                return None
+            datos = self._lectura.read(largo + 2)
+            if len(datos) != largo + 2:
+                raise ConnectionError("Conexión con Redis cerrada")
+            return datos[:-2]
+        if tipo == b"*":
+            largo = int(contenido)
+            if largo < 0:
+                return None
+            elementos = []
+            for _ in range(largo):
+                try:
+                    elementos.append(self._leer())
+                except ErrorResp:
+                    # El resto del arreglo queda sin leer y la conexión ya no
+                    # corresponde con los comandos: se cierra
+                    self.cerrar()
+                    raise
+            return elementos
+        raise ConnectionError(f"Respuesta de Redis no reconocida: {linea!r}")
+
+
+class AlmacenRedis(AlmacenCache):
+    """
+    Almacén en un servidor Redis (o compatible), compartido entre instancias.
+    Las claves llevan el prefijo del espacio; el tamaño lo acota la política
+    de memoria del servidor (ej: maxmemory-policy allkeys-lru).
+    """
+
+    nombre = "redis"
+
+    def __init__(self, cliente: ClienteResp, espacio: str = ""):
+        self.cliente = cliente
+        self.prefijo = f"{espacio}:" if espacio else ""
+        self._lock = threading.Lock()
+        self._contadores = dict.fromkeys(("errores",), 0)
+
+    def obtener(self, clave: str) -> Optional[bytes]:
+        try:
+            return self.cliente.ejecutar("GET", self.prefijo + clave)
+        except (OSError, ErrorResp) as e:
+            self._registrar_error(e)
+            return None
+
+    def guardar(
+        self, clave: str, valor: bytes, ttl_segundos: Optional[float] = None
+    ) -> None:
+        argumentos: List[Any] = ["SET", self.prefijo + clave, valor]
+        if ttl_segundos is not None:
+            argumentos += ["PX", max(int(ttl_segundos * 1000), 1)]
+        try:
+            self.cliente.ejecutar(*argumentos)
+        except (OSError, ErrorResp) as e:
+            self._registrar_error(e)
+
+    def eliminar(self, clave: str) -> None:
+        try:
+            self.cliente.ejecutar("DEL", self.prefijo + clave)
+        except (OSError, ErrorResp) as e:
+            self._registrar_error(e)
+
+    def limpiar(self) -> None:
+        """Elimina las claves del espacio recorriéndolas con SCAN"""
+        try:
+            cursor = b"0"
+            while True:
+                cursor, claves = self.cliente.ejecutar(
+                    "SCAN", cursor, "MATCH", self.prefijo + "*", "COUNT", 500
+                )
+                if claves:
+                    self.cliente.ejecutar("DEL", *claves)
+                if cursor in (b"0", "0"):
+                    break
+        except (OSError, ErrorResp) as e:
+            self._registrar_error(e)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._contadores)
+
+    def _registrar_error(self, error: Exception) -> None:
+        with self._lock:
+            self._contadores["errores"] += 1
+        print(f"Error en la caché Redis {self.cliente.host}:{self.cliente.puerto}: {error}")
+
+
+ALMACENES_CACHE: Dict[str, Type[AlmacenCache]] = {
+    AlmacenMemoria.nombre: AlmacenMemoria,
+    AlmacenSQLite.nombre: AlmacenSQLite,
+    AlmacenRedis.nombre: AlmacenRedis,
+}
+
+
+def obtener_almacen_cache(espacio: str, tamano_maximo: int) -> AlmacenCache:
+    """
+    Crea el almacén configurado en settings (CACHE_ALMACEN) para un espacio
+    de claves.
+
+    Args:
+        espacio: Nombre del espacio (ej: "cotizaciones")
+        tamano_maximo: Máximo de entradas, en los almacenes que lo aplican
+
+    Raises:
+        ValueError: Si el almacén no está registrado
+    """
+    nombre = settings.CACHE_ALMACEN.strip().lower()
+    if nombre not in ALMACENES_CACHE:
+        disponibles = ", ".join(ALMACENES_CACHE)
+        raise ValueError(
+            f"Almacén de caché no soportado: {settings.CACHE_ALMACEN}. "
+            f"Disponibles: {disponibles}"
+        )
+
+    if nombre == AlmacenSQLite.nombre:
+        ruta = Path(settings.CACHE_SQLITE_RUTA)
+        if not ruta.is_absolute():
+            ruta = RUTA_ASSETS.parent / ruta
+        return AlmacenSQLite(ruta, espacio=espacio, tamano_maximo=tamano_maximo)
+    if nombre == AlmacenRedis.nombre:
+        cliente = ClienteResp.desde_url(
+            settings.CACHE_REDIS_URL,
+            tiempo_espera_segundos=settings.CACHE_REDIS_TIEMPO_ESPERA_SEGUNDOS,
+        )
+        return AlmacenRedis(cliente, espacio=f"{settings.CACHE_PREFIJO}:{espacio}")
+    return AlmacenMemoria(tamano_maximo=tamano_maximo)
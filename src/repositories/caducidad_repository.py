@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-import json
 import os
 from typing import Dict, Any, List, Optional
 from pathlib import Path
+from src.repositories.registro_datos_referencia import (
+    RegistroDatosReferencia,
+    registro_para,
+)
 
 
 class CaducidadRepository(ABC):
@@ -37,13 +40,19 @@ class CaducidadRepository(ABC):
 class JsonCaducidadRepository(CaducidadRepository):
     """Implementación del repositorio de caducidad usando archivo JSON"""
     
-    def __init__(self, base_path: str = None, producto: str = "rumbo"):
+    def __init__(
+        self,
+        base_path: str = None,
+        producto: str = "rumbo",
+        registro: Optional[RegistroDatosReferencia] = None,
+    ):
         """
         Inicializa el repositorio de caducidad
         
         Args:
             base_path: Ruta base para los archivos JSON (optional)
             producto: Nombre del producto (default: "rumbo")
+            registro: Registro de datos de referencia (por defecto el compartido)
         """
         if base_path:
             self.base_path = Path(base_path)
@@ -53,58 +62,30 @@ class JsonCaducidadRepository(CaducidadRepository):
         
         self.caducidad_path = self.base_path / "caducidad.json"
         self.caducidad_mensual_path = self.base_path / "caducidad_mensual.json"
-        self._cache = None
-        self._cache_mensual = None
-    
+
+        # Los datos se leen una sola vez por versión en el registro compartido
+        self.producto = self.base_path.name
+        self.registro = registro or registro_para(
+            self.base_path.parent if base_path else None
+        )
+
     def get_caducidad_data(self) -> List[Dict[str, Any]]:
         """
-        Carga los datos de caducidad desde el archivo JSON
+        Obtiene los datos de caducidad del registro compartido de datos de referencia
         Retorna todo el contenido como una lista de diccionarios
         """
-        # Si ya está en caché, devolver directamente
-        if self._cache is not None:
-            return self._cache
-        
-        if not self.caducidad_path.exists():
-            self._cache = []
-            return []
-        
-        try:
-            with open(self.caducidad_path, "r", encoding="utf-8") as f:
-                caducidad_data = json.load(f)
-                self._cache = caducidad_data
-                return caducidad_data
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error al cargar datos de caducidad: {e}")
-            self._cache = []
-            return []
-    
+        return self.registro.obtener(self.producto).archivo("caducidad", [])
+
     def get_caducidad_mensual_data(self) -> Dict[str, Any]:
         """
-        Carga los datos de caducidad mensual desde el archivo JSON
+        Obtiene los datos de caducidad mensual del registro compartido de datos de referencia
         Retorna todo el contenido como un diccionario
         
         Returns:
             Diccionario con los datos de caducidad mensual
         """
-        # Si ya está en caché, devolver directamente
-        if self._cache_mensual is not None:
-            return self._cache_mensual
-        
-        if not self.caducidad_mensual_path.exists():
-            self._cache_mensual = {}
-            return {}
-        
-        try:
-            with open(self.caducidad_mensual_path, "r", encoding="utf-8") as f:
-                caducidad_data = json.load(f)
-                self._cache_mensual = caducidad_data
-                return caducidad_data
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error al cargar datos de caducidad mensual: {e}")
-            self._cache_mensual = {}
-            return {}
-    
+        return self.registro.obtener(self.producto).archivo("caducidad_mensual", {})
+
     def get_caducidad_by_anio(self, anio: int) -> Dict[str, Any]:
         """
         Obtiene los datos de caducidad para un año específico
@@ -191,8 +172,7 @@ class JsonCaducidadRepository(CaducidadRepository):
     
     def limpiar_cache(self):
         """Limpia la caché de datos de caducidad"""
-        self._cache = None
-        self._cache_mensual = None
+        self.registro.invalidar(self.producto)
 
 
 # Instancia global del repositorio
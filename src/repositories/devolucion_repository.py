@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-import json
 import os
 from typing import Dict, Any, List, Optional
 from pathlib import Path
+from src.repositories.registro_datos_referencia import (
+    RegistroDatosReferencia,
+    registro_para,
+)
 
 
 class DevolucionRepository(ABC):
@@ -27,13 +30,19 @@ class DevolucionRepository(ABC):
 class JsonDevolucionRepository(DevolucionRepository):
     """Implementación del repositorio de devolución usando archivo JSON"""
     
-    def __init__(self, base_path: str = None, producto: str = "rumbo"):
+    def __init__(
+        self,
+        base_path: str = None,
+        producto: str = "rumbo",
+        registro: Optional[RegistroDatosReferencia] = None,
+    ):
         """
         Inicializa el repositorio de devolución
         
         Args:
             base_path: Ruta base para los archivos JSON (optional)
             producto: Nombre del producto (default: "rumbo")
+            registro: Registro de datos de referencia (por defecto el compartido)
         """
         if base_path:
             self.base_path = Path(base_path)
@@ -42,31 +51,20 @@ class JsonDevolucionRepository(DevolucionRepository):
             self.base_path = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "assets" / producto.lower()
         
         self.devolucion_path = self.base_path / "devolucion.json"
-        self._cache = None
-    
+
+        # Los datos se leen una sola vez por versión en el registro compartido
+        self.producto = self.base_path.name
+        self.registro = registro or registro_para(
+            self.base_path.parent if base_path else None
+        )
+
     def get_devolucion_data(self) -> List[Dict[str, Any]]:
         """
-        Carga los datos de devolución desde el archivo JSON
+        Obtiene los datos de devolución del registro compartido de datos de referencia
         Retorna todo el contenido como una lista de diccionarios
         """
-        # Si ya está en caché, devolver directamente
-        if self._cache is not None:
-            return self._cache
-        
-        if not self.devolucion_path.exists():
-            self._cache = []
-            return []
-        
-        try:
-            with open(self.devolucion_path, "r", encoding="utf-8") as f:
-                devolucion_data = json.load(f)
-                self._cache = devolucion_data
-                return devolucion_data
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error al cargar datos de devolución: {e}")
-            self._cache = []
-            return []
-    
+        return self.registro.obtener(self.producto).archivo("devolucion", [])
+
     def get_devolucion_by_anio_poliza(self, anio_poliza: int) -> Dict[str, Any]:
         """
         Obtiene los datos de devolución para un año específico de póliza
@@ -119,7 +117,7 @@ class JsonDevolucionRepository(DevolucionRepository):
     
     def limpiar_cache(self):
         """Limpia la caché de devolución (útil para pruebas)"""
-        self._cache = None
+        self.registro.invalidar(self.producto)
 
 
 # Instancia global del repositorio
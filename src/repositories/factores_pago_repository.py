@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pathlib import Path
+from src.repositories.registro_datos_referencia import (
+    RegistroDatosReferencia,
+    registro_para,
+)
 from src.common.frecuencia_pago import FrecuenciaPago
 
 
@@ -23,13 +26,19 @@ class FactoresPagoRepository(ABC):
 class JsonFactoresPagoRepository(FactoresPagoRepository):
     """Implementación del repositorio de factores de pago usando archivo JSON"""
 
-    def __init__(self, base_path: str = None, producto: str = "rumbo"):
+    def __init__(
+        self,
+        base_path: str = None,
+        producto: str = "rumbo",
+        registro: Optional[RegistroDatosReferencia] = None,
+    ):
         """
         Inicializa el repositorio de factores de pago
 
         Args:
             base_path: Ruta base para los archivos JSON (optional)
             producto: Nombre del producto (default: "rumbo")
+            registro: Registro de datos de referencia (por defecto el compartido)
         """
         if base_path:
             self.base_path = Path(base_path)
@@ -38,30 +47,19 @@ class JsonFactoresPagoRepository(FactoresPagoRepository):
             self.base_path = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "assets" / producto.lower()
 
         self.factores_pago_path = self.base_path / "factores_pago.json"
-        self._cache = None
+
+        # Los datos se leen una sola vez por versión en el registro compartido
+        self.producto = self.base_path.name
+        self.registro = registro or registro_para(
+            self.base_path.parent if base_path else None
+        )
 
     def get_factores_pago(self) -> Dict[str, float]:
         """
-        Carga los factores de pago desde el archivo JSON
+        Obtiene los factores de pago del registro compartido de datos de referencia
         Retorna todo el contenido como un diccionario
         """
-        # Si ya está en caché, devolver directamente
-        if self._cache is not None:
-            return self._cache
-
-        if not self.factores_pago_path.exists():
-            self._cache = {}
-            return {}
-
-        try:
-            with open(self.factores_pago_path, "r", encoding="utf-8") as f:
-                factores = json.load(f)
-                self._cache = factores
-                return factores
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error al cargar factores de pago: {e}")
-            self._cache = {}
-            return {}
+        return self.registro.obtener(self.producto).archivo("factores_pago", {})
 
     def get_factor_pago(self, frecuencia: FrecuenciaPago) -> float:
         """
@@ -81,7 +79,7 @@ class JsonFactoresPagoRepository(FactoresPagoRepository):
 
     def limpiar_cache(self):
         """Limpia la caché de factores de pago"""
-        self._cache = None
+        self.registro.invalidar(self.producto)
 
 
 # Instancia global del repositorio
@@ -3,6 +3,10 @@ import json
 import os
 from typing import Dict, Any, Optional, List
 from pathlib import Path
+from src.repositories.registro_datos_referencia import (
+    RegistroDatosReferencia,
+    registro_para,
+)
 
 
 class ParametrosRepository(ABC):
@@ -27,12 +31,17 @@ class ParametrosRepository(ABC):
 class JsonParametrosRepository(ParametrosRepository):
     """Implementación del repositorio de parámetros usando archivos JSON"""
     
-    def __init__(self, base_path: str = None):
+    def __init__(
+        self,
+        base_path: str = None,
+        registro: Optional[RegistroDatosReferencia] = None,
+    ):
         """
         Inicializa el repositorio de parámetros
         
         Args:
             base_path: Ruta base para los archivos JSON (optional)
+            registro: Registro de datos de referencia (por defecto el compartido)
         """
         if base_path:
             self.base_path = Path(base_path)
@@ -40,8 +49,8 @@ class JsonParametrosRepository(ParametrosRepository):
             # Ruta por defecto: raíz del proyecto / assets
             self.base_path = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "assets"
         
-        # Cache para evitar múltiples lecturas de disco
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        # Los datos se leen una sola vez por versión en el registro compartido
+        self.registro = registro or registro_para(self.base_path if base_path else None)
     
     def _get_parametros_path(self, producto: str) -> Path:
         """Obtiene la ruta al archivo de parámetros para un producto"""
@@ -49,34 +58,10 @@ class JsonParametrosRepository(ParametrosRepository):
     
     def _cargar_parametros(self, producto: str) -> Dict[str, Any]:
         """
-        Carga los parámetros desde el archivo JSON
+        Obtiene los parámetros del registro compartido de datos de referencia
         Simula una consulta a la base de datos
         """
-        producto = producto.lower()
-        
-        # Si ya está en caché, devolver directamente
-        if producto in self._cache:
-            return self._cache[producto]
-        
-        # Simular latencia de base de datos (opcional, para pruebas)
-        # import time
-        # time.sleep(0.1)
-        
-        parametros_path = self._get_parametros_path(producto)
-        
-        if not parametros_path.exists():
-            self._cache[producto] = {}
-            return {}
-        
-        try:
-            with open(parametros_path, "r", encoding="utf-8") as f:
-                parametros = json.load(f)
-                self._cache[producto] = parametros
-                return parametros
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error al cargar parámetros para {producto}: {e}")
-            self._cache[producto] = {}
-            return {}
+        return self.registro.obtener(producto).archivo("parametros", {})
     
     def get_parametros_by_producto(self, producto: str) -> Dict[str, Any]:
         """
@@ -99,14 +84,12 @@ class JsonParametrosRepository(ParametrosRepository):
         Simula un UPDATE parametros SET valor = ? WHERE producto = ? AND nombre = ?
         """
         producto = producto.lower()
-        parametros = self._cargar_parametros(producto)
+        # Los datos del registro son inmutables: se escribe una copia
+        parametros = dict(self._cargar_parametros(producto))
         
         # Actualizar el valor
         parametros[nombre_parametro] = valor
         
-        # Actualizar caché
-        self._cache[producto] = parametros
-        
         # Guardar en disco (simulación de COMMIT)
         parametros_path = self._get_parametros_path(producto)
         os.makedirs(parametros_path.parent, exist_ok=True)
@@ -114,6 +97,8 @@ class JsonParametrosRepository(ParametrosRepository):
         try:
             with open(parametros_path, "w", encoding="utf-8") as f:
                 json.dump(parametros, f, indent=2)
+            # Releer en la próxima consulta
+            self.registro.invalidar(producto)
             return True
         except IOError as e:
             print(f"Error al guardar parámetros para {producto}: {e}")
@@ -121,7 +106,7 @@ class JsonParametrosRepository(ParametrosRepository):
     
     def limpiar_cache(self):
         """Limpia la caché de parámetros (útil para pruebas)"""
-        self._cache = {}
+        self.registro.invalidar()
 
 
 # Instancia global del repositorio
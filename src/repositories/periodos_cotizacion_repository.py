@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-import json
 import os
 from typing import Dict, Any, List, Optional
 from pathlib import Path
+from src.repositories.registro_datos_referencia import (
+    RegistroDatosReferencia,
+    registro_para,
+)
 
 
 class PeriodosCotizacionRepository(ABC):
@@ -22,13 +25,19 @@ class PeriodosCotizacionRepository(ABC):
 class JsonPeriodosCotizacionRepository(PeriodosCotizacionRepository):
     """Implementación del repositorio de períodos de cotización usando archivo JSON"""
 
-    def __init__(self, base_path: str = None, producto: str = "rumbo"):
+    def __init__(
+        self,
+        base_path: str = None,
+        producto: str = "rumbo",
+        registro: Optional[RegistroDatosReferencia] = None,
+    ):
         """
         Inicializa el repositorio de períodos de cotización
 
         Args:
             base_path: Ruta base para los archivos JSON (optional)
             producto: Nombre del producto (default: "rumbo")
+            registro: Registro de datos de referencia (por defecto el compartido)
         """
         if base_path:
             self.base_path = Path(base_path)
@@ -37,34 +46,23 @@ class JsonPeriodosCotizacionRepository(PeriodosCotizacionRepository):
             self.base_path = (
                 Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
                 / "assets"
-                / producto.upper()
+                / producto.lower()
             )
 
         self.periodos_path = self.base_path / "periodos_cotizacion.json"
-        self._cache = None
+
+        # Los datos se leen una sola vez por versión en el registro compartido
+        self.producto = self.base_path.name
+        self.registro = registro or registro_para(
+            self.base_path.parent if base_path else None
+        )
 
     def get_periodos_cotizacion(self) -> List[Dict[str, Any]]:
         """
-        Carga los períodos de cotización desde el archivo JSON
+        Obtiene los períodos de cotización del registro compartido de datos de referencia
         Retorna todo el contenido como una lista de diccionarios
         """
-        # Si ya está en caché, devolver directamente
-        if self._cache is not None:
-            return self._cache
-
-        if not self.periodos_path.exists():
-            self._cache = []
-            return []
-
-        try:
-            with open(self.periodos_path, "r", encoding="utf-8") as f:
-                periodos = json.load(f)
-                self._cache = periodos
-                return periodos
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error al cargar períodos de cotización: {e}")
-            self._cache = []
-            return []
+        return self.registro.obtener(self.producto).archivo("periodos_cotizacion", [])
 
     def get_periodos_disponibles(self, monto_prima: float) -> List[int]:
         """
@@ -85,11 +83,11 @@ class JsonPeriodosCotizacionRepository(PeriodosCotizacionRepository):
 
             # Si el monto está dentro del rango de primas de este grupo
             if primas and min(primas) <= monto_prima <= max(primas):
-                return periodos
+                return list(periodos)
 
             # También verificar si el monto coincide exactamente con alguna prima
             if monto_prima in primas:
-                return periodos
+                return list(periodos)
 
         # Si no se encuentra ningún rango, retornar lista vacía
         return []
@@ -134,7 +132,7 @@ class JsonPeriodosCotizacionRepository(PeriodosCotizacionRepository):
 
     def limpiar_cache(self):
         """Limpia la caché de períodos de cotización"""
-        self._cache = None
+        self.registro.invalidar(self.producto)
 
 
 # Instancia global del repositorio
@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from src.helpers.version_assets import RUTA_ASSETS, version_assets
+
+
+def congelar(valor: Any) -> Any:
+    """Copia inmutable de un valor JSON: dict -> MappingProxyType, list -> tuple"""
+    if isinstance(valor, dict):
+        return MappingProxyType({clave: congelar(v) for clave, v in valor.items()})
+    if isinstance(valor, list):
+        return tuple(congelar(v) for v in valor)
+    return valor
+
+
+@dataclass(frozen=True)
+class DatosReferencia:
+    """
+    Foto inmutable de los archivos de datos de un producto para una versión
+    de sus assets. Cada archivo JSON de assets/<producto> queda indexado por
+    su nombre sin extensión (ej: "tasa_interes").
+    """
+
+    producto: str
+    version: str
+    archivos: Mapping[str, Any]
+
+    def archivo(self, nombre: str, vacio: Any = None) -> Any:
+        """Contenido de un archivo, o `vacio` si no existe o no se pudo leer"""
+        return self.archivos.get(nombre, vacio)
+
+
+class RegistroDatosReferencia:
+    """
+    Registro de datos de referencia compartido por todo el proceso.
+
+    Lee una sola vez los archivos JSON de cada producto y entrega la misma
+    foto inmutable a todos los repositorios mientras no cambie la huella de
+    sus assets, que se revisa a lo más una vez por intervalo.
+    """
+
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        intervalo_version_segundos: float = 1.0,
+        reloj: Callable[[], float] = time.monotonic,
+    ):
+        self.base_path = Path(base_path) if base_path else RUTA_ASSETS
+        self.intervalo_version_segundos = intervalo_version_segundos
+        self._reloj = reloj
+        self._datos: Dict[str, DatosReferencia] = {}
+        self._revision: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def obtener(self, producto: str, revisar: bool = False) -> DatosReferencia:
+        """
+        Foto vigente de los datos de un producto. Con revisar=True la huella
+        de los assets se revisa aunque no haya pasado el intervalo.
+        """
+        producto = producto.lower()
+        ahora = self._reloj()
+        datos = self._datos.get(producto)
+        revisado = self._revision.get(producto)
+        if (
+            not revisar
+            and datos is not None
+            and revisado is not None
+            and ahora - revisado < self.intervalo_version_segundos
+        ):
+            return datos
+
+        with self._lock:
+            datos = self._datos.get(producto)
+            version = version_assets(producto, self.base_path)
+            if datos is None or datos.version != version:
+                datos = self._cargar(producto, version)
+                self._datos[producto] = datos
+            self._revision[producto] = ahora
+            return datos
+
+    def invalidar(self, producto: Optional[str] = None) -> None:
+        """Fuerza la relectura de un producto (o de todos) en la próxima consulta"""
+        with self._lock:
+            if producto is None:
+                self._datos.clear()
+                self._revision.clear()
+            else:
+                self._datos.pop(producto.lower(), None)
+                self._revision.pop(producto.lower(), None)
+
+    def _cargar(self, producto: str, version: str) -> DatosReferencia:
+        carpeta = self.base_path / producto
+        archivos = {}
+        if carpeta.is_dir():
+            for ruta in sorted(carpeta.glob("*.json")):
+                try:
+                    with open(ruta, "r", encoding="utf-8") as f:
+                        archivos[ruta.stem] = congelar(json.load(f))
+                except (json.JSONDecodeError, IOError) as e:
+                    print(f"Error al cargar {ruta.name} para {producto}: {e}")
+        return DatosReferencia(
+            producto=producto,
+            version=version,
+            archivos=MappingProxyType(archivos),
+        )
+
+
+# Instancia global compartida por todos los repositorios
+registro_datos_referencia = RegistroDatosReferencia()
+
+
+def registro_para(base_path: Optional[Path]) -> RegistroDatosReferencia:
+    """Registro global, o uno propio si se indica otra carpeta de assets"""
+    if base_path is None:
+        return registro_datos_referencia
+    return RegistroDatosReferencia(base_path)
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-import json
 import os
 from typing import Dict, Any, List, Optional
 from pathlib import Path
+from src.repositories.registro_datos_referencia import (
+    RegistroDatosReferencia,
+    registro_para,
+)
 from enum import Enum, auto
 
 
@@ -35,13 +38,19 @@ class TablaMortalidadRepository(ABC):
 class JsonTablaMortalidadRepository(TablaMortalidadRepository):
     """Implementación del repositorio de tabla de mortalidad usando archivo JSON"""
 
-    def __init__(self, base_path: str = None, producto: str = "rumbo"):
+    def __init__(
+        self,
+        base_path: str = None,
+        producto: str = "rumbo",
+        registro: Optional[RegistroDatosReferencia] = None,
+    ):
         """
         Inicializa el repositorio de tabla de mortalidad
 
         Args:
             base_path: Ruta base para los archivos JSON (optional)
             producto: Nombre del producto (default: "rumbo")
+            registro: Registro de datos de referencia (por defecto el compartido)
         """
         if base_path:
             self.base_path = Path(base_path)
@@ -54,30 +63,19 @@ class JsonTablaMortalidadRepository(TablaMortalidadRepository):
             )
 
         self.tabla_mortalidad_path = self.base_path / "tabla_mortalidad.json"
-        self._cache = None
+
+        # Los datos se leen una sola vez por versión en el registro compartido
+        self.producto = self.base_path.name
+        self.registro = registro or registro_para(
+            self.base_path.parent if base_path else None
+        )
 
     def get_tabla_mortalidad(self) -> Dict[str, Any]:
         """
-        Carga la tabla de mortalidad desde el archivo JSON
+        Obtiene la tabla de mortalidad del registro compartido de datos de referencia
         Retorna todo el contenido como un diccionario
         """
-        # Si ya está en caché, devolver directamente
-        if self._cache is not None:
-            return self._cache
-
-        if not self.tabla_mortalidad_path.exists():
-            self._cache = {}
-            return {}
-
-        try:
-            with open(self.tabla_mortalidad_path, "r", encoding="utf-8") as f:
-                tabla_mortalidad = json.load(f)
-                self._cache = tabla_mortalidad
-                return tabla_mortalidad
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error al cargar tabla de mortalidad: {e}")
-            self._cache = {}
-            return {}
+        return self.registro.obtener(self.producto).archivo("tabla_mortalidad", {})
 
     def get_tasa_mortalidad(
         self, edad: int, sexo: Sexo, fumador: EstadoFumador
@@ -136,7 +134,7 @@ class JsonTablaMortalidadRepository(TablaMortalidadRepository):
 
     def limpiar_cache(self):
         """Limpia la caché de tabla de mortalidad"""
-        self._cache = None
+        self.registro.invalidar(self.producto)
 
 
 # Instancia global del repositorio
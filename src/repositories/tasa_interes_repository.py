@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pathlib import Path
+from src.repositories.registro_datos_referencia import (
+    RegistroDatosReferencia,
+    registro_para,
+)
 
 
 class TasaInteresRepository(ABC):
@@ -17,13 +20,19 @@ class TasaInteresRepository(ABC):
 class JsonTasaInteresRepository(TasaInteresRepository):
     """Implementación del repositorio de tasas de interés usando archivo JSON"""
     
-    def __init__(self, base_path: str = None, producto: str = "rumbo"):
+    def __init__(
+        self,
+        base_path: str = None,
+        producto: str = "rumbo",
+        registro: Optional[RegistroDatosReferencia] = None,
+    ):
         """
         Inicializa el repositorio de tasas de interés
         
         Args:
             base_path: Ruta base para los archivos JSON (optional)
             producto: Nombre del producto (default: "rumbo")
+            registro: Registro de datos de referencia (por defecto el compartido)
         """
         if base_path:
             self.base_path = Path(base_path)
@@ -32,34 +41,23 @@ class JsonTasaInteresRepository(TasaInteresRepository):
             self.base_path = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "assets" / producto.lower()
         
         self.tasas_path = self.base_path / "tasa_interes.json"
-        self._cache = None
-    
+
+        # Los datos se leen una sola vez por versión en el registro compartido
+        self.producto = self.base_path.name
+        self.registro = registro or registro_para(
+            self.base_path.parent if base_path else None
+        )
+
     def get_tasas_interes(self) -> Dict[str, Any]:
         """
-        Carga las tasas de interés desde el archivo JSON
+        Obtiene las tasas de interés del registro compartido de datos de referencia
         Retorna todo el contenido como un diccionario
         """
-        # Si ya está en caché, devolver directamente
-        if self._cache is not None:
-            return self._cache
-        
-        if not self.tasas_path.exists():
-            self._cache = {}
-            return {}
-        
-        try:
-            with open(self.tasas_path, "r", encoding="utf-8") as f:
-                tasas = json.load(f)
-                self._cache = tasas
-                return tasas
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error al cargar tasas de interés: {e}")
-            self._cache = {}
-            return {}
-    
+        return self.registro.obtener(self.producto).archivo("tasa_interes", {})
+
     def limpiar_cache(self):
         """Limpia la caché de tasas de interés"""
-        self._cache = None
+        self.registro.invalidar(self.producto)
 
 
 # Instancia global del repositorio
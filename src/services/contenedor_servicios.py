@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+
+from src.core.config import settings
+from src.services.cotizacion import CotizadorService
+from src.services.cotizacion.cache_cotizaciones import (
+    CacheCotizaciones,
+    cache_cotizaciones,
+)
+from src.services.cotizacion.cotizaciones_en_curso import (
+    CotizacionesEnCurso,
+    cotizaciones_en_curso,
+)
+from src.services.cotizacion.ejecutor_cotizaciones import EjecutorCotizaciones
+
+
+@dataclass(frozen=True)
+class ContenedorServicios:
+    """
+    Grafo de servicios de la aplicación, construido una sola vez al iniciar.
+
+    Los servicios no guardan estado por cotización (todo vive en el
+    CotizacionContext de cada ejecución), por lo que se comparten entre
+    solicitudes concurrentes.
+    """
+
+    cotizador_service: CotizadorService
+    cache_cotizaciones: CacheCotizaciones
+    cotizaciones_en_curso: CotizacionesEnCurso
+    ejecutor_cotizaciones: EjecutorCotizaciones
+
+    @classmethod
+    def construir(cls) -> "ContenedorServicios":
+        """Construye el grafo completo de servicios"""
+        cotizador_service = CotizadorService()
+        return cls(
+            cotizador_service=cotizador_service,
+            cache_cotizaciones=cache_cotizaciones,
+            cotizaciones_en_curso=cotizaciones_en_curso,
+            ejecutor_cotizaciones=EjecutorCotizaciones(
+                cotizador_service,
+                procesos=settings.EJECUTOR_COTIZACIONES_PROCESOS,
+                tamano_cola=settings.EJECUTOR_COTIZACIONES_COLA,
+                coleccion_paralela=settings.COLECCION_PARALELA_HABILITADA,
+            ),
+        )
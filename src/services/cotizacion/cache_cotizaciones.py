@@ -0,0 +1,280 @@
+import hashlib
+import json
+import threading
+import time
+import zlib
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.core.config import settings
+from src.helpers.version_assets import huella_contenido_assets
+from src.models.schemas.cotizacion_schema import CotizacionInput, CotizacionOutput
+from src.repositories.almacen_cache import (
+    AlmacenCache,
+    AlmacenMemoria,
+    obtener_almacen_cache,
+)
+from src.repositories.registro_datos_referencia import registro_datos_referencia
+
+
+def _canonico(valor: Any) -> Any:
+    """Normaliza enums y números para que entradas equivalentes coincidan"""
+    if isinstance(valor, Enum):
+        return valor.value
+    if isinstance(valor, bool) or valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, (int, float)):
+        # 10000, 10000.0 y -0.0/0.0 son el mismo valor
+        return float(valor) + 0.0
+    if isinstance(valor, dict):
+        return {str(clave): _canonico(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_canonico(v) for v in valor]
+    return str(valor)
+
+
+def clave_cotizacion(cotizacion_input: CotizacionInput) -> str:
+    """
+    Clave canónica de una cotización: hash del producto, el tipo de
+    parámetros y sus valores normalizados, independiente del orden de campos.
+    """
+    parametros = cotizacion_input.parametros
+    datos = {
+        "producto": _canonico(cotizacion_input.producto),
+        "tipo_parametros": type(parametros).__name__,
+        "parametros": _canonico(parametros.model_dump()),
+    }
+    serializado = json.dumps(datos, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serializado.encode("utf-8")).hexdigest()
+
+
+def huella_configuracion(producto: str) -> str:
+    """
+    Huella de la configuración que afecta al resultado de una cotización del
+    producto: versión de la API, método de optimización e implementación de
+    los cálculos de flujo y resultado.
+    """
+    datos = [
+        settings.VERSION,
+        settings.metodo_optimizacion(producto),
+        settings.FLUJO_RESULTADO_IMPLEMENTACION,
+    ]
+    return hashlib.sha256(json.dumps(datos).encode("utf-8")).hexdigest()[:16]
+
+
+def version_registro(producto: str, revisar: bool = False) -> str:
+    """
+    Versión de los assets del producto en el registro de datos de referencia
+    (con revisar=True, revisada en el momento; ver RegistroDatosReferencia)
+    """
+    return registro_datos_referencia.obtener(producto, revisar).version
+
+
+# Primer byte del valor guardado: formato de serialización
+FORMATO_ZLIB_JSON = b"\x01"
+
+
+def serializar_cotizacion(cotizacion: CotizacionOutput) -> bytes:
+    """Serializa una cotización en formato compacto: JSON comprimido con zlib"""
+    return FORMATO_ZLIB_JSON + zlib.compress(
+        cotizacion.model_dump_json().encode("utf-8"), 1
+    )
+
+
+def deserializar_cotizacion(datos: bytes) -> CotizacionOutput:
+    """
+    Reconstruye una cotización serializada con serializar_cotizacion.
+
+    Raises:
+        ValueError: Si el formato no se reconoce o el contenido no es válido
+    """
+    if datos[:1] != FORMATO_ZLIB_JSON:
+        raise ValueError(f"Formato de cotización guardada no reconocido: {datos[:1]!r}")
+    try:
+        contenido = zlib.decompress(datos[1:])
+    except zlib.error as e:
+        raise ValueError(f"Cotización guardada corrupta: {e}") from e
+    return CotizacionOutput.model_validate_json(contenido)
+
+
+class CacheCotizaciones:
+    """
+    Caché de resultados de cotización sobre un almacén intercambiable
+    (memoria del proceso, SQLite o Redis; ver almacen_cache).
+
+    Las cotizaciones se guardan serializadas, con tiempo de vida por entrada,
+    bajo una clave que incluye la huella del contenido de assets/<producto> y
+    la de la configuración: así varias instancias con los mismos datos
+    comparten entradas, y un cambio de assets deja de leer las anteriores sin
+    borrarlas (las desaloja el almacén). El cambio de assets se detecta con la
+    versión del registro de datos de referencia, la misma que siguen los
+    datos y las tablas del cálculo, y solo entonces se vuelve a leer el
+    contenido. El registro ya limita la revisión de los archivos, así que
+    por defecto la versión se consulta en cada búsqueda.
+
+    Antes de guardar un resultado la versión se revisa sin esperar el
+    intervalo: si los assets cambiaron desde la búsqueda el resultado no se
+    guarda, para que un almacén compartido (SQLite o Redis) nunca reciba
+    bajo la clave de los assets nuevos una cotización calculada con los
+    anteriores.
+
+    Lleva contadores de aciertos, fallos, invalidaciones (cambios de versión
+    detectados) y descartadas (entradas guardadas que no se pudieron leer),
+    además de los del almacén.
+    """
+
+    def __init__(
+        self,
+        almacen: Optional[AlmacenCache] = None,
+        ttl_segundos: Optional[float] = 3600.0,
+        intervalo_version_segundos: float = 0.0,
+        version: Callable[[str, bool], str] = version_registro,
+        huella_contenido: Callable[[str], str] = huella_contenido_assets,
+        reloj: Callable[[], float] = time.monotonic,
+        tamano_maximo: int = 1024,
+    ):
+        self.almacen = almacen if almacen is not None else AlmacenMemoria(tamano_maximo)
+        self.ttl_segundos = ttl_segundos
+        self.intervalo_version_segundos = intervalo_version_segundos
+        self._version = version
+        self._huella_contenido = huella_contenido
+        self._reloj = reloj
+        # producto -> (huella por fecha de modificación, huella del contenido)
+        self._versiones: Dict[str, Tuple[str, str]] = {}
+        self._revision_version: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._contadores = dict.fromkeys(
+            ("aciertos", "fallos", "invalidaciones", "descartadas"), 0
+        )
+
+    def obtener_o_calcular(
+        self,
+        cotizacion_input: CotizacionInput,
+        calcular: Callable[[], CotizacionOutput],
+    ) -> CotizacionOutput:
+        """
+        Retorna la cotización guardada para la entrada o la calcula y la guarda.
+        Los errores de cálculo no se guardan. Las cotizaciones guardadas se
+        reconstruyen en cada lectura, así que quien las recibe no puede
+        alterar la entrada guardada.
+        """
+        clave, version, resultado = self._buscar(cotizacion_input)
+        if resultado is not None:
+            return resultado
+        resultado = calcular()
+        self._guardar(cotizacion_input, clave, version, resultado)
+        return resultado
+
+    async def obtener_o_calcular_async(
+        self,
+        cotizacion_input: CotizacionInput,
+        calcular: Callable[[], Awaitable[CotizacionOutput]],
+    ) -> CotizacionOutput:
+        """Igual que obtener_o_calcular, con un cálculo asíncrono"""
+        clave, version, resultado = self._buscar(cotizacion_input)
+        if resultado is not None:
+            return resultado
+        resultado = await calcular()
+        self._guardar(cotizacion_input, clave, version, resultado)
+        return resultado
+
+    def limpiar(self) -> None:
+        """Elimina todas las entradas (los contadores se conservan)"""
+        self.almacen.limpiar()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Almacén, contadores de la caché y los del almacén"""
+        estadisticas_almacen = self.almacen.estadisticas()
+        with self._lock:
+            consultas = self._contadores["aciertos"] + self._contadores["fallos"]
+            return {
+                "almacen": self.almacen.nombre,
+                "ttl_segundos": self.ttl_segundos,
+                **estadisticas_almacen,
+                **self._contadores,
+                "tasa_aciertos": (
+                    self._contadores["aciertos"] / consultas if consultas else 0.0
+                ),
+            }
+
+    def _buscar(
+        self, cotizacion_input: CotizacionInput
+    ) -> Tuple[str, str, Optional[CotizacionOutput]]:
+        """Clave, versión de los assets y cotización guardada (o None)"""
+        producto = cotizacion_input.producto.value.lower()
+        with self._lock:
+            version = self._verificar_version(producto)
+        clave = ":".join(
+            (
+                producto,
+                version,
+                huella_configuracion(producto),
+                clave_cotizacion(cotizacion_input),
+            )
+        )
+
+        datos = self.almacen.obtener(clave)
+        if datos is not None:
+            try:
+                resultado = deserializar_cotizacion(datos)
+            except ValueError as e:
+                print(f"Cotización guardada descartada ({clave}): {e}")
+                self.almacen.eliminar(clave)
+                with self._lock:
+                    self._contadores["descartadas"] += 1
+            else:
+                with self._lock:
+                    self._contadores["aciertos"] += 1
+                return clave, version, resultado
+        with self._lock:
+            self._contadores["fallos"] += 1
+        return clave, version, None
+
+    def _guardar(
+        self,
+        cotizacion_input: CotizacionInput,
+        clave: str,
+        version: str,
+        resultado: CotizacionOutput,
+    ) -> None:
+        # Si los assets cambiaron durante el cálculo, no se guarda
+        producto = cotizacion_input.producto.value.lower()
+        with self._lock:
+            vigente = self._verificar_version(producto, revisar=True) == version
+        if vigente:
+            self.almacen.guardar(
+                clave, serializar_cotizacion(resultado), self.ttl_segundos
+            )
+
+    def _verificar_version(self, producto: str, revisar: bool = False) -> str:
+        """
+        Huella del contenido de los assets del producto, revisada por
+        intervalo (o en el momento, con revisar=True)
+        """
+        ahora = self._reloj()
+        anterior = self._versiones.get(producto)
+        revisado = self._revision_version.get(producto)
+        if (
+            not revisar
+            and anterior is not None
+            and revisado is not None
+            and ahora - revisado < self.intervalo_version_segundos
+        ):
+            return anterior[1]
+
+        version = self._version(producto, revisar)
+        self._revision_version[producto] = ahora
+        if anterior is not None and anterior[0] == version:
+            return anterior[1]
+        huella = self._huella_contenido(producto)
+        self._versiones[producto] = (version, huella)
+        if anterior is not None and anterior[1] != huella:
+            self._contadores["invalidaciones"] += 1
+        return huella
+
+
+# Instancia global compartida por todas las instancias del servicio
+cache_cotizaciones = CacheCotizaciones(
+    almacen=obtener_almacen_cache("cotizaciones", settings.CACHE_COTIZACIONES_TAMANO),
+    ttl_segundos=settings.CACHE_COTIZACIONES_TTL_SEGUNDOS,
+)
@@ -0,0 +1,203 @@
+"""
+Construcción fuera de línea de la grilla de cotizaciones RUMBO.
+
+Calcula cada combinación del catálogo de primas y periodos con todas las
+edades, sexos, estados de fumador y frecuencias de pago, y escribe la grilla
+que abre GrillaCotizaciones.
+
+Uso:
+    python -m src.services.cotizacion.construir_grilla [--salida RUTA] [--procesos N]
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from multiprocessing import Pool
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.common.frecuencia_pago import FrecuenciaPago
+from src.common.sexo import Sexo
+from src.core.config import settings
+from src.core.constants import EDAD_MAXIMA_PERMANENCIA, EDAD_MINIMA_PARTICIPACION
+from src.helpers.version_assets import RUTA_ASSETS, huella_contenido_assets
+from src.models.schemas.cotizacion_schema import CotizacionInput, TipoProducto
+from src.repositories.periodos_cotizacion_repository import (
+    periodos_cotizacion_repository,
+)
+from src.repositories.registro_datos_referencia import registro_datos_referencia
+from src.services.cotizacion.pipeline import CotizacionContext, CotizacionPipeline
+from src.services.cotizacion.grilla_cotizaciones import (
+    CALCULADA,
+    CAMPOS_RESULTADO,
+    CON_ERROR,
+    DTYPE_GRILLA,
+    EJES,
+    FORMATO_GRILLA,
+    PRODUCTO_GRILLA,
+    configuracion_calculo,
+    rutas_grilla,
+)
+
+
+def _ejes_catalogo() -> Tuple[Dict[str, List[Any]], List[Tuple[float, int]]]:
+    catalogo = periodos_cotizacion_repository.get_periodos_cotizacion()
+    pares = sorted(
+        {
+            (float(prima), int(periodo))
+            for grupo in catalogo
+            for prima in grupo.get("primas", [])
+            for periodo in grupo.get("periodos", [])
+        }
+    )
+    ejes = {
+        "prima": sorted({prima for prima, _ in pares}),
+        "periodo": sorted({periodo for _, periodo in pares}),
+        "edad": list(range(EDAD_MINIMA_PARTICIPACION, EDAD_MAXIMA_PERMANENCIA + 1)),
+        "sexo": [sexo.value for sexo in Sexo],
+        "fumador": [False, True],
+        "frecuencia": [frecuencia.value for frecuencia in FrecuenciaPago],
+    }
+    return ejes, pares
+
+
+def _celdas(
+    ejes: Dict[str, List[Any]], pares: List[Tuple[float, int]]
+) -> Iterator[Tuple[int, Tuple[Any, ...]]]:
+    forma = tuple(len(ejes[eje]) for eje in EJES)
+    indice_prima = {prima: i for i, prima in enumerate(ejes["prima"])}
+    indice_periodo = {periodo: i for i, periodo in enumerate(ejes["periodo"])}
+    for prima, periodo in pares:
+        for resto in product(
+            *(enumerate(ejes[eje]) for eje in ("edad", "sexo", "fumador", "frecuencia"))
+        ):
+            indices = (indice_prima[prima], indice_periodo[periodo]) + tuple(
+                i for i, _ in resto
+            )
+            valores = (prima, periodo) + tuple(valor for _, valor in resto)
+            yield int(np.ravel_multi_index(indices, forma)), valores
+
+
+_pipeline_trabajador = None
+
+
+def _iniciar_trabajador() -> None:
+    global _pipeline_trabajador
+    _pipeline_trabajador = CotizacionPipeline()
+
+
+def _calcular_celda(celda: Tuple[int, Tuple[Any, ...]]) -> Tuple[int, Tuple]:
+    posicion, (prima, periodo, edad, sexo, fumador, frecuencia) = celda
+    cotizacion_input = CotizacionInput(
+        producto=TipoProducto.RUMBO,
+        parametros={
+            "edad_actuarial": edad,
+            "sexo": sexo,
+            "fumador": fumador,
+            "frecuencia_pago_primas": frecuencia,
+            "prima": prima,
+            "periodo_vigencia": periodo,
+            "periodo_pago_primas": periodo,
+        },
+    )
+    try:
+        context = _pipeline_trabajador.steps.execute(
+            CotizacionContext(input=cotizacion_input)
+        )
+        if context.errors:
+            raise ValueError("; ".join(context.errors))
+    except Exception:
+        return posicion, (CON_ERROR,) + (math.nan,) * len(CAMPOS_RESULTADO)
+
+    resultados = tuple(
+        math.nan if getattr(context, campo) is None else float(getattr(context, campo))
+        for campo in CAMPOS_RESULTADO
+    )
+    return posicion, (CALCULADA,) + resultados
+
+
+def construir_grilla(ruta: Path, procesos: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Calcula todas las combinaciones del catálogo y escribe la grilla en la
+    carpeta indicada (reemplazando la anterior de forma atómica).
+
+    Args:
+        ruta: Carpeta de salida
+        procesos: Procesos de cálculo en paralelo (por defecto, uno por CPU)
+
+    Returns:
+        Metadatos escritos junto a la grilla
+    """
+    ruta = Path(ruta)
+    ruta.mkdir(parents=True, exist_ok=True)
+    ruta_valores, ruta_metadatos = rutas_grilla(ruta)
+
+    huella = huella_contenido_assets(PRODUCTO_GRILLA, registro_datos_referencia.base_path)
+    ejes, pares = _ejes_catalogo()
+    forma = tuple(len(ejes[eje]) for eje in EJES)
+    valores = np.zeros(math.prod(forma), dtype=DTYPE_GRILLA)
+    for campo in CAMPOS_RESULTADO:
+        valores[campo] = math.nan
+
+    procesos = procesos or os.cpu_count() or 1
+    celdas = list(_celdas(ejes, pares))
+    if procesos > 1:
+        with Pool(procesos, initializer=_iniciar_trabajador) as pool:
+            resultados = pool.imap_unordered(_calcular_celda, celdas, chunksize=256)
+            for posicion, fila in resultados:
+                valores[posicion] = fila
+    else:
+        _iniciar_trabajador()
+        for celda in celdas:
+            posicion, fila = _calcular_celda(celda)
+            valores[posicion] = fila
+
+    metadatos = {
+        "formato": FORMATO_GRILLA,
+        "producto": PRODUCTO_GRILLA,
+        "huella_assets": huella,
+        **configuracion_calculo(),
+        "ejes": ejes,
+        "campos": list(CAMPOS_RESULTADO),
+        "celdas": len(valores),
+        "calculadas": int(np.count_nonzero(valores["estado"] == CALCULADA)),
+        "con_error": int(np.count_nonzero(valores["estado"] == CON_ERROR)),
+    }
+
+    temporal_valores = ruta_valores.with_suffix(".npy.tmp")
+    with open(temporal_valores, "wb") as f:
+        np.save(f, valores)
+    temporal_metadatos = ruta_metadatos.with_suffix(".json.tmp")
+    with open(temporal_metadatos, "w", encoding="utf-8") as f:
+        json.dump(metadatos, f, indent=2)
+    os.replace(temporal_valores, ruta_valores)
+    os.replace(temporal_metadatos, ruta_metadatos)
+    return metadatos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye la grilla de cotizaciones RUMBO")
+    parser.add_argument("--salida", default=settings.GRILLA_COTIZACIONES_RUTA)
+    parser.add_argument("--procesos", type=int, default=None)
+    argumentos = parser.parse_args()
+
+    salida = Path(argumentos.salida)
+    if not salida.is_absolute():
+        salida = RUTA_ASSETS.parent / salida
+
+    inicio = time.perf_counter()
+    metadatos = construir_grilla(salida, argumentos.procesos)
+    print(
+        f"Grilla escrita en {salida}: {metadatos['celdas']} celdas, "
+        f"{metadatos['calculadas']} calculadas, {metadatos['con_error']} con error "
+        f"({time.perf_counter() - inicio:.1f} s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
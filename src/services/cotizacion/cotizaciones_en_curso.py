@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from src.core.config import settings
+
+T = TypeVar("T")
+
+
+class CotizacionesEnCurso:
+    """
+    Agrupa cálculos idénticos que llegan mientras otro igual está en curso
+    (single-flight): la primera solicitud de una clave lanza el cálculo y las
+    siguientes esperan ese mismo resultado en lugar de repetirlo.
+
+    El cálculo corre en una tarea propia, así que si la solicitud que lo lanzó
+    se cancela (ej: el cliente se desconecta) las demás siguen esperándolo.
+    Todas reciben el mismo objeto, que no se debe modificar, o la misma
+    excepción. Se usa desde el event loop de la aplicación; la clave sale de
+    la entrada canónica (ver clave_cotizacion).
+    """
+
+    def __init__(self, habilitado: bool = True):
+        self.habilitado = habilitado
+        self._en_curso: Dict[str, "asyncio.Future[Any]"] = {}
+        self._contadores = dict.fromkeys(("ejecutadas", "coalescidas", "errores"), 0)
+
+    async def ejecutar(self, clave: str, calcular: Callable[[], Awaitable[T]]) -> T:
+        """
+        Retorna el resultado del cálculo en curso para la clave o lanza uno nuevo.
+
+        Args:
+            clave: Identifica cálculos equivalentes
+            calcular: Crea el cálculo (ej: lambda: run_in_threadpool(...))
+        """
+        if not self.habilitado:
+            return await calcular()
+
+        tarea = self._en_curso.get(clave)
+        if tarea is None:
+            tarea = asyncio.ensure_future(calcular())
+            self._en_curso[clave] = tarea
+            tarea.add_done_callback(lambda t: self._terminar(clave, t))
+            self._contadores["ejecutadas"] += 1
+        else:
+            self._contadores["coalescidas"] += 1
+        return await asyncio.shield(tarea)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Cálculos lanzados, solicitudes que esperaron uno en curso y errores"""
+        return {
+            "habilitado": self.habilitado,
+            "en_curso": len(self._en_curso),
+            **self._contadores,
+        }
+
+    def _terminar(self, clave: str, tarea: "asyncio.Future[Any]") -> None:
+        if self._en_curso.get(clave) is tarea:
+            del self._en_curso[clave]
+        # Marca la excepción como leída aunque nadie siga esperando
+        if not tarea.cancelled() and tarea.exception() is not None:
+            self._contadores["errores"] += 1
+
+
+# Instancia global compartida por todas las solicitudes
+cotizaciones_en_curso = CotizacionesEnCurso(
+    habilitado=settings.COALESCENCIA_COTIZACIONES_HABILITADA
+)
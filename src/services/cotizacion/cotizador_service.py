@@ -1,4 +1,5 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
+from src.core.config import settings
 from src.models.schemas.cotizacion_schema import (
     CotizacionInput,
     CotizacionOutput,
@@ -6,8 +7,9 @@ from src.models.schemas.cotizacion_schema import (
     ParametrosRumbo,
 )
 from .strategies import CotizacionStrategy, RumboStrategy, EndososStrategy
+from .cache_cotizaciones import CacheCotizaciones, cache_cotizaciones
 from src.repositories.periodos_cotizacion_repository import (
-    JsonPeriodosCotizacionRepository,
+    periodos_cotizacion_repository,
 )
 
 
@@ -22,8 +24,12 @@ class CotizadorService:
     ¡AHORA tiene 15 líneas en el método principal! 🚀
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[CacheCotizaciones] = None):
         self.strategies = self._initialize_strategies()
+        # Por defecto se comparte la caché global entre instancias
+        if cache is None and settings.CACHE_COTIZACIONES_HABILITADA:
+            cache = cache_cotizaciones
+        self.cache = cache
 
     def _initialize_strategies(self) -> Dict[TipoProducto, CotizacionStrategy]:
         """Inicializa las estrategias disponibles para cada producto"""
@@ -41,6 +47,7 @@ class CotizadorService:
 
         Realiza la cotización para el producto especificado.
         Utiliza la estrategia correspondiente según el tipo de producto.
+        Las cotizaciones repetidas se responden desde la caché.
 
         Args:
             cotizacion_input: Datos de entrada para la cotización
@@ -52,11 +59,21 @@ class CotizadorService:
             ValueError: Si el producto no es soportado
             Exception: Si hay errores en el proceso de cotización
         """
-        # 1. Obtener estrategia
-        strategy = self._get_strategy(cotizacion_input.producto)
+        # Ejecutar cotización (o recuperarla de la caché)
+        if self.cache is None:
+            return self.calcular(cotizacion_input)
+        return self.cache.obtener_o_calcular(
+            cotizacion_input, lambda: self.calcular(cotizacion_input)
+        )
+
+    def calcular(self, cotizacion_input: CotizacionInput) -> CotizacionOutput:
+        """
+        Ejecuta la estrategia del producto sin consultar la caché.
 
-        # 2. Ejecutar cotización
-        return strategy.execute(cotizacion_input)
+        Raises:
+            ValueError: Si el producto no es soportado
+        """
+        return self._get_strategy(cotizacion_input.producto).execute(cotizacion_input)
 
     def get_coleccion_cotizacion(self, cotizacion_input: CotizacionInput) -> Dict[str, Any]:
         """
@@ -80,6 +97,26 @@ class CotizadorService:
         # 2. Delegar la lógica de colección a la estrategia
         return strategy.execute_collection(cotizacion_input)
 
+    def entradas_coleccion(
+        self, cotizacion_input: CotizacionInput
+    ) -> Optional[List[CotizacionInput]]:
+        """
+        Cotizaciones individuales de la colección, para calcularlas en
+        paralelo; None si el producto calcula la colección en una sola ejecución
+        """
+        strategy = self._get_strategy(cotizacion_input.producto)
+        return strategy.entradas_coleccion(cotizacion_input)
+
+    def armar_coleccion(
+        self,
+        cotizacion_input: CotizacionInput,
+        entradas: List[CotizacionInput],
+        resultados: List[Union[CotizacionOutput, Exception]],
+    ) -> Dict[str, Any]:
+        """Une los resultados de entradas_coleccion en la respuesta de la colección"""
+        strategy = self._get_strategy(cotizacion_input.producto)
+        return strategy.armar_coleccion(cotizacion_input, entradas, resultados)
+
     def get_periodos_disponibles(self, cotizacion_input: CotizacionInput) -> List[int]:
         """
         Obtiene los períodos disponibles para una cotización específica.
@@ -87,8 +124,7 @@ class CotizadorService:
         """
         if cotizacion_input.producto == TipoProducto.RUMBO:
             if isinstance(cotizacion_input.parametros, ParametrosRumbo):
-                periodos_repo = JsonPeriodosCotizacionRepository()
-                return periodos_repo.get_periodos_disponibles(cotizacion_input.parametros.prima)
+                return periodos_cotizacion_repository.get_periodos_disponibles(cotizacion_input.parametros.prima)
         
         # Para otros productos, retornar lista vacía o implementar lógica específica
         return []
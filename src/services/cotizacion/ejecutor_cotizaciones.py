@@ -0,0 +1,285 @@
+"""
+Ejecución de cotizaciones fuera del event loop.
+
+Las cotizaciones son CPU-bound: ejecutarlas dentro de una ruta async bloquea
+el event loop del worker de uvicorn para todas las demás solicitudes. El
+ejecutor las corre en un pool de procesos (o en el pool de hilos si no hay
+procesos configurados) y acota las solicitudes pendientes: al superar el
+límite se rechazan con ColaCotizacionesLlena en lugar de acumularse.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.models.schemas.cotizacion_schema import (
+    CotizacionInput,
+    CotizacionOutput,
+    TipoProducto,
+)
+from src.models.domain.tablas_decremento import obtener_tablas_decremento
+from src.repositories.registro_datos_referencia import registro_datos_referencia
+from src.services.cotizacion.cotizador_service import CotizadorService
+from src.services.cotizacion.grilla_cotizaciones import obtener_grilla_cotizaciones
+
+# Métodos de CotizadorService que se ejecutan en el pool
+METODOS_EJECUTABLES = ("calcular", "get_coleccion_cotizacion")
+
+
+class ColaCotizacionesLlena(Exception):
+    """No hay lugar para más cotizaciones pendientes en el ejecutor"""
+
+
+_servicio_trabajador: Optional[CotizadorService] = None
+
+
+def _iniciar_trabajador() -> None:
+    """Construye el servicio del proceso y precarga datos, tablas y grilla"""
+    global _servicio_trabajador
+    # Ctrl+C llega a todo el grupo de procesos: el cierre lo dirige el proceso
+    # principal, que espera las cotizaciones pendientes antes de detenerlos
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _servicio_trabajador = CotizadorService()
+    for producto in TipoProducto:
+        registro_datos_referencia.obtener(producto.value)
+    obtener_tablas_decremento()
+    obtener_grilla_cotizaciones()
+
+
+def _ejecutar_en_trabajador(
+    metodo: str, cotizacion_input: CotizacionInput, encolado: float
+) -> Tuple[Any, float]:
+    """Ejecuta el método del servicio y retorna el resultado y la espera en cola"""
+    espera = time.time() - encolado
+    # El registro del proceso se revisa en el momento: la caché del proceso
+    # principal ya usó la versión vigente de los assets para la clave
+    registro_datos_referencia.obtener(cotizacion_input.producto.value, revisar=True)
+    return getattr(_servicio_trabajador, metodo)(cotizacion_input), espera
+
+
+def _listo() -> int:
+    return os.getpid()
+
+
+def procesos_disponibles() -> int:
+    """CPUs que el proceso puede usar (respeta la afinidad, ej: en contenedores)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class EjecutorCotizaciones:
+    """
+    Ejecuta las cotizaciones de CotizadorService en un pool de procesos acotado.
+
+    Cada proceso construye su propio servicio y precarga los datos de
+    referencia y la grilla al iniciar. La caché de cotizaciones se consulta
+    en el proceso principal, antes de enviar el cálculo, así que los aciertos
+    no pasan por el pool. Las cotizaciones pendientes (en ejecución o en
+    cola) se limitan a procesos + tamano_cola. Con procesos = 0 se usa el
+    servicio del proceso en el pool de hilos, con el mismo límite.
+    """
+
+    def __init__(
+        self,
+        servicio: CotizadorService,
+        procesos: Optional[int] = None,
+        tamano_cola: int = 64,
+        coleccion_paralela: bool = True,
+    ):
+        self.servicio = servicio
+        self.procesos = procesos_disponibles() if procesos is None else procesos
+        self.tamano_cola = tamano_cola
+        self.coleccion_paralela = coleccion_paralela
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cerrado = False
+        self._pendientes = 0
+        self._contadores = dict.fromkeys(
+            ("ejecutadas", "rechazadas", "errores", "reinicios"), 0
+        )
+        self._espera_total = 0.0
+        self._espera_maxima = 0.0
+        self._ejecucion_total = 0.0
+
+    @property
+    def limite_pendientes(self) -> int:
+        return max(self.procesos, 1) + self.tamano_cola
+
+    async def iniciar(self) -> None:
+        """Inicia los procesos y espera a que terminen de precargar los datos"""
+        if self.procesos <= 0:
+            return
+        pool = self._obtener_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(pool, _listo) for _ in range(self.procesos))
+        )
+
+    async def cotizar(self, cotizacion_input: CotizacionInput) -> CotizacionOutput:
+        """
+        Equivalente a CotizadorService.cotizar sin bloquear el event loop.
+
+        Raises:
+            ColaCotizacionesLlena: Si se alcanzó el límite de pendientes o el
+                ejecutor está cerrado
+            ValueError: Si el producto no es soportado
+        """
+        cache = self.servicio.cache
+        if cache is None:
+            return await self.ejecutar("calcular", cotizacion_input)
+        return await cache.obtener_o_calcular_async(
+            cotizacion_input, lambda: self.ejecutar("calcular", cotizacion_input)
+        )
+
+    async def get_coleccion_cotizacion(
+        self, cotizacion_input: CotizacionInput
+    ) -> Dict[str, Any]:
+        """
+        Equivalente a CotizadorService.get_coleccion_cotizacion sin bloquear
+        el event loop.
+
+        Con la colección paralela y más de un proceso, si el producto
+        descompone la colección (ej: un período por cotización en RUMBO) cada
+        cotización se resuelve con cotizar, en paralelo en el pool y
+        consultando la caché, y los resultados se unen en el orden de los
+        períodos. Los errores de cada cotización quedan en su período; si
+        alguna no tiene lugar en la cola se rechaza la colección completa.
+
+        Raises:
+            ColaCotizacionesLlena: Si se alcanzó el límite de pendientes o el
+                ejecutor está cerrado
+            ValueError: Si el producto no es soportado
+        """
+        # Con un solo proceso no hay paralelismo que compense el envío de
+        # cada período por separado
+        entradas = (
+            self.servicio.entradas_coleccion(cotizacion_input)
+            if self.coleccion_paralela and self.procesos > 1
+            else None
+        )
+        if entradas is None:
+            return await self.ejecutar("get_coleccion_cotizacion", cotizacion_input)
+
+        resultados = await asyncio.gather(
+            *(self.cotizar(entrada) for entrada in entradas), return_exceptions=True
+        )
+        for resultado in resultados:
+            if isinstance(resultado, ColaCotizacionesLlena):
+                raise resultado
+        return self.servicio.armar_coleccion(cotizacion_input, entradas, resultados)
+
+    async def ejecutar(self, metodo: str, cotizacion_input: CotizacionInput) -> Any:
+        """
+        Ejecuta el método del servicio en el pool.
+
+        Args:
+            metodo: Uno de METODOS_EJECUTABLES
+            cotizacion_input: Entrada de la cotización
+
+        Raises:
+            ColaCotizacionesLlena: Si se alcanzó el límite de pendientes o el
+                ejecutor está cerrado
+            ValueError: Si el método no se puede ejecutar, o el que lance el servicio
+        """
+        if metodo not in METODOS_EJECUTABLES:
+            raise ValueError(f"Método no ejecutable: {metodo}")
+        if self._cerrado:
+            raise ColaCotizacionesLlena("El ejecutor de cotizaciones está cerrado")
+        if self._pendientes >= self.limite_pendientes:
+            self._contadores["rechazadas"] += 1
+            raise ColaCotizacionesLlena(
+                f"Hay {self._pendientes} cotizaciones pendientes (límite "
+                f"{self.limite_pendientes})"
+            )
+
+        self._pendientes += 1
+        encolado = time.time()
+        try:
+            if self.procesos <= 0:
+                resultado, espera = await run_in_threadpool(
+                    self._ejecutar_local, metodo, cotizacion_input, encolado
+                )
+            else:
+                resultado, espera = await self._ejecutar_en_pool(
+                    metodo, cotizacion_input, encolado
+                )
+        except Exception:
+            self._contadores["errores"] += 1
+            raise
+        finally:
+            self._pendientes -= 1
+
+        self._contadores["ejecutadas"] += 1
+        self._espera_total += espera
+        self._espera_maxima = max(self._espera_maxima, espera)
+        self._ejecucion_total += time.time() - encolado - espera
+        return resultado
+
+    async def cerrar(self) -> None:
+        """
+        Deja de aceptar cotizaciones y espera a que terminen las pendientes
+        antes de detener los procesos
+        """
+        self._cerrado = True
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await run_in_threadpool(pool.shutdown, True)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Procesos, pendientes, contadores y tiempos promedio en milisegundos"""
+        ejecutadas = self._contadores["ejecutadas"]
+        return {
+            "procesos": self.procesos,
+            "limite_pendientes": self.limite_pendientes,
+            "pendientes": self._pendientes,
+            **self._contadores,
+            "espera_promedio_ms": (
+                self._espera_total / ejecutadas * 1000 if ejecutadas else 0.0
+            ),
+            "espera_maxima_ms": self._espera_maxima * 1000,
+            "ejecucion_promedio_ms": (
+                self._ejecucion_total / ejecutadas * 1000 if ejecutadas else 0.0
+            ),
+        }
+
+    def _ejecutar_local(
+        self, metodo: str, cotizacion_input: CotizacionInput, encolado: float
+    ) -> Tuple[Any, float]:
+        espera = time.time() - encolado
+        return getattr(self.servicio, metodo)(cotizacion_input), espera
+
+    async def _ejecutar_en_pool(
+        self, metodo: str, cotizacion_input: CotizacionInput, encolado: float
+    ) -> Tuple[Any, float]:
+        pool = self._obtener_pool()
+        try:
+            futuro: Future = pool.submit(
+                _ejecutar_en_trabajador, metodo, cotizacion_input, encolado
+            )
+            return await asyncio.wrap_future(futuro)
+        except BrokenProcessPool as e:
+            # Un proceso terminó de forma abrupta: el pool queda inutilizable
+            # y se reemplaza para las siguientes cotizaciones
+            if self._pool is pool:
+                self._pool = None
+                self._contadores["reinicios"] += 1
+                pool.shutdown(wait=False)
+            raise RuntimeError(f"Falló un proceso del ejecutor de cotizaciones: {e}")
+
+    def _obtener_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: el proceso principal tiene hilos (uvicorn, pool de hilos)
+            # y hacer fork con hilos activos puede dejar locks tomados
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.procesos,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_iniciar_trabajador,
+            )
+        return self._pool
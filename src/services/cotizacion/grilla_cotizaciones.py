@@ -0,0 +1,208 @@
+"""
+Grilla precalculada de cotizaciones RUMBO.
+
+El catálogo de primas y periodos (periodos_cotizacion.json), junto con las
+edades admitidas y los valores de sexo, fumador y frecuencia de pago, hace
+enumerable todo el espacio de respuestas de RUMBO. El constructor fuera de
+línea calcula cada combinación y la guarda como un arreglo .npy que el
+servicio abre como memoria mapeada, con un archivo JSON de metadatos (ejes,
+huella del contenido de los assets y configuración del cálculo). Las
+entradas fuera de la grilla, o con una grilla desactualizada, se calculan
+en vivo.
+
+La grilla se construye con src/services/cotizacion/construir_grilla.py.
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.config import settings
+from src.core.constants import TOLERANCIA
+from src.helpers.version_assets import RUTA_ASSETS, huella_contenido_assets
+from src.models.schemas.cotizacion_schema import CotizacionInput, TipoProducto
+from src.repositories.registro_datos_referencia import registro_datos_referencia
+
+FORMATO_GRILLA = 1
+PRODUCTO_GRILLA = "rumbo"
+# Se incrementa cuando cambia un cálculo que afecta los resultados guardados
+# (2: TREA con derivada analítica)
+VERSION_CALCULO = 2
+
+# Estado de cada celda
+FUERA_DE_CATALOGO = 0
+CALCULADA = 1
+CON_ERROR = 2
+
+CAMPOS_RESULTADO = (
+    "porcentaje_devolucion_optimo",
+    "trea",
+    "aporte_total",
+    "devolucion_total",
+    "ganancia_total",
+)
+DTYPE_GRILLA = np.dtype(
+    [("estado", np.int8)] + [(campo, np.float64) for campo in CAMPOS_RESULTADO]
+)
+EJES = ("prima", "periodo", "edad", "sexo", "fumador", "frecuencia")
+
+
+@dataclass(frozen=True)
+class ResultadoGrilla:
+    """Resultados de la optimización de una celda de la grilla"""
+
+    porcentaje_devolucion_optimo: Optional[float]
+    trea: Optional[float]
+    aporte_total: Optional[float]
+    devolucion_total: Optional[float]
+    ganancia_total: Optional[float]
+
+
+def rutas_grilla(ruta: Path) -> Tuple[Path, Path]:
+    return ruta / f"grilla_{PRODUCTO_GRILLA}.npy", ruta / f"grilla_{PRODUCTO_GRILLA}.json"
+
+
+def configuracion_calculo() -> Dict[str, Any]:
+    """Configuración que cambia los resultados; la grilla debe coincidir con ella"""
+    return {
+        "version_calculo": VERSION_CALCULO,
+        "metodo_optimizacion": settings.metodo_optimizacion(PRODUCTO_GRILLA),
+        "flujo_resultado_implementacion": settings.FLUJO_RESULTADO_IMPLEMENTACION,
+        "tolerancia_optimizacion": TOLERANCIA,
+    }
+
+
+class GrillaCotizaciones:
+    """
+    Grilla de cotizaciones RUMBO abierta como memoria mapeada.
+
+    Cada celda se ubica por índice directo a partir de (prima, periodo, edad,
+    sexo, fumador, frecuencia). Solo responde cuando la vigencia y el pago de
+    primas son iguales (como en las colecciones) y la grilla corresponde a la
+    versión vigente de los assets y a la configuración del cálculo.
+    """
+
+    def __init__(self, valores: np.ndarray, metadatos: Dict[str, Any]):
+        self.valores = valores
+        self.metadatos = metadatos
+        self.ejes: Dict[str, List[Any]] = metadatos["ejes"]
+        self.forma = tuple(len(self.ejes[eje]) for eje in EJES)
+        self._indices = {
+            eje: {valor: i for i, valor in enumerate(self.ejes[eje])} for eje in EJES
+        }
+        # Versión de los assets ya comparada con la huella de la grilla
+        self._version_revisada: Optional[Tuple[str, bool]] = None
+        if valores.shape != (math.prod(self.forma),):
+            raise ValueError(
+                f"La grilla tiene {valores.shape[0]} celdas, se esperaban "
+                f"{math.prod(self.forma)}"
+            )
+
+    @classmethod
+    def cargar(cls, ruta: Path) -> Optional["GrillaCotizaciones"]:
+        """
+        Abre la grilla de una carpeta. Retorna None si no existe o tiene otro
+        formato.
+        """
+        ruta_valores, ruta_metadatos = rutas_grilla(Path(ruta))
+        if not ruta_valores.exists() or not ruta_metadatos.exists():
+            return None
+        try:
+            with open(ruta_metadatos, "r", encoding="utf-8") as f:
+                metadatos = json.load(f)
+            if metadatos.get("formato") != FORMATO_GRILLA:
+                return None
+            valores = np.load(ruta_valores, mmap_mode="r")
+            if valores.dtype != DTYPE_GRILLA:
+                return None
+            return cls(valores, metadatos)
+        except (json.JSONDecodeError, IOError, ValueError, KeyError) as e:
+            print(f"Error al cargar la grilla de cotizaciones: {e}")
+            return None
+
+    def vigente(self) -> bool:
+        """
+        La grilla corresponde al contenido actual de los assets y a la
+        configuración del cálculo. El contenido se vuelve a leer solo cuando
+        cambia la versión de los assets del registro.
+        """
+        if any(
+            self.metadatos.get(clave) != valor
+            for clave, valor in configuracion_calculo().items()
+        ):
+            return False
+        version = registro_datos_referencia.obtener(PRODUCTO_GRILLA).version
+        revisada = self._version_revisada
+        if revisada is None or revisada[0] != version:
+            revisada = (
+                version,
+                self.metadatos.get("huella_assets")
+                == huella_contenido_assets(
+                    PRODUCTO_GRILLA, registro_datos_referencia.base_path
+                ),
+            )
+            self._version_revisada = revisada
+        return revisada[1]
+
+    def buscar(self, cotizacion_input: CotizacionInput) -> Optional[ResultadoGrilla]:
+        """
+        Resultado precalculado para la entrada, o None si está fuera de la
+        grilla, la celda no se pudo calcular o la grilla está desactualizada.
+        """
+        if cotizacion_input.producto != TipoProducto.RUMBO:
+            return None
+        parametros = cotizacion_input.parametros
+        if (
+            parametros.periodo_vigencia is None
+            or parametros.periodo_vigencia != parametros.periodo_pago_primas
+            or not isinstance(parametros.fumador, bool)
+            or parametros.frecuencia_pago_primas is None
+        ):
+            return None
+
+        try:
+            indice = (
+                self._indices["prima"][float(parametros.prima)],
+                self._indices["periodo"][parametros.periodo_vigencia],
+                self._indices["edad"][parametros.edad_actuarial],
+                self._indices["sexo"][parametros.sexo.value],
+                self._indices["fumador"][parametros.fumador],
+                self._indices["frecuencia"][parametros.frecuencia_pago_primas.value],
+            )
+        except KeyError:
+            return None
+
+        if not self.vigente():
+            return None
+
+        celda = self.valores[np.ravel_multi_index(indice, self.forma)]
+        if celda["estado"] != CALCULADA:
+            return None
+        return ResultadoGrilla(
+            *(
+                None if math.isnan(celda[campo]) else float(celda[campo])
+                for campo in CAMPOS_RESULTADO
+            )
+        )
+
+
+@lru_cache()
+def obtener_grilla_cotizaciones() -> Optional[GrillaCotizaciones]:
+    """Grilla configurada en settings, abierta una sola vez por proceso"""
+    if not settings.GRILLA_COTIZACIONES_HABILITADA:
+        return None
+    ruta = Path(settings.GRILLA_COTIZACIONES_RUTA)
+    if not ruta.is_absolute():
+        ruta = RUTA_ASSETS.parent / ruta
+    grilla = GrillaCotizaciones.cargar(ruta)
+    if grilla is None:
+        print(
+            f"Grilla de cotizaciones habilitada pero no disponible en {ruta}: "
+            "las cotizaciones se calculan en vivo"
+        )
+    return grilla
@@ -0,0 +1,141 @@
+"""
+Cotización de lotes de entradas con resultados por elemento.
+
+Cada elemento se cotiza por separado, con un máximo de cotizaciones en
+curso a la vez, y su error no afecta al resto del lote. Los resultados se
+entregan apenas están listos o en el orden de las entradas.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+from pydantic import ValidationError
+
+from src.models.schemas.cotizacion_schema import CotizacionInput, CotizacionOutput
+from src.services.cotizacion.ejecutor_cotizaciones import ColaCotizacionesLlena
+
+# Reintentos de un elemento cuando la cola del ejecutor está llena: el lote
+# espera a que haya lugar en vez de fallar por la carga del momento
+REINTENTOS_COLA_LLENA = 20
+ESPERA_COLA_LLENA_SEGUNDOS = 0.1
+
+
+async def _cotizar_elemento(
+    indice: Any,
+    elemento: Any,
+    cotizar: Callable[[CotizacionInput], Awaitable[CotizacionOutput]],
+) -> Dict[str, Any]:
+    """Resultado de un elemento: su cotización o su error con un estado HTTP"""
+    try:
+        if isinstance(elemento, Exception):
+            raise elemento
+        cotizacion_input = CotizacionInput.model_validate(elemento)
+        for intento in range(REINTENTOS_COLA_LLENA + 1):
+            try:
+                resultado = await cotizar(cotizacion_input)
+                break
+            except ColaCotizacionesLlena:
+                if intento == REINTENTOS_COLA_LLENA:
+                    raise
+                await asyncio.sleep(ESPERA_COLA_LLENA_SEGUNDOS * (intento + 1))
+    except ValidationError as e:
+        return {"indice": indice, "estado": 422, "error": str(e)}
+    except ValueError as e:
+        return {"indice": indice, "estado": 400, "error": str(e)}
+    except ColaCotizacionesLlena as e:
+        return {"indice": indice, "estado": 503, "error": str(e)}
+    except Exception as e:
+        return {
+            "indice": indice,
+            "estado": 500,
+            "error": f"Error al procesar la cotización: {str(e)}",
+        }
+    return {
+        "indice": indice,
+        "estado": 200,
+        "resultado": resultado.model_dump(mode="json", exclude_none=True),
+    }
+
+
+async def cotizar_lote(
+    elementos: Iterable[Tuple[Any, Any]],
+    cotizar: Callable[[CotizacionInput], Awaitable[CotizacionOutput]],
+    paralelismo: int,
+    ordenado: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Cotiza los elementos de un lote y entrega un resultado por cada uno.
+
+    Las entradas se leen a medida que hay lugar, así que un lote grande no se
+    carga completo en memoria. En orden de entrada, un elemento lento detiene
+    la entrega de los siguientes, pero no se adelantan más de paralelismo
+    elementos, de modo que los resultados retenidos también están acotados.
+    Si la lectura de las entradas falla con ValueError (ej: el resto del
+    arreglo no es JSON válido), se terminan las pendientes y se entrega una
+    última línea con el error e indice None.
+
+    Args:
+        elementos: Pares (indice, elemento); el elemento es el dict de un
+            CotizacionInput o la excepción con la que falló su lectura
+        cotizar: Cotiza una entrada (ej: EjecutorCotizaciones.cotizar)
+        paralelismo: Máximo de elementos en curso a la vez
+        ordenado: Entregar en el orden de entrada en vez de al terminar
+
+    Yields:
+        {"indice", "estado", "resultado"} o {"indice", "estado", "error"}
+    """
+    paralelismo = max(paralelismo, 1)
+    en_curso: "deque[asyncio.Future]" = deque()
+    iterador = iter(elementos)
+    error_lectura = None
+    try:
+        while True:
+            try:
+                indice, elemento = next(iterador)
+            except StopIteration:
+                break
+            except ValueError as e:
+                error_lectura = {"indice": None, "estado": 400, "error": str(e)}
+                break
+            en_curso.append(
+                asyncio.ensure_future(_cotizar_elemento(indice, elemento, cotizar))
+            )
+            lleno = len(en_curso) >= paralelismo
+            for resultado in await _terminados(en_curso, ordenado, esperar=lleno):
+                yield resultado
+        while en_curso:
+            for resultado in await _terminados(en_curso, ordenado, esperar=True):
+                yield resultado
+        if error_lectura is not None:
+            yield error_lectura
+    finally:
+        # Si el cliente se desconecta se cancelan los elementos pendientes
+        for tarea in en_curso:
+            tarea.cancel()
+
+
+async def _terminados(
+    en_curso: "deque[asyncio.Future]", ordenado: bool, esperar: bool
+) -> List[Dict[str, Any]]:
+    """
+    Quita de en_curso y retorna los resultados que se pueden entregar: en
+    orden de entrada, los terminados al inicio de la cola; si no, todos los
+    terminados. Con esperar, antes espera a que haya al menos uno.
+    """
+    if esperar:
+        if ordenado:
+            await asyncio.wait([en_curso[0]])
+        else:
+            await asyncio.wait(en_curso, return_when=asyncio.FIRST_COMPLETED)
+
+    if ordenado:
+        resultados = []
+        while en_curso and en_curso[0].done():
+            resultados.append(en_curso.popleft().result())
+        return resultados
+
+    terminadas = [tarea for tarea in en_curso if tarea.done()]
+    for tarea in terminadas:
+        en_curso.remove(tarea)
+    return [tarea.result() for tarea in terminadas]
@@ -1,5 +1,9 @@
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List
+import numpy as np
+from src.models.domain.proyeccion_frame import ProyeccionFrame
+from src.models.products.rumbo.motor_actuarial import MotorActuarial
+from src.services.cotizacion.grilla_cotizaciones import ResultadoGrilla
 from src.models.schemas.cotizacion_schema import (
     CotizacionInput,
     CotizacionOutput,
@@ -26,41 +30,42 @@ class CotizacionContext:
     suma_asegurada: float = 0.0
     periodo_vigencia: int = 0
     periodo_pago_primas: int = 0
-    expuestos_mes: Optional[List[float]] = None
-    gastos: Optional[List[float]] = None
+    expuestos_mes: Optional[ProyeccionFrame] = None
+    gastos: Optional[ProyeccionFrame] = None
+    motor_actuarial: Optional[MotorActuarial] = None
 
     # Datos calculados - Flujos
-    primas_recurrentes: Optional[List[float]] = None
-    siniestros: Optional[List[float]] = None
-    rescate: Optional[List[float]] = None
-    rescates_ajuste_devolucion: Optional[List[float]] = None
-    gastos_mantenimiento: Optional[List[float]] = None
-    gasto_adquisicion: Optional[List[float]] = None
-    comision: Optional[List[float]] = None
+    primas_recurrentes: Optional[np.ndarray] = None
+    siniestros: Optional[np.ndarray] = None
+    rescate: Optional[np.ndarray] = None
+    rescates_ajuste_devolucion: Optional[np.ndarray] = None
+    gastos_mantenimiento: Optional[np.ndarray] = None
+    gasto_adquisicion: Optional[float] = None
+    comision: Optional[np.ndarray] = None
 
     # Datos calculados - Reservas
-    flujo_pasivo: Optional[List[float]] = None
-    saldo_reserva: Optional[List[float]] = None
-    moce: Optional[List[float]] = None
-    moce_saldo_reserva: Optional[List[float]] = None
-    reserva_fin_año: Optional[List[float]] = None
+    flujo_pasivo: Optional[np.ndarray] = None
+    saldo_reserva: Optional[np.ndarray] = None
+    moce: Optional[np.ndarray] = None
+    moce_saldo_reserva: Optional[np.ndarray] = None
+    reserva_fin_año: Optional[np.ndarray] = None
     tabla_devolucion: Optional[str] = None
 
     # Datos calculados - Márgenes
-    margen_solvencia: Optional[List[float]] = None
-    varianza_margen_solvencia: Optional[List[float]] = None
-    ingreso_inversiones: Optional[List[float]] = None
-    ingreso_inversiones_margen_solvencia: Optional[List[float]] = None
-    ingreso_total_inversiones: Optional[List[float]] = None
+    margen_solvencia: Optional[np.ndarray] = None
+    varianza_margen_solvencia: Optional[np.ndarray] = None
+    ingreso_inversiones: Optional[np.ndarray] = None
+    ingreso_inversiones_margen_solvencia: Optional[np.ndarray] = None
+    ingreso_total_inversiones: Optional[np.ndarray] = None
 
     # Datos calculados - Finales
-    varianza_moce: Optional[List[float]] = None
-    varianza_reserva: Optional[List[float]] = None
-    variacion_reserva: Optional[List[float]] = None
-    utilidad_pre_pi_ms: Optional[List[float]] = None
-    IR: Optional[List[float]] = None
-    flujo_accionista: Optional[List[float]] = None
-    auxiliar_vna: Optional[List[float]] = None
+    varianza_moce: Optional[np.ndarray] = None
+    varianza_reserva: Optional[np.ndarray] = None
+    variacion_reserva: Optional[np.ndarray] = None
+    utilidad_pre_pi_ms: Optional[np.ndarray] = None
+    IR: Optional[np.ndarray] = None
+    flujo_accionista: Optional[np.ndarray] = None
+    auxiliar_vna: Optional[float] = None
 
     # Datos específicos por producto
     porcentaje_devolucion_optimo: Optional[float] = None
@@ -70,6 +75,9 @@ class CotizacionContext:
     ganancia_total: Optional[float] = None
     tabla_devolucion: Optional[str] = None
 
+    # Resultado precalculado de la grilla de cotizaciones, si lo hay
+    resultado_grilla: Optional[ResultadoGrilla] = None
+
     # Respuesta final
     output: Optional[CotizacionOutput] = None
 
@@ -4,9 +4,12 @@ from .steps import (
     ParameterLoadingStep,
     ActuarialCalculationStep,
     OptimizationStep,
-    ResponseBuildingStep
+    ResponseBuildingStep,
+    GrillaStep
 )
+from typing import Optional
 from src.models.schemas.cotizacion_schema import CotizacionInput, CotizacionOutput
+from src.services.cotizacion.grilla_cotizaciones import ResultadoGrilla
 
 
 class CotizacionPipeline:
@@ -14,6 +17,7 @@ class CotizacionPipeline:
     
     def __init__(self):
         self.steps = self._build_pipeline()
+        self.steps_grilla = self._build_pipeline_grilla()
     
     def _build_pipeline(self):
         """Construye la cadena de pasos del pipeline"""
@@ -31,12 +35,34 @@ class CotizacionPipeline:
         
         return validation
     
-    def execute(self, cotizacion_input: CotizacionInput) -> CotizacionOutput:
+    def _build_pipeline_grilla(self):
+        """
+        Construye la cadena para resultados precalculados: los pasos de cálculo
+        actuarial y optimización se reemplazan por el de la grilla
+        """
+        validation = ValidationStep()
+        parameter_loading = ParameterLoadingStep()
+        grilla = GrillaStep()
+        response_building = ResponseBuildingStep()
+        
+        validation.set_next(parameter_loading)\
+                 .set_next(grilla)\
+                 .set_next(response_building)
+        
+        return validation
+    
+    def execute(
+        self,
+        cotizacion_input: CotizacionInput,
+        resultado_grilla: Optional[ResultadoGrilla] = None,
+    ) -> CotizacionOutput:
         """
         Ejecuta el pipeline completo de cotización
         
         Args:
             cotizacion_input: Datos de entrada para la cotización
+            resultado_grilla: Resultado precalculado; si se indica, se omiten
+                el cálculo actuarial y la optimización
             
         Returns:
             CotizacionOutput: Resultado de la cotización
@@ -45,11 +71,14 @@ class CotizacionPipeline:
             Exception: Si hay errores en algún paso del pipeline
         """
         # Crear contexto inicial
-        context = CotizacionContext(input=cotizacion_input)
+        context = CotizacionContext(
+            input=cotizacion_input, resultado_grilla=resultado_grilla
+        )
+        steps = self.steps if resultado_grilla is None else self.steps_grilla
         
         try:
             # Ejecutar pipeline
-            context = self.steps.execute(context)
+            context = steps.execute(context)
             
             # Verificar si hay errores
             if context.errors:
@@ -70,7 +99,7 @@ class CotizacionPipeline:
     
     def _find_failed_step(self, context: CotizacionContext) -> str:
         """Encuentra en qué paso falló el pipeline"""
-        steps = ["Validation", "ParameterLoading", "ActuarialCalculation", "Optimization", "ResponseBuilding"]
+        steps = ["Validation", "ParameterLoading", "ActuarialCalculation", "Optimization", "Grilla", "ResponseBuilding"]
         
         for step in steps:
             if f"{step}_start" in context.debug_info and f"{step}_completed" not in context.debug_info:
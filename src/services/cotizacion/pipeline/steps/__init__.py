@@ -4,6 +4,7 @@ from .parameter_loading_step import ParameterLoadingStep
 from .actuarial_calculation_step import ActuarialCalculationStep
 from .optimization_step import OptimizationStep
 from .response_building_step import ResponseBuildingStep
+from .grilla_step import GrillaStep
 
 __all__ = [
     "PipelineStep",
@@ -11,5 +12,6 @@ __all__ = [
     "ParameterLoadingStep",
     "ActuarialCalculationStep",
     "OptimizationStep",
-    "ResponseBuildingStep"
+    "ResponseBuildingStep",
+    "GrillaStep"
 ] 
\ No newline at end of file
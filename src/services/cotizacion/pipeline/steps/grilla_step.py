@@ -0,0 +1,33 @@
+from .base_step import PipelineStep
+from ..cotizacion_context import CotizacionContext
+from src.services.reserva_service import ReservaService
+
+
+class GrillaStep(PipelineStep):
+    """
+    Paso que toma los resultados de la grilla precalculada en lugar de los
+    pasos de cálculo actuarial y optimización
+    """
+    
+    def __init__(self):
+        super().__init__("Grilla")
+        self.reserva_service = ReservaService()
+    
+    def process(self, context: CotizacionContext) -> CotizacionContext:
+        """Copia el resultado de la grilla al contexto, como lo deja la optimización"""
+        resultado = context.resultado_grilla
+        if resultado is None:
+            raise ValueError("No hay resultado de grilla para la cotización")
+        
+        context.porcentaje_devolucion_optimo = resultado.porcentaje_devolucion_optimo
+        if context.porcentaje_devolucion_optimo:
+            context.trea = resultado.trea
+            context.aporte_total = resultado.aporte_total
+            context.devolucion_total = resultado.devolucion_total
+            context.ganancia_total = resultado.ganancia_total
+            context.tabla_devolucion = self.reserva_service.calcular_tabla_devolucion(
+                context.periodo_vigencia,
+                context.porcentaje_devolucion_optimo,
+            )
+        
+        return context
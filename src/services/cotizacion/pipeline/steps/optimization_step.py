@@ -2,10 +2,6 @@ from .base_step import PipelineStep
 from ..cotizacion_context import CotizacionContext
 from src.models.schemas.cotizacion_schema import TipoProducto
 from src.models.products.rumbo.rumbo import Rumbo
-from src.services.expuestos_mes_service import ExpuestosMesService
-from src.services.gastos_service import GastosService
-from src.services.flujo_resultado_service import FlujoResultadoService
-from src.services.margen_solvencia_service import MargenSolvenciaService
 from src.services.reserva_service import ReservaService
 
 
@@ -14,20 +10,11 @@ class OptimizationStep(PipelineStep):
     
     def __init__(self):
         super().__init__("Optimization")
-        # Inicializar servicios para Rumbo
-        self.expuestos_mes_service = ExpuestosMesService()
-        self.gastos_service = GastosService()
-        self.flujo_resultado_service = FlujoResultadoService()
-        self.margen_solvencia_service = MargenSolvenciaService()
+        # Los cálculos actuariales los hace el motor del paso anterior; Rumbo
+        # solo necesita la reserva para la tabla de devolución
         self.reserva_service = ReservaService()
         
-        self.rumbo = Rumbo(
-            self.expuestos_mes_service,
-            self.flujo_resultado_service,
-            self.gastos_service,
-            self.reserva_service,
-            self.margen_solvencia_service,
-        )
+        self.rumbo = Rumbo(self.reserva_service)
     
     def process(self, context: CotizacionContext) -> CotizacionContext:
         """Ejecuta optimización según el tipo de producto"""
@@ -49,7 +36,6 @@ class OptimizationStep(PipelineStep):
             parametros_almacenados=context.parametros_almacenados,
             tasas_interes_data=context.tasas_interes_data,
             prima=context.prima,
-            flujo_resultado_service=self.flujo_resultado_service,
             parametros_calculados=context.parametros_calculados,
             periodo_vigencia=context.periodo_vigencia,
             periodo_pago_primas=context.periodo_pago_primas,
@@ -72,6 +58,7 @@ class OptimizationStep(PipelineStep):
             comision=context.comision,
             IR=context.IR,
             utilidad_pre_pi_ms=context.utilidad_pre_pi_ms,
+            motor_actuarial=context.motor_actuarial,
         )
         
         if context.porcentaje_devolucion_optimo:
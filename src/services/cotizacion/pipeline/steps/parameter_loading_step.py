@@ -1,8 +1,8 @@
 from .base_step import PipelineStep
 from ..cotizacion_context import CotizacionContext
-from src.repositories.parametros_repository import JsonParametrosRepository
-from src.repositories.tasa_interes_repository import JsonTasaInteresRepository
-from src.repositories.factores_pago_repository import JsonFactoresPagoRepository
+from src.repositories.parametros_repository import parametros_repository
+from src.repositories.tasa_interes_repository import tasa_interes_repository
+from src.repositories.factores_pago_repository import factores_pago_repository
 from src.models.domain.parametros_calculados import ParametrosCalculados as ParametrosCalculadosDomain
 from src.models.schemas.cotizacion_schema import TipoProducto
 
@@ -12,9 +12,9 @@ class ParameterLoadingStep(PipelineStep):
     
     def __init__(self):
         super().__init__("ParameterLoading")
-        self.parametros_repository = JsonParametrosRepository()
-        self.tasa_interes_repository = JsonTasaInteresRepository()
-        self.factores_pago_repository = JsonFactoresPagoRepository()
+        self.parametros_repository = parametros_repository
+        self.tasa_interes_repository = tasa_interes_repository
+        self.factores_pago_repository = factores_pago_repository
     
     def process(self, context: CotizacionContext) -> CotizacionContext:
         """Carga todos los parámetros necesarios para el cálculo"""
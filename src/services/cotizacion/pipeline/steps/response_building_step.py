@@ -47,8 +47,9 @@ class ResponseBuildingStep(PipelineStep):
         
         context.output.parametros_entrada = parametros_limpios
         
-        # Construir datos específicos de RUMBO
-        if context.porcentaje_devolucion_optimo and context.trea:
+        # Construir datos específicos de RUMBO (una TREA de 0 es válida: se
+        # devuelve exactamente lo aportado)
+        if context.porcentaje_devolucion_optimo and context.trea is not None:
             rumbo_data = {
                 "porcentaje_devolucion": str(round(context.porcentaje_devolucion_optimo, 2)),
                 "trea": str(round(context.trea, 2)),
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Union
 from src.models.schemas.cotizacion_schema import CotizacionInput, CotizacionOutput
 
 
@@ -32,6 +32,32 @@ class CotizacionStrategy(ABC):
         """
         pass
     
+    def entradas_coleccion(
+        self, cotizacion_input: CotizacionInput
+    ) -> Optional[List[CotizacionInput]]:
+        """
+        Cotizaciones individuales en que se descompone la colección, para
+        calcularlas en paralelo y unirlas con armar_coleccion.
+        
+        Returns:
+            Entradas individuales, o None si la estrategia calcula la
+            colección en una sola ejecución (execute_collection)
+        """
+        return None
+    
+    def armar_coleccion(
+        self,
+        cotizacion_input: CotizacionInput,
+        entradas: List[CotizacionInput],
+        resultados: List[Union[CotizacionOutput, Exception]],
+    ) -> Dict[str, Any]:
+        """
+        Une los resultados de las entradas de entradas_coleccion, en el mismo
+        orden, en la respuesta de execute_collection. Las estrategias que no
+        descomponen sus colecciones la calculan con execute_collection.
+        """
+        return self.execute_collection(cotizacion_input)
+    
     @abstractmethod
     def get_product_name(self) -> str:
         """Retorna el nombre del producto que maneja esta estrategia"""
@@ -1,17 +1,23 @@
 from .base_strategy import CotizacionStrategy
 from ..pipeline import CotizacionPipeline
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 from copy import deepcopy
 from src.models.schemas.cotizacion_schema import CotizacionInput, CotizacionOutput, TipoProducto, ParametrosRumbo
-from src.repositories.periodos_cotizacion_repository import JsonPeriodosCotizacionRepository
+from src.repositories.periodos_cotizacion_repository import periodos_cotizacion_repository
+from src.services.cotizacion.grilla_cotizaciones import (
+    GrillaCotizaciones,
+    obtener_grilla_cotizaciones,
+)
 
 
 class RumboStrategy(CotizacionStrategy):
     """Estrategia de cotización para el producto RUMBO"""
     
-    def __init__(self):
+    def __init__(self, grilla: Optional[GrillaCotizaciones] = None):
         self.pipeline = CotizacionPipeline()
-        self.periodos_repo = JsonPeriodosCotizacionRepository()
+        self.periodos_repo = periodos_cotizacion_repository
+        # Grilla precalculada (si está construida y habilitada)
+        self.grilla = grilla if grilla is not None else obtener_grilla_cotizaciones()
     
     def execute(self, cotizacion_input: CotizacionInput) -> CotizacionOutput:
         """
@@ -27,15 +33,20 @@ class RumboStrategy(CotizacionStrategy):
         if cotizacion_input.producto != TipoProducto.RUMBO:
             raise ValueError(f"RumboStrategy solo maneja producto RUMBO, recibido: {cotizacion_input.producto}")
         
+        # Usar el resultado precalculado si la entrada está en la grilla
+        resultado_grilla = self.grilla.buscar(cotizacion_input) if self.grilla else None
+        
         # Ejecutar pipeline estándar
-        return self.pipeline.execute(cotizacion_input)
+        return self.pipeline.execute(cotizacion_input, resultado_grilla)
     
     def execute_collection(self, cotizacion_input: CotizacionInput) -> Dict[str, Any]:
         """
         🚀 IMPLEMENTACIÓN DEL PATRÓN STRATEGY PARA COLECCIONES
         
         Ejecuta múltiples cotizaciones para diferentes períodos disponibles
-        según el monto de la prima del producto RUMBO
+        según el monto de la prima del producto RUMBO, una tras otra. Los
+        períodos también se pueden calcular en paralelo con
+        entradas_coleccion y armar_coleccion.
         
         Args:
             cotizacion_input: Datos de entrada base para RUMBO
@@ -43,6 +54,25 @@ class RumboStrategy(CotizacionStrategy):
         Returns:
             Dict con todas las cotizaciones organizadas por período
         """
+        entradas = self.entradas_coleccion(cotizacion_input)
+        
+        resultados: List[Union[CotizacionOutput, Exception]] = []
+        for cotizacion_periodo in entradas:
+            try:
+                resultados.append(self.execute(cotizacion_periodo))
+            except Exception as e:
+                resultados.append(e)
+        
+        return self.armar_coleccion(cotizacion_input, entradas, resultados)
+    
+    def entradas_coleccion(self, cotizacion_input: CotizacionInput) -> List[CotizacionInput]:
+        """
+        Una entrada por cada período disponible para la prima, con el período
+        como vigencia y pago de primas
+        
+        Raises:
+            ValueError: Si la entrada no es de RUMBO
+        """
         # Validar que es producto RUMBO
         if cotizacion_input.producto != TipoProducto.RUMBO:
             raise ValueError(f"RumboStrategy solo maneja producto RUMBO, recibido: {cotizacion_input.producto}")
@@ -55,7 +85,26 @@ class RumboStrategy(CotizacionStrategy):
         prima = cotizacion_input.parametros.prima
         periodos_disponibles = self.periodos_repo.get_periodos_disponibles(prima)
         
-        if not periodos_disponibles:
+        entradas = []
+        for periodo in periodos_disponibles:
+            # Crear copia profunda para evitar mutaciones
+            cotizacion_periodo = deepcopy(cotizacion_input)
+            
+            # Actualizar períodos
+            cotizacion_periodo.parametros.periodo_vigencia = periodo
+            cotizacion_periodo.parametros.periodo_pago_primas = periodo
+            entradas.append(cotizacion_periodo)
+        return entradas
+    
+    def armar_coleccion(
+        self,
+        cotizacion_input: CotizacionInput,
+        entradas: List[CotizacionInput],
+        resultados: List[Union[CotizacionOutput, Exception]],
+    ) -> Dict[str, Any]:
+        """Respuesta de la colección: una cotización o un error por período"""
+        prima = cotizacion_input.parametros.prima
+        if not entradas:
             return {
                 "prima": prima,
                 "periodos_disponibles": [],
@@ -63,30 +112,20 @@ class RumboStrategy(CotizacionStrategy):
                 "mensaje": "No hay períodos disponibles para esta prima"
             }
         
-        # Generar cotizaciones para cada período
+        periodos_disponibles = []
         cotizaciones_resultado = []
-        
-        for periodo in periodos_disponibles:
-            try:
-                # Crear copia profunda para evitar mutaciones
-                cotizacion_periodo = deepcopy(cotizacion_input)
-                
-                # Actualizar períodos
-                cotizacion_periodo.parametros.periodo_vigencia = periodo
-                cotizacion_periodo.parametros.periodo_pago_primas = periodo
-                
-                # Ejecutar cotización individual
-                cotizacion_output = self.execute(cotizacion_periodo)
-                
+        for cotizacion_periodo, cotizacion_output in zip(entradas, resultados):
+            periodo = cotizacion_periodo.parametros.periodo_vigencia
+            periodos_disponibles.append(periodo)
+            if isinstance(cotizacion_output, Exception):
                 cotizaciones_resultado.append({
                     "periodo": periodo,
-                    "cotizacion": cotizacion_output.rumbo if cotizacion_output.rumbo else cotizacion_output
+                    "error": str(cotizacion_output)
                 })
-                
-            except Exception as e:
+            else:
                 cotizaciones_resultado.append({
                     "periodo": periodo,
-                    "error": str(e)
+                    "cotizacion": cotizacion_output.rumbo if cotizacion_output.rumbo else cotizacion_output
                 })
         
         return {
@@ -1,29 +1,83 @@
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, Iterator, List, Any, Optional, Union
 from decimal import Decimal
+import json
+
+import numpy as np
 
 from src.models.domain.expuestos_mes import (
     ExpuestosMes,
     ParametrosActuariales,
     FrecuenciaPago,
-    ResultadoMensual,
 )
+from src.models.domain.proyeccion_expuestos import resumir_expuestos
+from src.models.domain.proyeccion_frame import ProyeccionFrame
 from src.repositories.tabla_mortalidad_repository import Sexo, EstadoFumador
 from src.models.schemas.expuestos_mes_schema import (
     ResultadoMensualOutput,
     ResumenOutput,
     ResumenAnioOutput,
 )
-from src.repositories.parametros_repository import JsonParametrosRepository
+from src.repositories.parametros_repository import parametros_repository
+
+COLUMNAS_ENTERAS = ("mes", "anio_poliza", "edad_actual")
+COLUMNAS_DECIMALES = (
+    "vivos_inicio",
+    "fallecidos",
+    "vivos_despues_fallecidos",
+    "caducados",
+    "vivos_final",
+    "mortalidad_anual",
+    "mortalidad_mensual",
+    "mortalidad_ajustada",
+    "tasa_caducidad",
+)
+
+# Una fila de resultados_mensuales en JSON, con los campos en el orden de
+# ResultadoMensualOutput (los decimales van como texto)
+PLANTILLA_FILA = (
+    "{"
+    + ",".join(f'"{nombre}":%d' for nombre in COLUMNAS_ENTERAS)
+    + ","
+    + ",".join(f'"{nombre}":"%s"' for nombre in COLUMNAS_DECIMALES)
+    + "}"
+)
+
+# Filas por fragmento de la respuesta al serializar la proyección
+FILAS_POR_FRAGMENTO = 128
+
+
+def texto_decimal(valor: float) -> str:
+    """
+    Texto del float sin notación científica, igual a str(Decimal(str(valor))).
+
+    repr solo usa exponente bajo 1e-4 o desde 1e16, y en esos casos (y para
+    inf/nan) se pasa por Decimal; en el resto repr ya es el texto buscado.
+    """
+    texto = repr(valor)
+    if "e" in texto or "n" in texto:
+        return str(Decimal(texto))
+    return texto
+
+
+def textos_decimales(valores: np.ndarray) -> List[str]:
+    """
+    texto_decimal de cada valor, formateando una sola vez los repetidos (ej:
+    la mortalidad, que solo cambia con el año de póliza)
+    """
+    valores = np.ascontiguousarray(valores, dtype=np.float64)
+    # Se comparan los bits para no unir -0.0 con 0.0
+    _, primeros, posiciones = np.unique(
+        valores.view(np.int64), return_index=True, return_inverse=True
+    )
+    textos = [texto_decimal(valor) for valor in valores[primeros].tolist()]
+    return [textos[posicion] for posicion in posiciones.tolist()]
 
 
 class ExpuestosMesService:
     """Servicio para realizar cálculos actuariales de expuestos"""
 
     def __init__(self):
-        self.parametros_repository = JsonParametrosRepository()
-        self.parametros_dict = self.parametros_repository.get_parametros_by_producto(
-            "rumbo"
-        )
+        self.parametros_repository = parametros_repository
 
     def calcular_expuestos_mes(
         self,
@@ -34,7 +88,7 @@ class ExpuestosMesService:
         periodo_vigencia: int,
         periodo_pago_primas: int,
         ajuste_mortalidad: float,
-    ) -> Dict[str, Any]:
+    ) -> ProyeccionFrame:
         """
         Realiza el cálculo de proyección de expuestos
 
@@ -49,14 +103,15 @@ class ExpuestosMesService:
             meses_proyeccion: Número de meses a proyectar (default: 12)
 
         Returns:
-            Diccionario con los resultados de la proyección
+            Proyección columnar con una columna por variable de expuestos
         """
         # Convertir parámetros a tipos enumerados
         sexo_enum = Sexo.MASCULINO if sexo == Sexo.MASCULINO else Sexo.FEMENINO
         fumador_enum = EstadoFumador.FUMADOR if fumador else EstadoFumador.NO_FUMADOR
         frecuencia_enum = FrecuenciaPago(frecuencia_pago_primas)
-        ajuste_mortalidad = self.parametros_dict.get(
-            "ajuste_mortalidad", 0.01
+        # Se lee en cada cálculo para seguir la versión vigente de los assets
+        ajuste_mortalidad = self.parametros_repository.get_parametro(
+            "rumbo", "ajuste_mortalidad", 0.01
         )  # ! VALIDAR ESTO A FUTURO
 
         # Crear parámetros actuariales
@@ -73,48 +128,51 @@ class ExpuestosMesService:
         # Crear modelo de dominio
         expuestos_actuarial = ExpuestosMes(parametros=parametros)
 
-        # Calcular proyección
-        resultados = expuestos_actuarial.calcular_expuestos_mes()
-
-        # Obtener resumen
-        resumen = expuestos_actuarial.obtener_resumen()
-
-        # Formatear resultados para la API
-        return self._formatear_resultados(resultados, resumen)
+        # Calcular proyección columnar
+        return expuestos_actuarial.proyectar().a_frame()
 
-    def _formatear_resultados(
-        self, resultados: List[ResultadoMensual], resumen: Dict[str, Union[float, Dict]]
-    ) -> Dict[str, Any]:
+    def formatear_resultados(self, expuestos_mes: ProyeccionFrame) -> Dict[str, Any]:
         """
-        Formatea los resultados para la respuesta de la API
+        Formatea la proyección para la respuesta de la API.
+        Solo se usa en la capa HTTP; los servicios intercambian el frame.
 
         Args:
-            resultados: Lista de resultados mensuales
-            resumen: Resumen de la proyección
+            expuestos_mes: Proyección columnar de expuestos
 
         Returns:
             Diccionario con los resultados formateados
         """
+        columnas = {
+            nombre: textos_decimales(expuestos_mes[nombre])
+            for nombre in COLUMNAS_DECIMALES
+        }
+
         resultados_formateados = []
 
-        for r in resultados:
+        for i, (mes, anio_poliza, edad_actual) in enumerate(
+            zip(
+                expuestos_mes["mes"].tolist(),
+                expuestos_mes["anio_poliza"].tolist(),
+                expuestos_mes["edad_actual"].tolist(),
+            )
+        ):
             resultado_mensual = ResultadoMensualOutput(
-                mes=r.mes,
-                anio_poliza=r.anio_poliza,
-                edad_actual=r.edad_actual,
-                vivos_inicio=str(Decimal(str(r.vivos_inicio))),
-                fallecidos=str(Decimal(str(r.fallecidos))),
-                vivos_despues_fallecidos=str(Decimal(str(r.vivos_despues_fallecidos))),
-                caducados=str(Decimal(str(r.caducados))),
-                vivos_final=str(Decimal(str(r.vivos_final))),
-                mortalidad_anual=str(Decimal(str(r.mortalidad_anual))),
-                mortalidad_mensual=str(Decimal(str(r.mortalidad_mensual))),
-                mortalidad_ajustada=str(Decimal(str(r.mortalidad_ajustada))),
-                tasa_caducidad=str(Decimal(str(r.tasa_caducidad))),
+                mes=mes,
+                anio_poliza=anio_poliza,
+                edad_actual=edad_actual,
+                **{nombre: valores[i] for nombre, valores in columnas.items()},
             )
             resultados_formateados.append(resultado_mensual.model_dump())
 
-        # Formatear y redondear el resumen
+        return {
+            "resultados_mensuales": resultados_formateados,
+            "resumen": self.formatear_resumen(expuestos_mes),
+        }
+
+    def formatear_resumen(self, expuestos_mes: ProyeccionFrame) -> Dict[str, Any]:
+        """Resumen por póliza y por año de póliza formateado para la API"""
+        resumen = resumir_expuestos(expuestos_mes)
+
         resumen_por_anio = {}
         for anio, datos in resumen["por_anio"].items():
             resumen_por_anio[str(anio)] = ResumenAnioOutput(
@@ -123,7 +181,7 @@ class ExpuestosMesService:
                 vivos_final=str(Decimal(str(datos["vivos_final"]))),
             ).model_dump()
 
-        resumen_formateado = ResumenOutput(
+        return ResumenOutput(
             vivos_inicial=str(Decimal(str(resumen["vivos_inicial"]))),
             vivos_final=str(Decimal(str(resumen["vivos_final"]))),
             fallecidos_total=str(Decimal(str(resumen["fallecidos_total"]))),
@@ -132,10 +190,75 @@ class ExpuestosMesService:
             por_anio=resumen_por_anio,
         ).model_dump()
 
-        return {
-            "resultados_mensuales": resultados_formateados,
-            "resumen": resumen_formateado,
-        }
+    def serializar_proyeccion(
+        self,
+        expuestos_mes: ProyeccionFrame,
+        por_columnas: bool = False,
+        mes_desde: int = 1,
+        mes_hasta: Optional[int] = None,
+        encabezado: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        """
+        Serializa la proyección a JSON en fragmentos, en una sola pasada y sin
+        construir modelos intermedios por mes.
+
+        El documento tiene las claves del encabezado, los meses pedidos como
+        resultados_mensuales (una fila por mes, igual que formatear_resultados)
+        o como columnas (un arreglo por variable) y el resumen, que siempre
+        es el de la proyección completa.
+
+        Args:
+            expuestos_mes: Proyección columnar de expuestos
+            por_columnas: Entregar un arreglo por variable en vez de filas
+            mes_desde: Primer mes a entregar (desde 1)
+            mes_hasta: Último mes a entregar, inclusive (None: el último)
+            encabezado: Claves a escribir al inicio del documento
+
+        Yields:
+            Fragmentos de texto cuya concatenación es el documento JSON
+        """
+        inicio = mes_desde - 1
+        fin = expuestos_mes.meses if mes_hasta is None else mes_hasta
+        enteras = [expuestos_mes[nombre][inicio:fin].tolist() for nombre in COLUMNAS_ENTERAS]
+        decimales = [
+            textos_decimales(expuestos_mes[nombre][inicio:fin])
+            for nombre in COLUMNAS_DECIMALES
+        ]
+
+        prefijo = "{"
+        if encabezado:
+            prefijo += json.dumps(encabezado, separators=(",", ":"))[1:-1] + ","
+
+        if por_columnas:
+            yield prefijo + '"columnas":{'
+            for posicion, (nombre, valores) in enumerate(
+                zip(COLUMNAS_ENTERAS, enteras)
+            ):
+                separador = "," if posicion else ""
+                yield f'{separador}"{nombre}":[{",".join(map(str, valores))}]'
+            for nombre, textos in zip(COLUMNAS_DECIMALES, decimales):
+                valores = '"' + '","'.join(textos) + '"' if textos else ""
+                yield f',"{nombre}":[{valores}]'
+            yield "},"
+        else:
+            yield prefijo + '"resultados_mensuales":['
+            filas = zip(*enteras, *decimales)
+            separador = ""
+            while True:
+                bloque = [
+                    PLANTILLA_FILA % fila
+                    for _, fila in zip(range(FILAS_POR_FRAGMENTO), filas)
+                ]
+                if not bloque:
+                    break
+                yield separador + ",".join(bloque)
+                separador = ","
+            yield "],"
+
+        resumen = json.dumps(
+            self.formatear_resumen(expuestos_mes), separators=(",", ":")
+        )
+        yield f'"resumen":{resumen}}}'
 
 
 # Instancia global del servicio
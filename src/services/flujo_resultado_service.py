@@ -1,33 +1,33 @@
-from src.models.schemas.expuestos_mes_schema import ProyeccionActuarialOutput
-from src.models.domain.flujo_resultado import FlujoResultado
-from src.repositories.parametros_repository import JsonParametrosRepository
-from src.repositories.devolucion_repository import JsonDevolucionRepository
+from src.models.domain.proyeccion_frame import ProyeccionFrame
+from src.core.config import settings
+from src.models.domain.flujo_resultado import obtener_flujo_resultado
+from src.repositories.parametros_repository import parametros_repository
+from src.repositories.devolucion_repository import devolucion_repository
 from src.common.frecuencia_pago import FrecuenciaPago
-from typing import List
+from typing import List, Optional
 from src.services.reserva_service import ReservaService
 
 
 class FlujoResultadoService:
-    def __init__(self):
-        self.flujo_resultado = FlujoResultado()
-        self.parametros_repository = JsonParametrosRepository()
-        self.devolucion_repository = JsonDevolucionRepository()
-        self.parametros_dict = self.parametros_repository.get_parametros_by_producto(
-            "rumbo"
+    def __init__(self, implementacion: Optional[str] = None):
+        self.flujo_resultado = obtener_flujo_resultado(
+            implementacion or settings.FLUJO_RESULTADO_IMPLEMENTACION
         )
+        self.parametros_repository = parametros_repository
+        self.devolucion_repository = devolucion_repository
         self.reserva = ReservaService()
 
     # Orquestacion para gastos
     def calcular_primas_recurrentes(
         self,
-        expuestos_mes: ProyeccionActuarialOutput,
+        expuestos_mes: ProyeccionFrame,
         periodo_pago_primas: int,
         frecuencia_pago_primas: FrecuenciaPago,
         prima: float,
     ):
 
-        fraccionamiento_primas = self.parametros_dict.get(
-            "fraccionamiento_primas", 0.01
+        fraccionamiento_primas = self.parametros_repository.get_parametro(
+            "rumbo", "fraccionamiento_primas", 0.01
         )
 
         return self.flujo_resultado.calcular_primas_recurrentes(
@@ -39,13 +39,13 @@ class FlujoResultadoService:
         )
 
     def calcular_siniestros(
-        self, expuestos_mes: ProyeccionActuarialOutput, suma_asegurada: float
+        self, expuestos_mes: ProyeccionFrame, suma_asegurada: float
     ) -> List[float]:
         return self.flujo_resultado.calcular_siniestros(expuestos_mes, suma_asegurada)
 
     def calcular_rescates(
         self,
-        expuestos_mes: ProyeccionActuarialOutput,
+        expuestos_mes: ProyeccionFrame,
         rescate: list[float],
     ) -> List[float]:
         # Ya no necesitamos obtener los datos de devolución aquí
@@ -55,7 +55,9 @@ class FlujoResultadoService:
             rescate,
         )
 
-    def calcular_gastos_mantenimiento(self, gastos_mantenimiento: float) -> List[float]:
+    def calcular_gastos_mantenimiento(
+        self, gastos_mantenimiento: ProyeccionFrame
+    ) -> List[float]:
         return self.flujo_resultado.calcular_gastos_mantenimiento(gastos_mantenimiento)
 
     def calcular_comision(
@@ -64,7 +66,7 @@ class FlujoResultadoService:
         asistencia: bool,
         frecuencia_pago_primas: FrecuenciaPago,
         costo_asistencia_funeraria: float,
-        expuestos_mes: ProyeccionActuarialOutput,
+        expuestos_mes: ProyeccionFrame,
         comision: float,
     ) -> List[float]:
         return self.flujo_resultado.calcular_comision(
@@ -1,8 +1,9 @@
-from src.repositories.parametros_repository import JsonParametrosRepository
-from src.models.schemas.expuestos_mes_schema import ProyeccionActuarialOutput
+from src.repositories.parametros_repository import parametros_repository
+from src.models.domain.proyeccion_frame import ProyeccionFrame
 from src.models.schemas.gastos_schema import ResultadoMensualGastos
 from src.models.domain.gastos import Gastos
 from decimal import Decimal
+import numpy as np
 from typing import Dict, List, Any
 from src.services.flujo_resultado_service import FlujoResultadoService
 from src.common.frecuencia_pago import FrecuenciaPago
@@ -16,10 +17,7 @@ class GastosService:
     """Servicio para realizar cálculos de gastos"""
 
     def __init__(self):
-        self.parametros_repository = JsonParametrosRepository()
-        self.parametros_dict = self.parametros_repository.get_parametros_by_producto(
-            "rumbo"
-        )
+        self.parametros_repository = parametros_repository
         self.flujo_resultado_service = FlujoResultadoService()
 
     def calcular_gastos(
@@ -27,7 +25,7 @@ class GastosService:
         periodo_vigencia: int,
         periodo_pago_primas: int,
         prima: float,
-        expuestos_mes: ProyeccionActuarialOutput,
+        expuestos_mes: ProyeccionFrame,
         frecuencia_pago_primas: FrecuenciaPago = FrecuenciaPago.ANUAL,
         mantenimiento_poliza: float = 0.0,
         inflacion_mensual: float = 0.0,
@@ -37,9 +35,9 @@ class GastosService:
         tiene_asistencia: bool = False,
         costo_mensual_asistencia_funeraria: float = 0.0,
         moneda_poliza: float = 0.0,
-    ) -> Dict:
+    ) -> ProyeccionFrame:
         """
-        Método para calcular gastos
+        Método para calcular gastos. Retorna los gastos mensuales como frame.
         """
 
         # Crear objeto del dominio
@@ -120,45 +118,37 @@ class GastosService:
 
         # print("gasto_mantenimiento_total => ", gasto_mantenimiento_total)
 
-        resultados_mensuales = self._formatear_resultados(
-            gasto_mantenimiento_prima_co,
-            gastos_mantenimiento_moneda_poliza,
-            gasto_mantenimiento_fijo_poliza_anual,
-            factor_inflacion,
-            gasto_mantenimiento_total,
+        return ProyeccionFrame(
+            {
+                "gasto_mantenimiento_prima_co": gasto_mantenimiento_prima_co,
+                "gastos_mantenimiento_moneda_poliza": np.full(
+                    len(gasto_mantenimiento_prima_co),
+                    gastos_mantenimiento_moneda_poliza,
+                    dtype=np.float64,
+                ),
+                "gasto_mantenimiento_fijo_poliza_anual": gasto_mantenimiento_fijo_poliza_anual,
+                "factor_inflacion": factor_inflacion,
+                "gasto_mantenimiento_total": gasto_mantenimiento_total,
+            }
         )
-        return {"resultados_mensuales": resultados_mensuales}
 
-    def _formatear_resultados(
-        self,
-        gasto_mantenimiento_prima_co: List[float],
-        gastos_mantenimiento_moneda_poliza: List[float],
-        gasto_mantenimiento_fijo_poliza_anual: List[float],
-        factor_inflacion: List[float],
-        gasto_mantenimiento_total: List[float],
-    ) -> List[Dict[str, Any]]:
+    def formatear_resultados(self, gastos: ProyeccionFrame) -> List[Dict[str, Any]]:
+        """
+        Formatea los gastos mensuales para la respuesta de la API.
+        Solo se usa en la capa HTTP; los servicios intercambian el frame.
+        """
+        columnas = {
+            nombre: [str(Decimal(str(valor))) for valor in gastos[nombre].tolist()]
+            for nombre in gastos
+        }
 
         # Crear resultado mensual
         resultados_formateados = []
-        for i, resultado in enumerate(gasto_mantenimiento_prima_co):
-            mes = i + 1
-            anio_poliza = 1
-            _gasto_mantenimiento_prima_co = str(Decimal(str(resultado)))
-            _gasto_mantenimiento_moneda_poliza = str(gastos_mantenimiento_moneda_poliza)
-            _gasto_mantenimiento_fijo_poliza_anual = str(
-                Decimal(str(gasto_mantenimiento_fijo_poliza_anual[i]))
-            )
-            _factor_inflacion = str(Decimal(str(factor_inflacion[i])))
-            _gasto_mantenimiento_total = str(Decimal(str(gasto_mantenimiento_total[i])))
-
+        for i in range(gastos.meses):
             resultado_mensual = ResultadoMensualGastos(
-                mes=mes,
-                anio_poliza=anio_poliza,
-                gasto_mantenimiento_prima_co=_gasto_mantenimiento_prima_co,
-                gastos_mantenimiento_moneda_poliza=_gasto_mantenimiento_moneda_poliza,
-                gasto_mantenimiento_fijo_poliza_anual=_gasto_mantenimiento_fijo_poliza_anual,
-                factor_inflacion=_factor_inflacion,
-                gasto_mantenimiento_total=_gasto_mantenimiento_total,
+                mes=i + 1,
+                anio_poliza=1,
+                **{nombre: valores[i] for nombre, valores in columnas.items()},
             )
 
             resultados_formateados.append(resultado_mensual.model_dump())
@@ -1,13 +1,13 @@
 from src.models.domain.reserva import Reserva
-from src.models.domain.expuestos_mes import ExpuestosMes
-from src.repositories.devolucion_repository import JsonDevolucionRepository
+from src.models.domain.proyeccion_frame import ProyeccionFrame
+from src.repositories.devolucion_repository import devolucion_repository
 
 
 class ReservaService:
 
     def __init__(self) -> None:
         self.reserva = Reserva()
-        self.devolucion_repository = JsonDevolucionRepository()
+        self.devolucion_repository = devolucion_repository
 
     def calcular_moce_saldo_reserva(
         self,
@@ -32,7 +32,7 @@ class ReservaService:
 
     def calcular_ajuste_devolucion_anticipada(
         self,
-        expuestos_mes: ExpuestosMes,
+        expuestos_mes: ProyeccionFrame,
         rescate: list[float],
     ):
         return self.reserva.calcular_ajuste_devolucion_anticipada(
@@ -80,17 +80,14 @@ class ReservaService:
         flujo_pasivo: list[float],
         tasa_interes_mensual: float,
         rescate: list[float],
-        expuestos_mes: ExpuestosMes,
+        expuestos_mes: ProyeccionFrame,
     ):
 
         return self.reserva.calcular_saldo_reserva(
             flujo_pasivo,
             tasa_interes_mensual,
             rescate,
-            vivos_inicio=[
-                float(item["vivos_inicio"])
-                for item in expuestos_mes.get("resultados_mensuales", [])
-            ],
+            vivos_inicio=expuestos_mes["vivos_inicio"],
         )
 
     def calcular_varianza_moce(self, moce: list[float]):